@@ -0,0 +1,186 @@
+import json
+import os
+import re
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from compositor import COVERAGE_THRESHOLD
+
+AUTOSAVE_INTERVAL = 10.0  # seconds between autosaves
+MANIFEST = "autosave.json"
+TILE_NAME = "tile_{}_{}.png"  # tile row, tile column
+_TILE_PATTERN = re.compile(r"tile_(-?\d+)_(-?\d+)\.png$")
+
+
+class CanvasSaver:
+    """Autosave and export of a TiledCanvas, encoded and written on a worker thread
+
+    The render loop only copies pixels: tick() takes the tiles the canvas
+    has flagged as changed since the last autosave, export() every painted
+    tile. The worker encodes them as PNG, writes each tile of the autosave
+    as its own file (replaced atomically, and skipped when its pixels match
+    what was last written, e.g. after an undo) and removes tiles that have
+    become blank. If the worker falls behind, tiles waiting to be written
+    are replaced by newer copies rather than queued, so the render loop
+    never waits on the disk. restore() reads the last autosave back after a
+    crash.
+    """
+
+    def __init__(self, canvas, directory=None, interval=AUTOSAVE_INTERVAL, export_dir="."):
+        self.canvas = canvas
+        self.directory = directory or None  # None: export only
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self.interval = interval
+        self.export_dir = export_dir
+        self.tiles_written = 0
+        self.tiles_skipped = 0
+        self.errors = 0
+        self.exports = []  # paths written by export()
+        self._saved = {}  # (tile row, tile col) -> pixels as last written to the autosave (blank tiles are not stored)
+        self._next = time.perf_counter() + interval
+        self._pending = {}  # (tile row, tile col) -> pixels to write, None for a blank tile
+        self._jobs = []  # ({tile key: pixels}, path) exports to write
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="CanvasSaver", daemon=True)
+        self._thread.start()
+
+    def restore(self):
+        """Load the last autosave into the canvas (crash recovery); False if there is none"""
+        if not self.directory or not os.path.exists(os.path.join(self.directory, MANIFEST)):
+            return False
+        with open(os.path.join(self.directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        canvas = self.canvas
+        if manifest["tile"] != canvas.tile:
+            return False
+        t = canvas.tile
+        for name in os.listdir(self.directory):
+            match = _TILE_PATTERN.match(name)
+            tile = cv2.imread(os.path.join(self.directory, name)) if match else None
+            if tile is None or tile.shape != (t, t, 3):
+                continue
+            ty, tx = int(match.group(1)), int(match.group(2))
+            canvas.write(tx * t, ty * t, (tx + 1) * t, (ty + 1) * t, tile)
+            self._saved[ty, tx] = tile
+        canvas.take_changed()  # what is on disk needs no saving
+        return bool(self._saved)
+
+    def tick(self, now):
+        """Hand the changed tiles to the worker once the autosave interval has passed"""
+        if not self.directory or now < self._next:
+            return
+        self._next = now + self.interval
+        self.save()
+
+    def save(self):
+        """Queue an autosave of the changed tiles now"""
+        if not self.directory:
+            return
+        tiles = self.canvas.take_changed()
+        if not tiles:
+            return
+        with self._lock:
+            for key in tiles:
+                tile = self.canvas.tiles.get(key)
+                self._pending[key] = None if tile is None else tile.copy()
+            self._idle.clear()
+        self._wake.set()
+
+    def export(self, name=None):
+        """Queue the painted area as a picture plus a transparent layer; returns the picture's path (None if blank)"""
+        if not self.canvas.tiles:
+            return None
+        name = name or time.strftime("gesture_brush_%Y%m%d_%H%M%S")
+        path = os.path.join(self.export_dir, name + ".png")
+        tiles = {key: tile.copy() for key, tile in self.canvas.tiles.items()}
+        with self._lock:
+            self._jobs.append((tiles, path))
+            self._idle.clear()
+        self._wake.set()
+        return path
+
+    def flush(self, timeout=None):
+        """Wait until everything queued is on disk"""
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Autosave what changed, wait for the worker to finish and stop it"""
+        self.save()
+        self.flush()
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                tiles, self._pending = self._pending, {}
+                jobs, self._jobs = self._jobs, []
+            try:
+                if tiles:
+                    self._write_tiles(tiles)
+                for tiles, path in jobs:
+                    self._export(tiles, path)
+            except (OSError, cv2.error) as e:  # e.g. a full disk; painting goes on
+                self.errors += 1
+                print(f"Warning: could not save the canvas: {e}")
+            with self._lock:
+                if not self._pending and not self._jobs:
+                    self._idle.set()
+            if not self._running:
+                return
+
+    def _write_tiles(self, tiles):
+        for (ty, tx), tile in tiles.items():
+            saved = self._saved.get((ty, tx))
+            if saved is None if tile is None else saved is not None and np.array_equal(tile, saved):
+                self.tiles_skipped += 1
+                continue
+            path = os.path.join(self.directory, TILE_NAME.format(ty, tx))
+            if tile is not None:
+                _write(path, tile)
+                self._saved[ty, tx] = tile
+            else:
+                if os.path.exists(path):
+                    os.remove(path)  # blank tiles are not stored
+                del self._saved[ty, tx]
+            self.tiles_written += 1
+        manifest = {"tile": self.canvas.tile, "saved": time.time()}
+        with open(os.path.join(self.directory, MANIFEST + ".tmp"), "w") as f:
+            json.dump(manifest, f)
+        os.replace(os.path.join(self.directory, MANIFEST + ".tmp"), os.path.join(self.directory, MANIFEST))
+
+    def _export(self, tiles, path):
+        """Assemble copied tiles into one picture of the painted area, and a layer with coverage as alpha"""
+        t = self.canvas.tile
+        rows, cols = [ty for ty, _ in tiles], [tx for _, tx in tiles]
+        top, left = min(rows), min(cols)
+        picture = np.zeros(((max(rows) - top + 1) * t, (max(cols) - left + 1) * t, 3), np.uint8)
+        for (ty, tx), tile in tiles.items():
+            picture[(ty - top) * t:(ty - top + 1) * t, (tx - left) * t:(tx - left + 1) * t] = tile
+        gray = cv2.cvtColor(picture, cv2.COLOR_BGR2GRAY)
+        _, coverage = cv2.threshold(gray, COVERAGE_THRESHOLD, 255, cv2.THRESH_BINARY)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        _write(path, picture)
+        _write(path[:-len(".png")] + "_layer.png", np.dstack([picture, coverage]))
+        self.exports.append(path)
+
+
+def _write(path, image):
+    """Encode and write a PNG under a temporary name, then move it into place"""
+    ok, data = cv2.imencode(".png", image)
+    if not ok:
+        raise IOError(f"Could not encode {path}")
+    with open(path + ".tmp", "wb") as f:
+        f.write(data.tobytes())
+    os.replace(path + ".tmp", path)
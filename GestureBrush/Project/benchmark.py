@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Gesture Brush - Headless Benchmark
+Runs the gesture_brush.py pipeline on synthetic hand frames (no camera, no
+window) and reports per-stage latency percentiles, end-to-end FPS and
+fingertip error, with one or more hands in view. Results are written as
+JSON so runs can be compared.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+import gesture_brush as gb
+import painter
+from compositor import CanvasCompositor
+from filters import HandFilters
+from governor import FrameGovernor, LandmarkExtrapolator
+from hand_tracks import HandTracks
+from trackers import Hand
+from strokes import StrokeStore
+from tiled_canvas import TiledCanvas, Viewport
+from layout import Layout
+from overlay import UiOverlay
+from roi_tracker import RoiTracker
+from skin_model import SkinModel
+from synthetic_hand import BACKGROUNDS, RESOLUTIONS, HandSequence
+
+# "segment" covers downscaling, skin classification, morphology, contour selection and
+# skin model updates; "landmarks" includes mapping back to full resolution and refinement;
+# "assign" matches the hands to their IDs
+STAGES = ("segment", "defects", "landmarks", "assign", "filter", "draw", "composite", "overlay")
+HAND_COUNTS = (1, 2, 4)
+EXTRA_LATENCY_MS = 40.0  # capture and display time on top of processing: about a frame each way at 30 fps, 60 Hz
+
+
+def percentiles(samples_ns):
+    """p50/p95/p99/mean in milliseconds for a list of nanosecond samples"""
+    if not samples_ns:
+        return None
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"p50": round(p50, 4), "p95": round(p95, 4), "p99": round(p99, 4), "mean": round(float(ms.mean()), 4)}
+
+
+def effective_lag(samples, max_lag=0.3):
+    """Delay (s) that best aligns displayed cursors with the true fingertip path
+
+    samples are (sequence, fps, display time in s, cursor, hand) tuples;
+    the lag minimising the mean distance to the truth at (display time -
+    lag) is what the user perceives as the brush trailing the finger.
+    """
+    if not samples:
+        return None
+
+    def error(lag):
+        return np.mean([np.hypot(*np.subtract(cursor, seq.tips_at((t - lag) * fps, hand)["index"]))
+                        for seq, fps, t, cursor, hand in samples])
+
+    lags = np.arange(-0.1, max_lag, 0.005)
+    best = lags[np.argmin([error(lag) for lag in lags])]
+    fine = np.arange(best - 0.005, best + 0.005, 0.0005)  # refine to half a millisecond
+    return float(fine[np.argmin([error(lag) for lag in fine])])
+
+
+def nearest_hand(point, truth):
+    """Index of the true hand whose index fingertip is closest to point, and that distance"""
+    distances = [np.hypot(point[0] - tips["index"][0], point[1] - tips["index"][1]) for tips in truth]
+    hand = int(np.argmin(distances))
+    return hand, float(distances[hand])
+
+
+def run_resolution(width, height, frames, warmup, seed, roi=True, method="defects",
+                   filter_spec="kalman", camera_fps=30.0, extra_latency=EXTRA_LATENCY_MS / 1e3, adaptive_skin=True,
+                   detect_scale=1.0, refine=False, budget_ms=0.0, hands=1):
+    """Benchmark one resolution with `hands` hands in view; returns the result dict for it"""
+    tools, colors = painter.load_ui_images()
+    overlay = UiOverlay(tools, colors, Layout(width, height))
+    timings = {stage: [] for stage in STAGES}
+    totals = []
+    tip_errors = []
+    detected = 0
+    measured = 0
+    roi_hits = 0
+    raw_samples, filtered_samples = [], []
+    index_id = gb.HAND_LANDMARKS['INDEX_FINGER_TIP']
+    governor = FrameGovernor(budget_ms)
+    level_frames = {}
+
+    per_background = max(1, -(-(frames + warmup) // len(BACKGROUNDS)))
+    for bg_index, background in enumerate(BACKGROUNDS):
+        seq = HandSequence(width, height, background=background, hands=hands, seed=seed + bg_index)
+        world, view = TiledCanvas(), Viewport()
+        canvas = CanvasCompositor(width, height)
+        strokes = StrokeStore(width, height)
+        tracker = RoiTracker() if roi else None
+        skin = SkinModel(background=False) if adaptive_skin else None  # rebuilt inline so runs are repeatable
+        tracks = HandTracks()
+        landmark_filter = HandFilters({index_id: filter_spec}, default="oneeuro", hands=hands)
+        extrapolators = {}  # hand ID -> LandmarkExtrapolator
+        latency = extra_latency  # running estimate used as the prediction lead
+        prev = {}  # hand ID -> last pen-down tip (x_prev, y_prev)
+        for i in range(per_background):
+            frm, truth = next(seq)
+            warm = bg_index == 0 and i < warmup
+            # Simulated camera clock: frame i is captured at i / camera_fps (next() has already moved past it)
+            capture_time = (seq.index - 1) / camera_fps
+            quality = governor.level
+            scale = detect_scale * quality.scale
+            detect = governor.detect_due()
+            hits_before = tracker.roi_hits if tracker is not None else 0
+            t0 = time.perf_counter_ns()
+
+            contours = []
+            if detect:
+                det = gb.downscale(frm, scale)
+                if tracker is not None:
+                    contours = gb.track_hand_contours(det, tracker, skin, quality.morphology, hands)
+                else:
+                    contours = gb.find_hand_contours(gb.segment_skin(det, skin, quality.morphology), max_hands=hands,
+                                                    speckled=quality.morphology == 0)
+                if skin is not None:
+                    skin.learn(det, contours[skin.updates % len(contours)] if contours else None)
+            t1 = time.perf_counter_ns()
+
+            defects = [gb.convexity_defects(c) if method == "defects" else None for c in contours]
+            t2 = time.perf_counter_ns()
+
+            if detect:
+                found = []
+                if contours:
+                    stacked = np.stack([gb.extract_landmarks(c, d, method) for c, d in zip(contours, defects)])
+                    fx, fy = width / det.shape[1], height / det.shape[0]
+                    found = [Hand(lm, gb.scale_contour(c, fx, fy))
+                             for lm, c in zip(gb.scale_landmarks(stacked, fx, fy), contours)]
+                if refine and scale != 1.0:
+                    found = [h._replace(landmarks=gb.refine_fingertips(frm, h.landmarks, scale, skin)) for h in found]
+            t3 = time.perf_counter_ns()
+
+            if detect:
+                current = tracks.update(found, frm.shape)
+                for hand_id in tracks.ended:
+                    del extrapolators[hand_id]
+                    prev.pop(hand_id, None)
+                    strokes.end(hand_id)
+                landmarks_by_id = {hand_id: h.landmarks for hand_id, h in current}
+                for hand_id in tracks.ids:
+                    extrapolators.setdefault(hand_id, LandmarkExtrapolator()).update(landmarks_by_id.get(hand_id),
+                                                                                    capture_time)
+            else:
+                landmarks_by_id = {hand_id: predicted for hand_id, extrapolator in extrapolators.items()
+                                   if (predicted := extrapolator.predict(capture_time)) is not None}
+            t_assign = time.perf_counter_ns()
+
+            raw_tips = {hand_id: tuple(int(v) for v in landmarks[index_id])
+                        for hand_id, landmarks in landmarks_by_id.items() if gb.landmark_present(landmarks, index_id)}
+            tips = {hand_id: (tuple(int(v) for v in landmarks[index_id]), gb.fingers_up(landmarks))
+                    for hand_id, landmarks in landmark_filter(landmarks_by_id, capture_time, latency).items()
+                    if gb.landmark_present(landmarks, index_id)}
+            t_filter = time.perf_counter_ns()
+
+            for hand_id in extrapolators:
+                tip, up = tips.get(hand_id, (None, False))
+                if tip is not None and up:
+                    if hand_id in prev:
+                        strokes.line(prev[hand_id], tip, painter.HAND_COLORS[hand_id % len(painter.HAND_COLORS)],
+                                     painter.BRUSH_THICKNESS, pen=hand_id)
+                    prev[hand_id] = tip
+                else:
+                    prev.pop(hand_id, None)
+                    strokes.end(hand_id)
+            strokes.rasterize(world)
+            canvas.show(world, view)
+            t4 = time.perf_counter_ns()
+
+            canvas.composite(frm)
+            t5 = time.perf_counter_ns()
+
+            overlay.update(painter.DEFAULT_TOOL, painter.DEFAULT_COLOR)
+            overlay.apply(frm)
+            t6 = time.perf_counter_ns()
+
+            if governor.end_frame((t6 - t0) / 1e9) and tracker is not None and governor.level.scale != quality.scale:
+                tracker.lost()  # the tracked window is in the old detection scale's coordinates
+            if warm:
+                continue
+            measured += 1
+            level_frames[quality.name] = level_frames.get(quality.name, 0) + 1
+            spans = ((t0, t1), (t1, t2), (t2, t3), (t3, t_assign), (t_assign, t_filter), (t_filter, t4),
+                     (t4, t5), (t5, t6))
+            for stage, (a, b) in zip(STAGES, spans):
+                timings[stage].append(b - a)
+            totals.append(t6 - t0)
+            frame_latency = (t6 - t0) / 1e9 + extra_latency
+            latency += 0.1 * (frame_latency - latency)
+            display_time = capture_time + frame_latency
+            for hand_id, raw_tip in raw_tips.items():
+                true_hand, error = nearest_hand(raw_tip, truth)
+                detected += 1
+                tip_errors.append(error)
+                raw_samples.append((seq, camera_fps, display_time, raw_tip, true_hand))
+                if hand_id in tips:
+                    filtered_samples.append((seq, camera_fps, display_time, tips[hand_id][0], true_hand))
+            if tracker is not None and tracker.roi_hits > hits_before:
+                roi_hits += 1
+
+    total = percentiles(totals)
+    raw_lag, filtered_lag = effective_lag(raw_samples), effective_lag(filtered_samples)
+    return {
+        "width": width,
+        "height": height,
+        "hands": hands,
+        "detect_scale": detect_scale,
+        "frames": measured,
+        "stages": {stage: percentiles(samples) for stage, samples in timings.items()},
+        "end_to_end": total,
+        "fps": round(1e9 * measured / sum(totals), 2) if totals else 0.0,
+        "detect_rate": round(detected / (measured * hands), 4) if measured else 0.0,
+        "roi_hit_rate": round(roi_hits / measured, 4) if roi and measured else None,
+        "quality": {
+            "budget_ms": budget_ms,
+            "levels": {name: round(n / measured, 4) for name, n in level_frames.items()},
+            "final": governor.level.name,
+            "changes": governor.changes,
+        } if budget_ms else None,
+        "tip_error_px": {
+            "mean": round(float(np.mean(tip_errors)), 3),
+            "p50": round(float(np.percentile(tip_errors, 50)), 3),
+            "p95": round(float(np.percentile(tip_errors, 95)), 3),
+        } if tip_errors else None,
+        "perceived_latency_ms": {
+            "filter": filter_spec,
+            "assumed_extra": round(extra_latency * 1e3, 2),
+            "measured_raw": round((raw_lag - extra_latency) * 1e3, 2),  # processing and sampling alone
+            "raw": round(raw_lag * 1e3, 2),
+            "filtered": round(filtered_lag * 1e3, 2),
+            "improvement": round((raw_lag - filtered_lag) * 1e3, 2),
+        } if raw_samples else None,
+    }
+
+
+def environment():
+    """Metadata identifying the build being measured"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "threads": cv2.getNumThreads(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """List p95 regressions of more than `tolerance` (fraction) against a baseline run"""
+    regressions = []
+    for res, current in results["results"].items():
+        previous = baseline.get("results", {}).get(res)
+        if not previous:
+            continue
+        pairs = [(f"{res}/{stage}", current["stages"].get(stage), previous["stages"].get(stage)) for stage in STAGES]
+        pairs.append((f"{res}/end_to_end", current["end_to_end"], previous["end_to_end"]))
+        for name, cur, prev in pairs:
+            if cur and prev and prev["p95"] > 0 and cur["p95"] > prev["p95"] * (1 + tolerance):
+                regressions.append(f"{name}: p95 {prev['p95']:.3f} ms -> {cur['p95']:.3f} ms")
+    return regressions
+
+
+def print_report(results):
+    for res, r in results["results"].items():
+        hands = r.get("hands", 1)
+        print(f"\n{res} ({r['width']}x{r['height']}, {hands} hand{'s' if hands > 1 else ''}), {r['frames']} frames")
+        print(f"  {'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage in STAGES + ("end_to_end",):
+            p = r["end_to_end"] if stage == "end_to_end" else r["stages"][stage]
+            if p:
+                print(f"  {stage:<12}{p['p50']:>10.3f}{p['p95']:>10.3f}{p['p99']:>10.3f}")
+        err = r["tip_error_px"]
+        print(f"  FPS: {r['fps']:.1f}   detect rate: {r['detect_rate']:.0%}   "
+              f"tip error: {'n/a' if err is None else format(err['p50'], '.1f') + ' px (p50)'}")
+        quality = r.get("quality")
+        if quality:
+            shares = ", ".join(f"{name} {share:.0%}" for name, share in quality["levels"].items())
+            print(f"  quality @ {quality['budget_ms']:g} ms budget: {shares} ({quality['changes']} changes)")
+        lag = r["perceived_latency_ms"]
+        if lag:
+            print(f"  perceived latency: {lag['raw']:.1f} ms raw ({lag['measured_raw']:.1f} ms measured + "
+                  f"{lag['assumed_extra']:g} ms assumed) -> {lag['filtered']:.1f} ms with {lag['filter']} "
+                  f"({lag['improvement']:+.1f} ms)")
+    scaling = hand_scaling(results)
+    if scaling:
+        print("\nCost per frame relative to one hand (end-to-end mean):")
+        for res, ratios in scaling.items():
+            print(f"  {res}: " + ", ".join(f"{hands} hands x{ratio:.2f}" for hands, ratio in ratios.items()))
+
+
+def hand_scaling(results):
+    """End-to-end mean frame time with N hands over that with one hand, per resolution"""
+    scaling = {}
+    for res in RESOLUTIONS:
+        single = results["results"].get(res)
+        if not single or not single["end_to_end"]:
+            continue
+        for key, r in results["results"].items():
+            hands = r.get("hands", 1)
+            if hands > 1 and key == result_key(res, hands) and r["end_to_end"]:
+                scaling.setdefault(res, {})[hands] = r["end_to_end"]["mean"] / single["end_to_end"]["mean"]
+    return scaling
+
+
+def result_key(res, hands):
+    """Results entry name; single-hand runs keep the bare resolution so older baselines still compare"""
+    return res if hands == 1 else f"{res}/{hands} hands"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Gesture Brush pipeline benchmark")
+    parser.add_argument("--frames", type=int, default=200, help="measured frames per resolution")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured warm-up frames")
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--hands", type=int, nargs="+", default=list(HAND_COUNTS),
+                        help="numbers of hands in view to benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--landmarks", default="defects", choices=["defects", "kcurvature"], help="fingertip detector")
+    parser.add_argument("--filter", default="kalman", choices=["none", "oneeuro", "kalman"], help="cursor filter")
+    parser.add_argument("--camera-fps", type=painter.parse_positive, default=30.0, help="simulated capture rate")
+    parser.add_argument("--extra-latency-ms", type=painter.parse_non_negative, default=EXTRA_LATENCY_MS,
+                        help="capture/display latency to add to the measured processing time")
+    parser.add_argument("--detect-scale", type=painter.parse_scale, default=1.0,
+                        help="run detection on a frame downscaled by this factor")
+    parser.add_argument("--refine", action="store_true", help="refine downscaled fingertips at full resolution")
+    parser.add_argument("--budget-ms", type=painter.parse_non_negative, default=0.0,
+                        help="frame budget for the quality governor (0 = always full quality)")
+    parser.add_argument("--static-skin", action="store_true", help="fixed HSV skin window instead of the adaptive model")
+    parser.add_argument("--no-roi", action="store_true", help="segment the full frame every time (no ROI tracking)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p95 slowdown vs baseline (fraction)")
+    args = parser.parse_args(argv)
+
+    results = {"environment": environment(), "results": {}}
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        for hands in args.hands:
+            results["results"][result_key(res, hands)] = run_resolution(
+                width, height, args.frames, args.warmup, args.seed, roi=not args.no_roi,
+                method=args.landmarks, filter_spec=args.filter, camera_fps=args.camera_fps,
+                extra_latency=args.extra_latency_ms / 1e3, adaptive_skin=not args.static_skin,
+                detect_scale=args.detect_scale, refine=args.refine, budget_ms=args.budget_ms, hands=hands)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import math
+
+import cv2
+import numpy as np
+
+# Canvas pixels brighter than this (in grey) cover the camera frame
+COVERAGE_THRESHOLD = 50
+
+
+class CanvasCompositor:
+    """Screen-sized view of a TiledCanvas, with a coverage mask for compositing it over the camera
+
+    Painters draw into a TiledCanvas and show() keeps this canvas a view of
+    it: a moved or zoomed Viewport re-renders the screen from the tiles it
+    intersects, otherwise only the rectangles painted since the last call
+    are copied over. Every rectangle copied is marked dirty; composite()
+    refreshes the coverage mask only inside dirty rectangles and then merges
+    the canvas onto the frame with one masked copy limited to the painted
+    extent, so an idle or empty canvas costs next to nothing.
+    """
+
+    def __init__(self, width=640, height=480):
+        self.width = width
+        self.height = height
+        self.canvas = np.zeros((height, width, 3), np.uint8)
+        self.coverage = np.zeros((height, width), np.uint8)  # 255 where the canvas is opaque
+        self._dirty = []  # (x0, y0, x1, y1) rectangles touched since the last refresh
+        self._extent = None  # bounding box that contains every covered pixel
+        self._view = None  # Viewport.state the canvas shows
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """Flag a canvas rectangle as modified, so refresh() recomputes its coverage"""
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(self.width, int(x1)), min(self.height, int(y1))
+        if x0 < x1 and y0 < y1:
+            self._dirty.append((x0, y0, x1, y1))
+
+    # Viewing a TiledCanvas
+    def show(self, world, view):
+        """Bring the canvas up to date with the part of world that view shows"""
+        dirty = world.take_dirty()
+        if view.state != self._view:
+            self._view = view.state
+            self.canvas[:] = 0
+            self.coverage[:] = 0
+            self._dirty.clear()
+            self._extent = None
+            dirty = [world.bounds()] if world.tiles else []
+        zoom = view.zoom
+        for x0, y0, x1, y1 in dirty:
+            # Screen pixels sampled from the rectangle (a world pixel either side when zoomed out)
+            self._render(world, view, math.floor((x0 - 1 - view.x) * zoom), math.floor((y0 - 1 - view.y) * zoom),
+                         math.ceil((x1 - view.x) * zoom) + 1, math.ceil((y1 - view.y) * zoom) + 1)
+
+    def _render(self, world, view, x0, y0, x1, y1):
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        target = self.canvas[y0:y1, x0:x1]
+        if view.zoom == 1.0:  # pixel-aligned
+            ox, oy = int(view.x), int(view.y)
+            target[:] = world.read(ox + x0, oy + y0, ox + x1, oy + y1)
+        else:
+            # Each screen pixel's sample position depends on its own coordinates only, so a
+            # partial update gives the same pixels as a full render
+            xs = view.x + np.arange(x0, x1) / view.zoom
+            ys = view.y + np.arange(y0, y1) / view.zoom
+            if view.zoom > 1.0:  # nearest world pixel, as Viewport.to_world: whole-pixel maps
+                xs, ys = np.floor(xs + 0.5), np.floor(ys + 0.5)
+                interpolation = cv2.INTER_NEAREST
+            else:  # bilinear, at positions rounded to remap's 1/32 pixel so they convert exactly
+                xs, ys = np.floor(xs * 32 + 0.5) / 32, np.floor(ys * 32 + 0.5) / 32
+                interpolation = cv2.INTER_LINEAR
+            wx0, wy0 = math.floor(xs[0]), math.floor(ys[0])
+            source = world.read(wx0, wy0, math.floor(xs[-1]) + 2, math.floor(ys[-1]) + 2)
+            shape = target.shape[:2]
+            map_x = np.broadcast_to((xs - wx0).astype(np.float32), shape).copy()
+            map_y = np.broadcast_to((ys - wy0).astype(np.float32)[:, None], shape).copy()
+            cv2.remap(source, map_x, map_y, interpolation, dst=target)
+        self.mark_dirty(x0, y0, x1, y1)
+
+    # Compositing
+    def refresh(self):
+        """Bring the coverage mask up to date for the dirty rectangles"""
+        if not self._dirty:
+            return
+        for x0, y0, x1, y1 in self._dirty:
+            gray = cv2.cvtColor(self.canvas[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+            cv2.threshold(gray, COVERAGE_THRESHOLD, 255, cv2.THRESH_BINARY, dst=self.coverage[y0:y1, x0:x1])
+            self._extent = _union(self._extent, (x0, y0, x1, y1))
+        self._dirty.clear()
+
+    def composite(self, frm):
+        """Copy covered canvas pixels onto frm in place and return it"""
+        self.refresh()
+        if self._extent is None:
+            return frm
+        x0, y0, x1, y1 = self._extent
+        roi = frm[y0:y1, x0:x1]
+        cv2.copyTo(self.canvas[y0:y1, x0:x1], self.coverage[y0:y1, x0:x1], roi)
+        return frm
+
+    def inverse_coverage(self):
+        """Mask of pixels where the camera frame shows through (debug view)"""
+        self.refresh()
+        return cv2.bitwise_not(self.coverage)
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
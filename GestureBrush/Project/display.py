@@ -0,0 +1,136 @@
+import sys
+import threading
+import time
+from collections import deque
+
+import cv2
+
+DISPLAY_FPS = 60.0  # refresh cap of the main window (0: every frame)
+DEBUG_FPS = 5.0  # refresh cap of the debug views
+KEY_POLL = 0.01  # seconds between keyboard polls while no frame is waiting
+
+
+class Display:
+    """A window (plus optional debug windows) refreshed from its own thread
+
+    show() hands the display thread the newest frame without waiting; a
+    frame that arrives before the previous one was shown replaces it, and
+    at most fps frames a second are shown. The display thread also pumps
+    window events and queues key presses for keys(), so a slow window
+    system never holds up detection. Every HighGUI call, including
+    on_open (e.g. installing a mouse callback), happens on that thread.
+
+    Debug views are shown at debug_fps: when debug_due() says so, the
+    caller builds them and passes them to show() with the frame.
+
+    Where windows must belong to the main thread (macOS) the display runs
+    inline instead: show() blits at the same capped rate and polls the
+    keyboard every frame.
+    """
+
+    def __init__(self, window, fps=DISPLAY_FPS, debug_fps=DEBUG_FPS, on_open=None, threaded=None):
+        self.window = window
+        self.interval = 1.0 / fps if fps else 0.0
+        self.debug_interval = 1.0 / debug_fps if debug_fps else 0.0
+        self.on_open = on_open
+        self.threaded = sys.platform != "darwin" if threaded is None else threaded
+        self.shown = 0
+        self.skipped = 0  # frames replaced by a newer one before they were shown
+        self._frame = None
+        self._views = {}
+        self._keys = deque()
+        self._next = 0.0  # earliest time the next frame may be shown
+        self._debug_next = 0.0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        if self.threaded:
+            opened = threading.Event()
+            self._running = True
+            self._thread = threading.Thread(target=self._run, args=(opened,), name="Display", daemon=True)
+            self._thread.start()
+            opened.wait()
+        else:
+            self._open()
+        return self
+
+    def _open(self):
+        cv2.namedWindow(self.window)
+        if self.on_open is not None:
+            self.on_open()
+
+    def debug_due(self, now=None):
+        """Whether debug views passed to the next show() will be displayed"""
+        now = time.perf_counter() if now is None else now
+        if now < self._debug_next:
+            return False
+        self._debug_next = now + self.debug_interval
+        return True
+
+    def show(self, image, views=None):
+        """Queue image for the window and {window name: image} debug views; the images must not be modified later"""
+        if not self.threaded:
+            now = time.perf_counter()
+            if now >= self._next:
+                self._next = now + self.interval
+                cv2.imshow(self.window, image)
+                self.shown += 1
+            else:
+                self.skipped += 1
+            for name, view in (views or {}).items():
+                cv2.imshow(name, view)
+            self._poll(1)
+            return
+        with self._cond:
+            if self._frame is not None:
+                self.skipped += 1
+            self._frame = image
+            if views:
+                self._views.update(views)
+            self._cond.notify_all()
+
+    def keys(self):
+        """Keys pressed since the last call, oldest first"""
+        keys = []
+        while self._keys:
+            keys.append(self._keys.popleft())
+        return keys
+
+    def close(self):
+        if self._thread is not None:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+        else:
+            cv2.destroyAllWindows()
+
+    def _poll(self, delay_ms):
+        key = cv2.waitKey(delay_ms)  # also pumps window events
+        if key != -1:
+            self._keys.append(key & 0xFF)
+
+    def _run(self, opened):
+        self._open()
+        opened.set()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._frame is not None or not self._running, KEY_POLL)
+                if not self._running:
+                    break
+                frame, self._frame = self._frame, None
+                views, self._views = self._views, {}
+            delay = 1
+            if frame is not None:
+                cv2.imshow(self.window, frame)
+                self.shown += 1
+                now = time.perf_counter()
+                self._next = max(self._next + self.interval, now)  # a steady cadence, without bursts after a stall
+                delay = max(1, round((self._next - now) * 1e3))
+            for name, view in views.items():
+                cv2.imshow(name, view)
+            self._poll(delay)  # waiting here is what caps the refresh rate
+        cv2.destroyAllWindows()
@@ -0,0 +1,213 @@
+import math
+
+import numpy as np
+
+MISSING = -1  # same sentinel as gesture_brush.MISSING
+
+
+class OneEuroFilter:
+    """One-Euro low-pass filter over an array of points (Casiez et al. 2012)
+
+    Smooths heavily when the points are still and lets fast motion through
+    with little lag: the cutoff rises with the filtered speed.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.02, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff  # Hz at rest; lower = smoother
+        self.beta = beta  # cutoff increase per px/s of speed; higher = less lag
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._dx = None
+        self._t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, points, t, lead=0.0):
+        x = np.asarray(points, np.float64)
+        if self._x is None or self._x.shape != x.shape:
+            self._x, self._dx, self._t = x.copy(), np.zeros_like(x), t
+            return self._x.copy()
+        dt = max(t - self._t, 1e-4)
+        self._t = t
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._dx += a_d * ((x - self._x) / dt - self._dx)
+        speed = np.hypot(self._dx[..., 0], self._dx[..., 1])[..., None]
+        a = self._alpha(self.min_cutoff + self.beta * speed, dt)
+        self._x += a * (x - self._x)
+        return self._x + self._dx * lead
+
+    def reinit(self, mask, points):
+        """Restart the points selected by mask (e.g. landmarks that reappeared)"""
+        self._x[mask] = points[mask]
+        self._dx[mask] = 0
+
+
+class KalmanPredictor:
+    """Constant-velocity Kalman filter per coordinate, forecasting `lead` seconds ahead
+
+    Each coordinate of each point is an independent [position, velocity]
+    track, so the whole landmark array updates with a handful of array ops.
+    """
+
+    def __init__(self, process_noise=2e5, measurement_noise=4.0):
+        self.q = process_noise  # acceleration noise spectral density (px^2/s^3)
+        self.r = measurement_noise  # measurement variance (px^2)
+        self.reset()
+
+    def reset(self):
+        self._x = None  # positions
+        self._v = None  # velocities
+        self._p = None  # covariance terms p00, p01, p11
+        self._t = None
+
+    def __call__(self, points, t, lead=0.0):
+        z = np.asarray(points, np.float64)
+        if self._x is None or self._x.shape != z.shape:
+            self._x, self._v, self._t = z.copy(), np.zeros_like(z), t
+            self._p = [np.full_like(z, self.r), np.zeros_like(z), np.full_like(z, 1e4)]
+            return self._x.copy()
+        dt = max(t - self._t, 1e-4)
+        self._t = t
+        p00, p01, p11 = self._p
+        q = self.q
+
+        # Predict
+        self._x += dt * self._v
+        p00 += dt * (2 * p01 + dt * p11) + q * dt ** 3 / 3
+        p01 += dt * p11 + q * dt ** 2 / 2
+        p11 += q * dt
+
+        # Update with the measurement
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        innovation = z - self._x
+        self._x += k0 * innovation
+        self._v += k1 * innovation
+        p11 -= k1 * p01
+        p01 -= k0 * p01
+        p00 -= k0 * p00
+        return self._x + self._v * lead
+
+    def reinit(self, mask, points):
+        """Restart the points selected by mask (e.g. landmarks that reappeared)"""
+        self._x[mask] = points[mask]
+        self._v[mask] = 0
+        p00, p01, p11 = self._p
+        p00[mask], p01[mask], p11[mask] = self.r, 0, 1e4
+
+
+FILTERS = {
+    "none": None,
+    "oneeuro": OneEuroFilter,
+    "kalman": KalmanPredictor,
+}
+
+
+class LandmarkFilter:
+    """Applies a filter per landmark, batching landmarks that share a filter type
+
+    config maps landmark index -> filter name ("none", "oneeuro", "kalman");
+    unlisted landmarks use `default`. Only the "kalman" predictor applies the
+    latency lead; the others just smooth.
+    """
+
+    def __init__(self, config=None, default="oneeuro", num_landmarks=21):
+        names = [default] * num_landmarks
+        for index, name in (config or {}).items():
+            names[index] = name
+        self.groups = []
+        for name in dict.fromkeys(names):
+            if FILTERS[name] is None:
+                continue
+            indices = np.array([i for i, n in enumerate(names) if n == name])
+            self.groups.append((indices, FILTERS[name](), name == "kalman"))
+        self._seen = [None] * len(self.groups)  # which landmarks of each group have state
+
+    def reset(self):
+        for _, f, _ in self.groups:
+            f.reset()
+        self._seen = [None] * len(self.groups)
+
+    def forget(self, landmarks):
+        """Restart the given landmark indices from their next sighting"""
+        for g, (indices, _, _) in enumerate(self.groups):
+            if self._seen[g] is not None:
+                self._seen[g][np.isin(indices, landmarks)] = False
+
+    def __call__(self, landmarks, t, lead=0.0):
+        """Filtered copy of a (N, 2) landmark array; MISSING points stay MISSING"""
+        if landmarks is None:
+            self.reset()
+            return None
+        out = landmarks.copy()
+        for g, (indices, f, predicts) in enumerate(self.groups):
+            pts = landmarks[indices].astype(np.float64)
+            present = pts[:, 0] != MISSING
+            if not present.any():
+                continue
+            seen = self._seen[g]
+            if seen is None:
+                # First sighting: seed absent slots from a present one so state stays finite
+                pts[~present] = pts[present][0]
+                seen = present.copy()
+                smoothed = f(pts, t, lead if predicts else 0.0)
+            else:
+                # Filter every slot so state shapes stay fixed; absent ones are held in place
+                held = np.where(present[:, None], pts, f._x)
+                smoothed = f(held, t, lead if predicts else 0.0)
+                new = present & ~seen
+                if new.any():
+                    f.reinit(new, held)
+                    smoothed[new] = held[new]
+                seen |= present
+            self._seen[g] = seen
+            out[indices[present]] = np.rint(smoothed[present]).astype(out.dtype)
+        return out
+
+
+class HandFilters:
+    """LandmarkFilter over several hands at once, keyed by hand ID
+
+    The hands' landmarks are stacked into one array (hand ID k in rows
+    k * num_landmarks onwards), so each frame costs one pass through the
+    filter groups however many hands are in view. A hand left out of a
+    call starts afresh when it returns.
+    """
+
+    def __init__(self, config=None, default="oneeuro", num_landmarks=21, hands=1):
+        self.config = config or {}
+        self.default = default
+        self.num_landmarks = num_landmarks
+        self._build(hands)
+
+    def _build(self, hands):
+        n = self.num_landmarks
+        config = {hand * n + index: name for hand in range(hands) for index, name in self.config.items()}
+        self.filter = LandmarkFilter(config, self.default, n * hands)
+        self.hands = hands
+        self._present = set()
+
+    def __call__(self, hands, t, lead=0.0):
+        """Filtered copies of {hand ID: (num_landmarks, 2) landmarks}"""
+        if not hands:
+            self.filter.reset()
+            self._present = set()
+            return {}
+        if max(hands) >= self.hands:
+            self._build(max(max(hands) + 1, 2 * self.hands))  # more IDs than slots: start over, larger
+        n = self.num_landmarks
+        gone = self._present - hands.keys()
+        if gone:
+            self.filter.forget(np.concatenate([np.arange(hand * n, (hand + 1) * n) for hand in gone]))
+        self._present = set(hands)
+        stacked = np.full((self.hands * n, 2), MISSING, np.int32)
+        for hand, landmarks in hands.items():
+            stacked[hand * n:(hand + 1) * n] = landmarks
+        out = self.filter(stacked, t, lead)
+        return {hand: out[hand * n:(hand + 1) * n] for hand in hands}
@@ -0,0 +1,285 @@
+import glob
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+import cv2
+import numpy as np
+
+# A captured frame together with the time it was grabbed (time.perf_counter)
+Frame = namedtuple("Frame", ["image", "timestamp", "index"])
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    """Background capture thread feeding a bounded ring buffer of frames
+
+    Live sources drop the oldest buffered frame when the consumer falls
+    behind, so read() always hands out the freshest image. Replay sources
+    set drop_oldest=False and apply back-pressure instead, so every
+    recorded frame is processed exactly once.
+    """
+
+    def __init__(self, buffer_size=2, drop_oldest=True):
+        self.buffer_size = max(1, buffer_size)
+        self.drop_oldest = drop_oldest
+        self.dropped = 0  # frames discarded because the buffer was full
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._finished = False
+        self._error = None  # what stopped the capture thread, raised by read() once the buffer is drained
+        self._index = 0
+
+    # Backend hooks
+    def _open(self):
+        """Open the underlying device or file"""
+
+    def _grab(self):
+        """Return the next image, or None when the source is exhausted"""
+        raise NotImplementedError
+
+    def _close(self):
+        """Release the underlying device or file"""
+
+    # Public API
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._open()
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def read(self, timeout=None):
+        """Return the oldest buffered Frame, or None once the source has ended
+
+        Raises what stopped the capture thread, if it failed, after the
+        frames it buffered before that.
+        """
+        with self._cond:
+            while not self._buffer:
+                if self._error is not None:
+                    error, self._error = self._error, None
+                    raise error
+                if self._finished or not self._running:
+                    return None
+                if not self._cond.wait(timeout):
+                    return None
+            frame = self._buffer.popleft()
+            self._cond.notify_all()
+            return frame
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    def _capture_loop(self):
+        try:
+            self._capture()
+        except Exception as e:  # e.g. a decoder error: handed to the reader instead of dying with the thread
+            with self._cond:
+                self._error = e
+        finally:
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    def _capture(self):
+        while self._running:
+            image = self._grab()
+            timestamp = time.perf_counter()
+            if image is None:
+                break
+            frame = Frame(image, timestamp, self._index)
+            self._index += 1
+            with self._cond:
+                if len(self._buffer) >= self.buffer_size:
+                    if self.drop_oldest:
+                        self._buffer.popleft()
+                        self.dropped += 1
+                    else:
+                        while self._running and len(self._buffer) >= self.buffer_size:
+                            self._cond.wait()
+                        if not self._running:
+                            break
+                self._buffer.append(frame)
+                self._cond.notify_all()
+
+
+class WebcamSource(FrameSource):
+    """Live camera capture; frames are mirrored so the view acts like a mirror"""
+
+    def __init__(self, device=0, width=640, height=480, flip=True, buffer_size=2):
+        super().__init__(buffer_size=buffer_size, drop_oldest=True)
+        self.device = device
+        self.width = width
+        self.height = height
+        self.flip = flip
+        self._cap = None
+
+    def _open(self):
+        self._cap = cv2.VideoCapture(self.device)
+        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        # Keep the driver-side queue short so we never read stale frames
+        self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def _grab(self):
+        ok, frm = self._cap.read()
+        if not ok:
+            return None
+        return cv2.flip(frm, 1) if self.flip else frm
+
+    def _close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class VideoFileSource(FrameSource):
+    """Replay a recorded video file, optionally paced at its native frame rate"""
+
+    def __init__(self, path, realtime=False, loop=False, flip=False, buffer_size=4):
+        super().__init__(buffer_size=buffer_size, drop_oldest=realtime)
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.flip = flip
+        self._cap = None
+        self._interval = 0.0
+        self._next_time = 0.0
+
+    def _open(self):
+        self._cap = cv2.VideoCapture(self.path)
+        if not self._cap.isOpened():
+            raise IOError(f"Could not open video file: {self.path}")
+        fps = self._cap.get(cv2.CAP_PROP_FPS)
+        self._interval = 1.0 / fps if self.realtime and fps > 0 else 0.0
+        self._next_time = time.perf_counter()
+
+    def _grab(self):
+        ok, frm = self._cap.read()
+        if not ok and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frm = self._cap.read()
+        if not ok:
+            return None
+        _pace(self)
+        return cv2.flip(frm, 1) if self.flip else frm
+
+    def _close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class ImageSequenceSource(FrameSource):
+    """Replay a directory (or glob pattern) of still images in sorted order"""
+
+    def __init__(self, pattern, fps=0.0, loop=False, flip=False, buffer_size=4):
+        super().__init__(buffer_size=buffer_size, drop_oldest=fps > 0)
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+            paths = [p for p in paths if p.lower().endswith(IMAGE_EXTENSIONS)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        if not self.paths:
+            raise IOError(f"No images found for: {pattern}")
+        self.loop = loop
+        self.flip = flip
+        self.unreadable = set()  # paths skipped because they could not be decoded
+        self._interval = 1.0 / fps if fps > 0 else 0.0
+        self._next_time = 0.0
+        self._pos = 0
+
+    def _open(self):
+        self._pos = 0
+        self._next_time = time.perf_counter()
+
+    def _grab(self):
+        for _ in range(len(self.paths)):  # unreadable files are skipped, but never more than a whole pass
+            if self._pos >= len(self.paths):
+                if not self.loop:
+                    return None
+                self._pos = 0
+            path = self.paths[self._pos]
+            self._pos += 1
+            frm = cv2.imread(path)
+            if frm is not None:
+                _pace(self)
+                return cv2.flip(frm, 1) if self.flip else frm
+            if path not in self.unreadable:
+                self.unreadable.add(path)
+                print(f"Skipping unreadable image: {path}")
+        return None
+
+
+class BlankSource(FrameSource):
+    """Plain frames at a steady rate, for painting without a camera"""
+
+    def __init__(self, width=640, height=480, color=(255, 255, 255), fps=30.0):
+        super().__init__(buffer_size=1, drop_oldest=True)
+        self.image = np.full((height, width, 3), color, np.uint8)
+        self._interval = 1.0 / fps
+        self._next_time = 0.0
+
+    def _open(self):
+        self._next_time = time.perf_counter()
+
+    def _grab(self):
+        _pace(self)
+        return self.image.copy()  # painted on downstream
+
+
+def _pace(source):
+    """Sleep until the next frame is due when replaying in real time"""
+    if not source._interval:
+        return
+    now = time.perf_counter()
+    if source._next_time > now:
+        time.sleep(source._next_time - now)
+    source._next_time = max(source._next_time, now) + source._interval
+
+
+def parse_size(text):
+    """(width, height) from a WIDTHxHEIGHT string such as 1280x720"""
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def open_source(spec=0, width=640, height=480, realtime=False, loop=False):
+    """Create a frame source from a camera index, video file, directory, glob or recorded session (None: blank frames)"""
+    if spec is None:
+        return BlankSource(width, height)
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return WebcamSource(int(spec), width=width, height=height)
+    if os.path.isdir(spec) and os.path.isfile(os.path.join(spec, "session.json")):
+        from session import SessionSource  # a recorded session's frames (session.py imports this module)
+        return SessionSource(spec, realtime=realtime, loop=loop)
+    if os.path.isdir(spec) or any(ch in spec for ch in "*?["):
+        return ImageSequenceSource(spec, fps=30.0 if realtime else 0.0, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
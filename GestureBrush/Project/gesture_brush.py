@@ -2,15 +2,7 @@ import cv2
 import numpy as np
 import math
 
-# Constants
-curr_tool = "Select Tool"
-curr_color = (22, 22, 255)  # Default color: bright red
-trad = 15  # tools selection radius
-crad = 15  # color selection radius 
-var_inits = False  # variables initialised? No
-bthickness = 4  # brush thickness
-erad = 30  # erase radius
-x_prev, y_prev = 0, 0  # initialize variables
+import metrics
 
 # Hand landmarks (similar to MediaPipe)
 HAND_LANDMARKS = {
@@ -25,242 +17,369 @@ HAND_LANDMARKS = {
     'RING_FINGER_PIP': 14,
     'PINKY_PIP': 18
 }
+NUM_LANDMARKS = 21
+MISSING = -1  # coordinate value of a landmark that was not detected
 
-def getTool(x):
-    """Select tool based on x position"""
-    if x < 200:
-        return "Draw"
-    elif x < 250:
-        return "Line"
-    elif x < 300:
-        return "Rectangle"
-    elif x < 350:
-        return "Circle"
-    else:
-        return "Erase"
-
-def getColor(y):
-    """Select color based on y position"""
-    if y < 100:
-        return (89, 222, 255)  # Yellow
-    elif y < 140:
-        return (87, 217, 126)  # Grass Green
-    elif y < 180:
-        return (203, 194, 0)  # Aqua Blue
-    elif y < 220:
-        return (22, 22, 255)  # Bright Red
-    else:
-        return (230, 108, 203)  # Magenta
+# Landmark slots filled by detected fingertips, in detection order
+FINGER_TIPS = np.array([HAND_LANDMARKS['INDEX_FINGER_TIP'], HAND_LANDMARKS['MIDDLE_FINGER_TIP'],
+                        HAND_LANDMARKS['RING_FINGER_TIP'], HAND_LANDMARKS['PINKY_TIP']])
 
-def detect_hand_landmarks(frame):
-    """Advanced hand detection with landmark tracking"""
-    # Convert to HSV for better skin detection
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    
-    # Define range for skin color (more specific for palm)
-    lower_skin = np.array([0, 30, 60], dtype=np.uint8)
-    upper_skin = np.array([20, 255, 255], dtype=np.uint8)
-    
-    # Create mask for skin color
-    skin_mask = cv2.inRange(hsv, lower_skin, upper_skin)
-    
-    # Apply morphological operations to clean up the mask
-    kernel = np.ones((3, 3), np.uint8)
-    skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_OPEN, kernel)
-    skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_CLOSE, kernel)
-    
-    # Find contours
-    contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    if contours:
-        # Filter contours by area to focus on hand-sized objects
-        hand_contours = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > 5000 and area < 50000:  # Filter by reasonable hand size
-                hand_contours.append(contour)
-        
-        if hand_contours:
-            # Get the largest contour (assumed to be hand)
-            largest_contour = max(hand_contours, key=cv2.contourArea)
-            
-            # Get convex hull and defects for finger detection
-            hull = cv2.convexHull(largest_contour, returnPoints=False)
-            defects = cv2.convexityDefects(largest_contour, hull)
+# A defect is a gap between fingers when acos(...) * 57 <= 90 (the original
+# threshold); comparing cosines gives the same decision without acos
+FINGER_ANGLE_COS = math.cos(90 / 57)
+# Area of a hand (skin pixels) in a 640x480 frame; scaled with the area of the frame searched
+HAND_AREA_MIN = 5000
+HAND_AREA_MAX = 50000
+HAND_AREA_REFERENCE = 640 * 480
+HAND_MAX_ASPECT = 10.0  # longer over shorter side of a hand's bounding box, a forearm to the frame's edge included
+HAND_MIN_FILL = 0.05  # fraction of its bounding box a hand (and diagonal forearm) covers; sparser blobs are noise
+KCURVATURE_K = 5  # contour points either side of a tip candidate
+KCURVATURE_MAX_ANGLE = 60  # degrees; sharper points are fingertip candidates
+
+def segment_skin(frame, skin=None, morphology=2):
+    """Binary skin mask for a BGR frame, from a SkinModel when given
+
+    morphology is the number of clean-up passes: 2 = open and close,
+    1 = open only, 0 = none.
+    """
+    with metrics.timer("color"):
+        if skin is not None:
+            skin_mask = skin.mask(frame)
+        else:
+            # Convert to HSV for better skin detection
+            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
             
-            # Extract landmarks
-            landmarks = extract_landmarks(largest_contour, defects)
+            # Define range for skin color (more specific for palm)
+            lower_skin = np.array([0, 30, 60], dtype=np.uint8)
+            upper_skin = np.array([20, 255, 255], dtype=np.uint8)
             
-            return landmarks, largest_contour
+            # Create mask for skin color
+            skin_mask = cv2.inRange(hsv, lower_skin, upper_skin)
     
-    return None, None
+    # Apply morphological operations to clean up the mask
+    with metrics.timer("segmentation"):
+        kernel = np.ones((3, 3), np.uint8)
+        if morphology >= 1:
+            skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_OPEN, kernel)
+        if morphology >= 2:
+            skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_CLOSE, kernel)
+    return skin_mask
 
-def extract_landmarks(contour, defects):
-    """Extract hand landmarks from contour and defects"""
-    landmarks = {}
-    
-    # Find extreme points
-    leftmost = tuple(contour[contour[:, :, 0].argmin()][0])
-    rightmost = tuple(contour[contour[:, :, 0].argmax()][0])
-    topmost = tuple(contour[contour[:, :, 1].argmin()][0])
-    bottommost = tuple(contour[contour[:, :, 1].argmax()][0])
+def find_hand_contours(skin_mask, frame_shape=None, max_hands=1, speckled=False):
+    """Up to max_hands hand-sized contours in a skin mask, largest first
+
+    frame_shape is the shape of the whole frame when the mask covers only
+    part of it; hand size limits scale with the frame's area. Blobs are
+    judged together by area, aspect ratio and how much of their bounding
+    box they fill. A cleaned-up mask is cheapest to trace whole, with the
+    areas and boxes of all its contours computed in one NumPy pass. Only a
+    speckled mask (speckled: no morphology, the governor's bare level),
+    which can hold thousands of noise blobs, is labelled with
+    connectedComponentsWithStats instead, and then only the chosen blobs
+    are traced, each within its own box.
+    """
+    height, width = (frame_shape or skin_mask.shape)[:2]
+    area_scale = height * width / HAND_AREA_REFERENCE
+    if speckled:
+        return _labelled_hand_contours(skin_mask, area_scale, max_hands)
+    contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return []
+    area, w, h = contour_stats(contours)
+    return [contours[i] for i in _pick_hands(np.arange(len(contours)), area, w, h, area_scale, max_hands)]
+
+def contour_stats(contours):
+    """Areas (as cv2.contourArea) and bounding box widths and heights of contours, in one vectorized pass"""
+    lengths = np.fromiter(map(len, contours), np.intp, len(contours))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    x, y = np.concatenate(contours).reshape(-1, 2).astype(np.int64).T
+    following = np.arange(1, len(x) + 1)
+    following[ends - 1] = starts  # each contour closes on its first point
+    area = np.abs(np.add.reduceat(x * y[following] - x[following] * y, starts)) / 2  # shoelace formula
+    w = np.maximum.reduceat(x, starts) - np.minimum.reduceat(x, starts) + 1
+    h = np.maximum.reduceat(y, starts) - np.minimum.reduceat(y, starts) + 1
+    return area, w, h
+
+def _labelled_hand_contours(skin_mask, area_scale, max_hands):
+    """find_hand_contours() by labelling the blobs inside the box around all skin pixels"""
+    x0, y0, w0, h0 = cv2.boundingRect(skin_mask)
+    if w0 == 0:
+        return []
+    _, labels, stats, _ = cv2.connectedComponentsWithStatsWithAlgorithm(skin_mask[y0:y0 + h0, x0:x0 + w0], 8,
+                                                                        cv2.CV_32S, cv2.CCL_GRANA)
+    x, y, w, h, area = stats[1:].T  # label 0 is the background
+    contours = []
+    for i in _pick_hands(np.arange(len(area)), area, w, h, area_scale, max_hands):
+        blob = cv2.compare(labels[y[i]:y[i] + h[i], x[i]:x[i] + w[i]], int(i) + 1, cv2.CMP_EQ)
+        traced, _ = cv2.findContours(blob, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                     offset=(int(x0 + x[i]), int(y0 + y[i])))
+        contours.append(traced[0])  # one outline: the blob is a single 8-connected component
+    return contours
+
+def _pick_hands(ids, area, w, h, area_scale, max_hands):
+    """The ids of the max_hands largest hand-shaped blobs, given their areas and bounding box sizes"""
+    hand = ((HAND_AREA_MIN * area_scale < area) & (area < HAND_AREA_MAX * area_scale)
+            & (np.maximum(w, h) <= HAND_MAX_ASPECT * np.minimum(w, h)) & (area >= HAND_MIN_FILL * w * h))
+    order = np.argsort(-area[hand], kind="stable")[:max_hands]
+    return ids[hand][order]
+
+def find_hand_contour(skin_mask, frame_shape=None):
+    """Pick the hand contour (the largest hand-sized one) out of a skin mask, or None"""
+    contours = find_hand_contours(skin_mask, frame_shape)
+    return contours[0] if contours else None
+
+def convexity_defects(contour):
+    """Convexity defects of the hand contour, used for finger detection"""
+    hull = cv2.convexHull(contour, returnPoints=False)
+    return cv2.convexityDefects(contour, hull)
+
+def track_hand_contours(frame, tracker, skin=None, morphology=2, max_hands=1, region=None):
+    """Find up to max_hands hand contours, searching only around the last known hands when possible
+
+    region (x0, y0, x1, y1) limits the search for hands that are not
+    tracked yet to where the frame changed.
+    """
+    for windows in tracker.search_windows(frame.shape, max_hands, region):
+        per_window = max_hands if len(windows) == 1 else 1  # hands tracked apart: one in each window
+        found = []
+        for x0, y0, x1, y1 in windows:
+            skin_mask = segment_skin(frame[y0:y1, x0:x1], skin, morphology)
+            with metrics.timer("contours"):
+                contours = find_hand_contours(skin_mask, frame.shape, per_window, morphology == 0)
+            for contour in contours:
+                contour += np.array([x0, y0], dtype=contour.dtype)
+                found.append((contour, (x0, y0, x1, y1)))
+        if found and tracker.update([(cv2.boundingRect(c), window) for c, window in found], frame.shape):
+            if len(windows) > 1:
+                found.sort(key=lambda pair: cv2.contourArea(pair[0]), reverse=True)
+            return [contour for contour, _ in found]
+    tracker.lost()
+    return []
+
+def track_hand_contour(frame, tracker, skin=None, morphology=2):
+    """Find the hand contour, searching only around its last position when possible"""
+    contours = track_hand_contours(frame, tracker, skin, morphology)
+    return contours[0] if contours else None
+
+def detect_hands(frame, tracker=None, method="defects", skin=None, scale=1.0, morphology=2, max_hands=1,
+                 region=None):
+    """Landmarks and contours of up to max_hands hands, largest first
+
+    One segmentation pass finds every hand, so extra hands only add their
+    contour analysis. With scale < 1 detection runs on a downscaled copy
+    of the frame; the (landmarks, contour) pairs are returned in full
+    frame coordinates. With a tracker, region (x0, y0, x1, y1 of frame)
+    is where new hands are searched for instead of the whole frame.
+    """
+    with metrics.timer("resize"):
+        small = downscale(frame, scale)
+
+    if tracker is not None:
+        contours = track_hand_contours(small, tracker, skin, morphology, max_hands,
+                                       scale_region(region, frame.shape, small.shape))
+    else:
+        skin_mask = segment_skin(small, skin, morphology)
+        with metrics.timer("contours"):
+            contours = find_hand_contours(skin_mask, max_hands=max_hands, speckled=morphology == 0)
+    if skin is not None:
+        # Adapt the skin colours to the hands in turn, so no one's skin tone is forgotten
+        skin.learn(small, contours[skin.updates % len(contours)] if contours else None)
+    if not contours:
+        return []
+
+    # Convex hull defects per hand for finger detection
+    with metrics.timer("contours"):
+        defects = [convexity_defects(c) if method == "defects" else None for c in contours]
+
+    # Extract landmarks and map every hand back to full frame coordinates at once
+    with metrics.timer("landmarks"):
+        landmarks = np.stack([extract_landmarks(c, d, method) for c, d in zip(contours, defects)])
+        fx, fy = frame.shape[1] / small.shape[1], frame.shape[0] / small.shape[0]
+        landmarks = scale_landmarks(landmarks, fx, fy)
+        return [(lm, scale_contour(c, fx, fy)) for lm, c in zip(landmarks, contours)]
+
+def detect_hand_landmarks(frame, tracker=None, method="defects", skin=None, scale=1.0, morphology=2):
+    """Advanced hand detection with landmark tracking
+
+    With scale < 1 detection runs on a downscaled copy of the frame; the
+    landmarks and contour are returned in full frame coordinates.
+    """
+    hands = detect_hands(frame, tracker, method, skin, scale, morphology)
+    return hands[0] if hands else (None, None)
+
+def downscale(frame, scale):
+    """Area-averaged copy of frame at `scale` (the frame itself at 1)"""
+    if not 0 < scale <= 1:
+        raise ValueError(f"scale must be in (0, 1], got {scale}")
+    # Exact halvings take OpenCV's fast 2x2 averaging path; one large general step is much slower
+    while scale <= 0.5 + 1e-9:
+        frame = cv2.resize(frame, (frame.shape[1] // 2, frame.shape[0] // 2), interpolation=cv2.INTER_AREA)
+        scale *= 2
+    if scale < 1.0:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return frame
+
+def scale_landmarks(landmarks, fx, fy):
+    """Landmarks mapped to another resolution; MISSING points stay MISSING"""
+    if landmarks is None or (fx == 1 and fy == 1):
+        return landmarks
+    scaled = np.rint(landmarks * np.array([fx, fy])).astype(np.int32)
+    scaled[landmarks[..., 0] == MISSING] = MISSING  # also for a (hands, NUM_LANDMARKS, 2) stack
+    return scaled
+
+def scale_region(region, shape, new_shape):
+    """(x0, y0, x1, y1) of a frame of `shape` mapped outwards onto a resized copy of `new_shape`; None stays None"""
+    if region is None:
+        return None
+    sx, sy = new_shape[1] / shape[1], new_shape[0] / shape[0]
+    return (int(region[0] * sx), int(region[1] * sy),
+            min(new_shape[1], math.ceil(region[2] * sx)), min(new_shape[0], math.ceil(region[3] * sy)))
+
+def scale_contour(contour, fx, fy):
+    """Contour mapped to another resolution"""
+    if contour is None or (fx == 1 and fy == 1):
+        return contour
+    return np.rint(contour * np.array([fx, fy])).astype(contour.dtype)
+
+def refine_fingertips(frame, landmarks, scale, skin=None):
+    """Snap fingertips detected at `scale` to the full-resolution silhouette
+
+    Each fingertip moves to the skin pixel farthest from the wrist within
+    a couple of downscaled pixels of its estimate, recovering the detail
+    lost by detecting on a smaller frame.
+    """
+    if landmarks is None or not landmark_present(landmarks, HAND_LANDMARKS['WRIST']):
+        return landmarks
+    radius = int(math.ceil(2 / scale)) + 1
+    refined = landmarks.copy()
+    height, width = frame.shape[:2]
+    wx, wy = landmarks[HAND_LANDMARKS['WRIST']]
+    for idx in np.append(FINGER_TIPS, HAND_LANDMARKS['THUMB_TIP']):
+        if not landmark_present(landmarks, idx):
+            continue
+        x, y = landmarks[idx]
+        x0, y0 = max(0, x - radius), max(0, y - radius)
+        x1, y1 = min(width, x + radius + 1), min(height, y + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        ys, xs = np.nonzero(segment_skin(frame[y0:y1, x0:x1], skin))
+        if len(xs) == 0:
+            continue
+        far = np.argmax((xs + x0 - wx) ** 2 + (ys + y0 - wy) ** 2)
+        refined[idx] = (xs[far] + x0, ys[far] + y0)
+    return refined
+
+def extract_landmarks(contour, defects, method="defects", min_depth=0.0):
+    """Extract hand landmarks from contour and defects
+
+    Returns a (NUM_LANDMARKS, 2) int32 array of (x, y) points; landmarks
+    that were not found are MISSING (-1, -1).
+    """
+    landmarks = np.full((NUM_LANDMARKS, 2), MISSING, np.int32)
+    points = contour.reshape(-1, 2)
     
-    # Wrist (bottom center)
-    landmarks[HAND_LANDMARKS['WRIST']] = bottommost
+    # Wrist (bottom center) and fallback index tip from the extreme points
+    ys = points[:, 1]
+    topmost = points[ys.argmin()]
+    landmarks[HAND_LANDMARKS['WRIST']] = points[ys.argmax()]
     
-    # Find finger tips using convexity defects
-    finger_tips = []
-    if defects is not None:
-        for i in range(defects.shape[0]):
-            s, e, f, d = defects[i][0]
-            start = tuple(contour[s][0])
-            end = tuple(contour[e][0])
-            far = tuple(contour[f][0])
-            
-            # Calculate distances
-            a = math.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
-            b = math.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
-            c = math.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
-            
-            # Calculate angle
-            angle = math.acos((b**2 + c**2 - a**2)/(2*b*c)) * 57
-            
-            # If angle is less than 90 degrees, it's likely a finger
-            if angle <= 90:
-                finger_tips.append(end)
+    if method == "kcurvature":
+        finger_tips = kcurvature_fingertips(points)
+    else:
+        finger_tips = defect_fingertips(points, defects, min_depth)
     
     # Assign finger tips to landmarks
-    if len(finger_tips) >= 1:
-        landmarks[HAND_LANDMARKS['INDEX_FINGER_TIP']] = finger_tips[0]
-    if len(finger_tips) >= 2:
-        landmarks[HAND_LANDMARKS['MIDDLE_FINGER_TIP']] = finger_tips[1]
-    if len(finger_tips) >= 3:
-        landmarks[HAND_LANDMARKS['RING_FINGER_TIP']] = finger_tips[2]
-    if len(finger_tips) >= 4:
-        landmarks[HAND_LANDMARKS['PINKY_TIP']] = finger_tips[3]
+    count = min(len(finger_tips), len(FINGER_TIPS))
+    landmarks[FINGER_TIPS[:count]] = finger_tips[:count]
     
     # Use topmost point as index finger tip if no defects found
-    if HAND_LANDMARKS['INDEX_FINGER_TIP'] not in landmarks:
+    if count == 0:
         landmarks[HAND_LANDMARKS['INDEX_FINGER_TIP']] = topmost
     
     return landmarks
 
+def defect_fingertips(points, defects, min_depth=0.0):
+    """Fingertips at the ends of convexity defects with an acute angle, in defect order"""
+    if defects is None:
+        return points[:0]
+    defects = defects.reshape(-1, 4)  # OpenCV 4 returns (N, 1, 4), OpenCV 5 returns (N, 4)
+    start = points[defects[:, 0]].astype(np.float32)
+    end = points[defects[:, 1]]
+    far = points[defects[:, 2]].astype(np.float32)
+    
+    # Triangle sides for all defects at once (law of cosines at the far point)
+    a2 = ((end - start) ** 2).sum(axis=1)
+    b2 = ((far - start) ** 2).sum(axis=1)
+    c2 = ((end - far) ** 2).sum(axis=1)
+    denom = 2 * np.sqrt(b2 * c2)
+    valid = denom > 0  # degenerate triangles have no angle
+    cos_angle = np.divide(b2 + c2 - a2, denom, out=np.full_like(denom, -1.0), where=valid)
+    
+    keep = valid & (cos_angle >= FINGER_ANGLE_COS)
+    if min_depth > 0:
+        keep &= defects[:, 3] >= min_depth * 256  # depth is fixed-point with 8 fractional bits
+    return end[keep]
+
+def kcurvature_fingertips(points, k=KCURVATURE_K, max_angle=KCURVATURE_MAX_ANGLE):
+    """Fingertips as sharp convex peaks of the contour (k-curvature), topmost first"""
+    n = len(points)
+    if n < 2 * k + 1:
+        return points[:0]
+    p = points.astype(np.float32)
+    v1 = np.roll(p, k, axis=0) - p
+    v2 = np.roll(p, -k, axis=0) - p
+    norms = np.sqrt((v1 ** 2).sum(axis=1) * (v2 ** 2).sum(axis=1))
+    cos_angle = np.divide((v1 * v2).sum(axis=1), norms, out=np.full(n, -1.0, np.float32), where=norms > 0)
+    
+    # Sharp points that stick out from the hand (tips), not valleys between fingers
+    centroid = p.mean(axis=0)
+    mid = p + (v1 + v2) / 2
+    convex = ((p - centroid) ** 2).sum(axis=1) > ((mid - centroid) ** 2).sum(axis=1)
+    candidates = np.flatnonzero((cos_angle >= math.cos(math.radians(max_angle))) & convex)
+    if candidates.size == 0:
+        return points[:0]
+    
+    # One tip per run of neighbouring candidates: the sharpest point in the run
+    runs = np.split(candidates, np.flatnonzero(np.diff(candidates) > k) + 1)
+    if len(runs) > 1 and runs[0][0] + n - runs[-1][-1] <= k:  # run wrapping past index 0
+        runs[0] = np.concatenate([runs.pop(), runs[0]])
+    tips = np.array([run[np.argmax(cos_angle[run])] for run in runs])
+    tips = points[tips]
+    return tips[np.argsort(tips[:, 1], kind="stable")]
+
+def landmark_present(landmarks, index):
+    """True if the landmark at index was detected"""
+    return landmarks is not None and landmarks[index, 0] != MISSING
+
 def fingers_up(landmarks):
     """Check if fingers are up (similar to MediaPipe logic)"""
-    if not landmarks:
+    if landmarks is None:
         return False
     
     # Check if index finger is up (y position of tip < y position of wrist)
-    if HAND_LANDMARKS['INDEX_FINGER_TIP'] in landmarks and HAND_LANDMARKS['WRIST'] in landmarks:
-        index_tip = landmarks[HAND_LANDMARKS['INDEX_FINGER_TIP']]
-        wrist = landmarks[HAND_LANDMARKS['WRIST']]
-        return index_tip[1] < wrist[1]  # Finger tip above wrist
+    index_id, wrist_id = HAND_LANDMARKS['INDEX_FINGER_TIP'], HAND_LANDMARKS['WRIST']
+    if landmark_present(landmarks, index_id) and landmark_present(landmarks, wrist_id):
+        return landmarks[index_id, 1] < landmarks[wrist_id, 1]  # Finger tip above wrist
     
     return False
 
-def main():
-    global curr_tool, curr_color, x_prev, y_prev
-    
-    print("Gesture Brush - Hand Landmark Tracking")
-    print("This version uses advanced hand landmark detection.")
-    print("Controls:")
-    print("- Show your hand to the camera")
-    print("- Point with your index finger to draw")
-    print("- Point to top area to select tools")
-    print("- Point to left area to select colors")
-    print("- Press ESC to exit")
-    
-    # Canvas Visualization
-    try:
-        tools = cv2.imread("tools.png")
-        colors = cv2.imread("colors.png")
-        if tools is None or colors is None:
-            print("Warning: tools.png or colors.png not found. Creating blank images.")
-            tools = np.zeros((50, 250, 3), dtype=np.uint8)
-            colors = np.zeros((260, 50, 3), dtype=np.uint8)
-    except:
-        print("Warning: Could not load tool/color images. Creating blank images.")
-        tools = np.zeros((50, 250, 3), dtype=np.uint8)
-        colors = np.zeros((260, 50, 3), dtype=np.uint8)
-    
-    mask = np.zeros((480, 640, 3), np.uint8)
-
-    # Implementation
-    cap = cv2.VideoCapture(0)
-    cap.set(3, 640)
-    cap.set(4, 480)
-
-    while True:
-        _, frm = cap.read()
-        frm = cv2.flip(frm, 1)
-        
-        # Detect hand landmarks
-        landmarks, hand_contour = detect_hand_landmarks(frm)
-        
-        if landmarks and hand_contour is not None:
-            # Draw hand contour
-            cv2.drawContours(frm, [hand_contour], -1, (0, 255, 0), 2)
-            
-            # Draw landmarks
-            for landmark_id, point in landmarks.items():
-                cv2.circle(frm, point, 5, (255, 0, 0), -1)
-                cv2.putText(frm, str(landmark_id), (point[0]+10, point[1]), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            
-            # Get index finger tip for cursor
-            if HAND_LANDMARKS['INDEX_FINGER_TIP'] in landmarks:
-                cursor_x, cursor_y = landmarks[HAND_LANDMARKS['INDEX_FINGER_TIP']]
-                
-                # Draw cursor
-                cv2.circle(frm, (cursor_x, cursor_y), 8, (0, 0, 255), -1)
-                
-                # Check if fingers are up
-                fingers_extended = fingers_up(landmarks)
-                
-                # Set color 
-                if cursor_x < 50 and cursor_y > 60 and cursor_y < 260:
-                    cv2.circle(frm, (cursor_x, cursor_y), crad, (0, 0, 0), 3)
-                    curr_color = getColor(cursor_y)
-                    frm[:40, 55:95] = curr_color
-                    
-                # Select tool
-                if cursor_y < 50 and cursor_x > 150 and cursor_x < 400:
-                    cv2.circle(frm, (cursor_x, cursor_y), trad, (0, 0, 0), 3)
-                    curr_tool = getTool(cursor_x)
-                    
-                # Drawing logic - draw when index finger is in drawing area and finger is extended
-                if cursor_x > 100 and cursor_y > 100:  # Drawing area
-                    if curr_tool == "Draw" and fingers_extended:
-                        cv2.line(mask, (x_prev, y_prev), (cursor_x, cursor_y), curr_color, bthickness)
-                    elif curr_tool == "Erase" and fingers_extended:
-                        cv2.circle(mask, (cursor_x, cursor_y), erad, (0, 0, 0), -1)
-                    
-                    x_prev, y_prev = cursor_x, cursor_y
-                
-                # Display finger status
-                status = "Fingers: UP" if fingers_extended else "Fingers: DOWN"
-                cv2.putText(frm, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-
-        # Frame and Mask Integration
-        graym = cv2.cvtColor(mask, cv2.COLOR_BGR2GRAY)
-        _, inv = cv2.threshold(graym, 50, 255, cv2.THRESH_BINARY_INV)
-        inv = cv2.cvtColor(inv, cv2.COLOR_GRAY2BGR)
-        frm = cv2.bitwise_and(frm, inv)
-        frm = cv2.bitwise_or(frm, mask)
-
-        frm[:50, 150:400] = cv2.addWeighted(tools, 0.7, frm[:50, 150:400], 0.3, 0)
-        frm[:260, :50] = cv2.addWeighted(colors, 0.7, frm[:260, :50], 0.3, 0)
-        cv2.putText(frm, curr_tool, (420, 30), cv2.FONT_HERSHEY_TRIPLEX, 1, curr_color, 2)
-        
-        # Add instructions
-        cv2.putText(frm, "Show hand to camera", (10, 450), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        
-        cv2.imshow("Gesture Brush", frm)
-        
-        if cv2.waitKey(1) == 27:  # Esc key
-            cv2.destroyAllWindows()
-            cap.release()
-            break
+def open_hand(landmarks):
+    """Check if all four fingers are extended (an open palm), e.g. to grab the canvas
+
+    Each fingertip must be detected, and above its middle (PIP) joint when
+    the tracker reports joints.
+    """
+    if landmarks is None:
+        return False
+    for tip in FINGER_TIPS:
+        if not landmark_present(landmarks, tip):
+            return False
+        pip = tip - 2
+        if landmark_present(landmarks, pip) and landmarks[tip, 1] >= landmarks[pip, 1]:
+            return False
+    return True
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    from painter import main
+    main(tracker="contour")
@@ -0,0 +1,142 @@
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+MISSING = -1  # same sentinel as gesture_brush.MISSING
+
+# One rung of the quality ladder: detection scale (relative to the configured
+# one), skin-mask morphology passes (2 = open + close, 1 = open, 0 = none)
+# and how often detection runs (every n-th frame; landmarks are extrapolated between)
+QualityLevel = namedtuple("QualityLevel", ["name", "scale", "morphology", "detect_every"])
+
+# Cheapest last; the governor steps down in this order when over budget
+LEVELS = (
+    QualityLevel("full", 1.0, 2, 1),
+    QualityLevel("half", 0.5, 2, 1),
+    QualityLevel("quarter", 0.25, 2, 1),
+    QualityLevel("lean", 0.25, 1, 1),
+    QualityLevel("bare", 0.25, 0, 1),
+    QualityLevel("skip2", 0.25, 0, 2),
+    QualityLevel("skip3", 0.25, 0, 3),
+)
+
+SMOOTHING = 0.1  # EWMA weight of the newest frame time
+DOWN_AFTER = 10  # consecutive over-budget frames before stepping down
+UP_AFTER = 60  # consecutive frames with headroom before stepping back up
+HEADROOM = 0.6  # frame time below this fraction of the budget counts as headroom
+
+
+class FrameGovernor:
+    """Keeps frame time inside a budget by trading away detection quality
+
+    Call start_frame() when a frame arrives and end_frame() once it is
+    shown; time spent inside stage() blocks is tracked per stage. When the
+    smoothed frame time stays over budget the governor steps down LEVELS,
+    and it steps back up once there has been headroom for a while. Changing
+    level restarts both counts, so one step is judged before the next.
+    """
+
+    def __init__(self, budget_ms=33.0, levels=LEVELS, start=0):
+        self.budget = budget_ms / 1e3 if budget_ms else None  # None: measure only, never change level
+        self.levels = levels
+        self.index = start
+        self.frame_time = None  # smoothed seconds per frame
+        self.stages = {}  # stage name -> smoothed seconds
+        self.changes = 0
+        self.frames = 0
+        self._over = 0
+        self._under = 0
+        self._start = None
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def detect_due(self):
+        """Whether detection should run on the current frame"""
+        return self.frames % self.level.detect_every == 0
+
+    def start_frame(self):
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            previous = self.stages.get(name)
+            self.stages[name] = elapsed if previous is None else previous + SMOOTHING * (elapsed - previous)
+
+    def end_frame(self, elapsed=None):
+        """Record the frame's duration; returns True when the quality level changed"""
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._start
+        self.frames += 1
+        if self.frame_time is None:
+            self.frame_time = elapsed
+        else:
+            self.frame_time += SMOOTHING * (elapsed - self.frame_time)
+        if self.budget is None:
+            return False
+
+        if self.frame_time > self.budget:
+            self._over, self._under = self._over + 1, 0
+        elif self.frame_time < HEADROOM * self.budget:
+            self._over, self._under = 0, self._under + 1
+        else:
+            self._over = self._under = 0
+
+        if self._over >= DOWN_AFTER and self.index < len(self.levels) - 1:
+            return self._step(+1)
+        if self._under >= UP_AFTER and self.index > 0:
+            return self._step(-1)
+        return False
+
+    def _step(self, direction):
+        self.index += direction
+        self.changes += 1
+        self._over = self._under = 0
+        self.frame_time = None  # judge the new level on its own frames
+        return True
+
+    def snapshot(self):
+        """Current level and smoothed timings (ms), for the HUD and metrics"""
+        return {
+            "level": self.level.name,
+            "index": self.index,
+            "budget_ms": round(self.budget * 1e3, 2) if self.budget is not None else None,
+            "frame_ms": round(self.frame_time * 1e3, 3) if self.frame_time is not None else None,
+            "stages_ms": {name: round(t * 1e3, 3) for name, t in self.stages.items()},
+            "changes": self.changes,
+        }
+
+
+class LandmarkExtrapolator:
+    """Fills frames without detection by extending the last two detections linearly"""
+
+    def __init__(self):
+        self._prev = None  # (time, landmarks)
+        self._last = None
+
+    def update(self, landmarks, t):
+        """Record a fresh detection (None when the hand was lost)"""
+        self._prev = self._last if landmarks is not None else None
+        self._last = (t, landmarks) if landmarks is not None else None
+
+    def predict(self, t):
+        """Landmarks estimated for time t, or None without a recent detection"""
+        if self._last is None:
+            return None
+        t1, last = self._last
+        if self._prev is None or t1 <= self._prev[0]:
+            return last
+        t0, prev = self._prev
+        moved = last + (last - prev) * ((t - t1) / (t1 - t0))
+        out = np.rint(moved).astype(last.dtype)
+        unknown = (last[:, 0] == MISSING) | (prev[:, 0] == MISSING)
+        out[unknown] = last[unknown]  # no motion estimate: hold (or keep MISSING)
+        return out
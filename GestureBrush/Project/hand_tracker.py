@@ -1,37 +0,0 @@
-import cv2
-import numpy as np
-
-class HandTracker:
-    def __init__(self):
-        """Initialize hand tracker with pre-trained model"""
-        # Load pre-trained hand detection model
-        self.net = cv2.dnn.readNetFromTensorflow('hand_detection.pb')
-        self.confidence_threshold = 0.5
-        
-    def detect_hand_landmarks(self, frame):
-        """Detect hand landmarks using DNN model"""
-        # Preprocess frame
-        blob = cv2.dnn.blobFromImage(frame, 1.0, (256, 256), (127.5, 127.5, 127.5), swapRB=True, crop=False)
-        self.net.setInput(blob)
-        
-        # Forward pass
-        output = self.net.forward()
-        
-        # Process output to get landmarks
-        landmarks = self._process_output(output, frame.shape)
-        return landmarks
-    
-    def _process_output(self, output, frame_shape):
-        """Process DNN output to extract hand landmarks"""
-        # This is a simplified version - in practice you'd need the actual model
-        # For now, we'll use a fallback method
-        return self._fallback_hand_detection(frame_shape)
-    
-    def _fallback_hand_detection(self, frame_shape):
-        """Fallback hand detection using traditional CV methods"""
-        # This will be implemented with better hand detection
-        return None
-
-def create_hand_tracker():
-    """Factory function to create hand tracker"""
-    return HandTracker() 
\ No newline at end of file
@@ -0,0 +1,141 @@
+import math
+
+import cv2
+import numpy as np
+
+from trackers import MISSING
+
+MAX_JUMP = 0.25  # fraction of the frame diagonal a hand may move between detections and keep its ID
+MAX_MISSED = 5  # detections a hand may be absent from before its ID is released
+
+
+def linear_assignment(cost):
+    """(row, column) pairs of an (n, m) cost matrix with the least total cost (Hungarian method)
+
+    Every row or every column is assigned, whichever there are fewer of.
+    """
+    cost = np.asarray(cost, np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return []
+    # Potentials and augmenting paths over 1-based rows and columns; column 0 is the path's root.
+    # Plain lists: with a handful of hands, numpy's per-call overhead would dominate
+    rows = cost.tolist()
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    owner = [0] * (m + 1)  # row assigned to each column, 0 = free
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        owner[0] = row
+        col = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while owner[col] != 0:
+            used[col] = True
+            r = owner[col]
+            costs, ur = rows[r - 1], u[r]
+            delta, nxt = inf, 0
+            for c in range(1, m + 1):
+                if not used[c]:
+                    reduced = costs[c - 1] - ur - v[c]
+                    if reduced < minv[c]:
+                        minv[c] = reduced
+                        way[c] = col
+                    if minv[c] < delta:
+                        delta, nxt = minv[c], c
+            for c in range(m + 1):
+                if used[c]:
+                    u[owner[c]] += delta
+                    v[c] -= delta
+                else:
+                    minv[c] -= delta
+            col = nxt
+        while col:  # flip the augmenting path
+            prev = way[col]
+            owner[col] = owner[prev]
+            col = prev
+    pairs = [(owner[c] - 1, c - 1) for c in range(1, m + 1) if owner[c]]
+    return sorted((c, r) for r, c in pairs) if transposed else sorted(pairs)
+
+
+def hand_center(hand):
+    """Centre of a Hand: its outline's bounding box when known, else the mean of its landmarks (None if empty)"""
+    if hand.contour is not None:
+        x, y, w, h = cv2.boundingRect(hand.contour)
+        return np.array([x + w / 2, y + h / 2])
+    present = hand.landmarks[hand.landmarks[:, 0] != MISSING]
+    return present.mean(axis=0) if len(present) else None
+
+
+class _Track:
+    __slots__ = ("center", "velocity", "missed")
+
+    def __init__(self, center):
+        self.center = center
+        self.velocity = np.zeros(2)  # per detection
+        self.missed = 0
+
+
+class HandTracks:
+    """Stable IDs for the hands a tracker finds, from one detection to the next
+
+    update() matches the detected hands to the known ones by the assignment
+    with the least total distance between each hand's centre and where each
+    known hand was heading. A match further than max_jump of the frame
+    diagonal starts a new hand instead. An ID is released once its hand has
+    been absent for max_missed detections, and new hands take the smallest
+    free ID, so with N hands in view the IDs are 0 to N - 1.
+    """
+
+    def __init__(self, max_jump=MAX_JUMP, max_missed=MAX_MISSED):
+        self.max_jump = max_jump
+        self.max_missed = max_missed
+        self.tracks = {}  # id -> _Track
+        self.ended = []  # IDs released by the last update
+
+    @property
+    def ids(self):
+        return sorted(self.tracks)
+
+    def update(self, hands, frame_shape):
+        """[(id, hand)] for the hands detected in a frame, ordered by ID"""
+        height, width = frame_shape[:2]
+        limit = self.max_jump * math.hypot(width, height)
+        found = [(hand, center) for hand in hands if (center := hand_center(hand)) is not None]
+
+        ids = list(self.tracks)
+        matched = {}  # detection index -> id
+        if ids and found:
+            expected = np.array([t.center + t.velocity * (t.missed + 1) for t in self.tracks.values()])
+            centers = np.array([center for _, center in found])
+            cost = np.linalg.norm(expected[:, None] - centers[None], axis=2)
+            for track, detection in linear_assignment(cost):
+                if cost[track, detection] <= limit:
+                    matched[detection] = ids[track]
+
+        self.ended = []
+        kept = set(matched.values())
+        for track_id in ids:
+            if track_id not in kept:
+                self.tracks[track_id].missed += 1
+                if self.tracks[track_id].missed > self.max_missed:
+                    del self.tracks[track_id]
+                    self.ended.append(track_id)
+
+        result = []
+        for index, (hand, center) in enumerate(found):
+            track_id = matched.get(index)
+            if track_id is None:
+                track_id = next(i for i in range(len(self.tracks) + 1) if i not in self.tracks)
+                self.tracks[track_id] = _Track(center)
+            else:
+                track = self.tracks[track_id]
+                track.velocity = (center - track.center) / (track.missed + 1)
+                track.center = center
+                track.missed = 0
+            result.append((track_id, hand))
+        return sorted(result, key=lambda pair: pair[0])
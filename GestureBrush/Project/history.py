@@ -0,0 +1,145 @@
+from collections import deque
+
+TILE_SIZE = 64  # undo granularity in world pixels
+UNDO_BUDGET = 32 * 2 ** 20  # bytes of tile snapshots kept before the oldest actions are dropped
+
+DWELL_FRAMES = 15  # frames the cursor must rest on Undo/Redo before it fires
+
+
+class _Action:
+    """Canvas tiles as they were before one action, plus what the action was"""
+
+    __slots__ = ("payload", "tiles", "nbytes", "dropped")
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.tiles = {}  # (tile row, tile col) -> saved pixels
+        self.nbytes = 0
+        self.dropped = False  # evicted; no longer undoable
+
+
+class TileHistory:
+    """Copy-on-write undo/redo over a TiledCanvas, one tile at a time
+
+    Before an action paints a region, snapshot() saves the tiles it is
+    about to touch for the first time (None for a blank one). undo() and
+    redo() swap those tiles with the canvas, so their cost grows with the
+    tiles an action changed rather than with the canvas size. Once
+    snapshots exceed `budget` bytes the oldest actions are forgotten.
+    """
+
+    def __init__(self, canvas, tile=TILE_SIZE, budget=UNDO_BUDGET):
+        self.canvas = canvas
+        self.tile = tile
+        self.budget = budget
+        self._undo = deque()
+        self._redo = []
+        self._current = None
+        self.nbytes = 0
+        self.evicted = 0  # actions dropped to stay within budget
+
+    def begin(self, payload=None):
+        """Start a new action and return it; anything undone so far can no longer be redone"""
+        self._current = _Action(payload)
+        self._undo.append(self._current)
+        for action in self._redo:
+            self.nbytes -= action.nbytes
+        self._redo.clear()
+        return self._current
+
+    def snapshot(self, x0, y0, x1, y1, action=None):
+        """Save the tiles under a rectangle that an action (default: the current one) has not touched yet
+
+        Actions that are painted at the same time (one per hand) each pass
+        their own; one that is undone takes back the tiles it touched as they
+        were when it first reached them.
+        """
+        action = action or self._current
+        if action is None or action.dropped:
+            return
+        t = self.tile
+        for ty in range(y0 // t, (y1 - 1) // t + 1):
+            for tx in range(x0 // t, (x1 - 1) // t + 1):
+                if (ty, tx) not in action.tiles:
+                    saved = self._read(ty, tx)
+                    action.tiles[ty, tx] = saved
+                    action.nbytes += _size(saved)
+                    self.nbytes += _size(saved)
+        self._evict()
+
+    def _read(self, ty, tx):
+        t = self.tile
+        pixels = self.canvas.read(tx * t, ty * t, (tx + 1) * t, (ty + 1) * t)
+        return pixels if pixels.any() else None
+
+    def _evict(self):
+        while self.nbytes > self.budget and len(self._undo) > 1:
+            action = self._undo.popleft()
+            action.dropped = True
+            self.nbytes -= action.nbytes
+            self.evicted += 1
+
+    def _swap(self, action):
+        t = self.tile
+        for (ty, tx), saved in action.tiles.items():
+            current = self._read(ty, tx)
+            self.canvas.write(tx * t, ty * t, (tx + 1) * t, (ty + 1) * t, saved)
+            action.tiles[ty, tx] = current
+            change = _size(current) - _size(saved)
+            action.nbytes += change
+            if not action.dropped:
+                self.nbytes += change
+
+    def undo(self):
+        """Restore the canvas from before the last action; returns its payload (None if nothing to undo)"""
+        self._current = None
+        if not self._undo:
+            return None
+        action = self._undo.pop()
+        self._swap(action)
+        self._redo.append(action)
+        return action.payload
+
+    def redo(self):
+        """Re-apply the last undone action; returns its payload (None if nothing to redo)"""
+        self._current = None
+        if not self._redo:
+            return None
+        action = self._redo.pop()
+        self._swap(action)
+        self._undo.append(action)
+        return action.payload
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._current = None
+        self.nbytes = 0
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+
+def _size(saved):
+    return 0 if saved is None else saved.nbytes
+
+
+class DwellButton:
+    """Fires once when the cursor has rested on it for `frames` consecutive frames"""
+
+    def __init__(self, frames=DWELL_FRAMES):
+        self.frames = frames
+        self._count = 0
+
+    def update(self, over):
+        """Count a frame with the cursor over the button (over=True) or not; True when it fires"""
+        if not over:
+            self._count = 0
+            return False
+        self._count += 1
+        return self._count == self.frames
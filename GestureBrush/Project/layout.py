@@ -0,0 +1,123 @@
+"""Where the painter's toolbar, palette, buttons and drawing area are on screen
+
+The layout is declared once, at BASE_SIZE, and a Layout scales it to the
+canvas resolution and rasterizes it into a label map, so finding what the
+cursor is over is one array lookup.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+BASE_SIZE = (640, 480)  # the resolution the rectangles below are given in
+# Every tool, in toolbar order; sessions record tools by their index here, so add new ones at the end
+TOOLS = ("Draw", "Line", "Rectangle", "Circle", "Erase")
+PALETTE = (  # BGR, top to bottom
+    (89, 222, 255),  # Yellow
+    (87, 217, 126),  # Grass Green
+    (203, 194, 0),  # Aqua Blue
+    (22, 22, 255),  # Bright Red
+    (230, 108, 203),  # Magenta
+)
+
+# (x0, y0, x1, y1) at BASE_SIZE
+TOOLBAR_RECT = (150, 0, 400, 50)  # split evenly between the tools
+PALETTE_RECT = (0, 60, 50, 260)  # split evenly between the colours
+PALETTE_IMAGE_RECT = (0, 0, 50, 260)  # colors.png, which has a header above the colours
+UNDO_RECT = (590, 0, 640, 45)
+REDO_RECT = (590, 55, 640, 100)
+DRAW_RECT = (101, 101, 640, 480)  # strokes are painted only here, clear of the UI
+SWATCH_RECT = (55, 0, 95, 40)  # the selected colour, shown while picking one
+TOOL_TEXT_ORG = (420, 30)
+
+# Element kinds
+TOOL, COLOR, UNDO_BUTTON, REDO_BUTTON, CANVAS = "tool", "color", "undo", "redo", "canvas"
+
+# Something the cursor can be over; value is the tool name or colour, rect is in screen pixels
+Element = namedtuple("Element", ["kind", "value", "rect"])
+
+
+class Layout:
+    """The UI at one resolution, with a label map for hit testing
+
+    Every element is scaled from BASE_SIZE to width x height and filled
+    into `labels` with its index + 1 (0 where there is nothing), so hit()
+    costs the same however many tools and colours there are.
+    """
+
+    def __init__(self, width, height, tools=TOOLS, palette=PALETTE):
+        if not tools or not palette:
+            raise ValueError("the layout needs at least one tool and one colour")
+        unknown = [tool for tool in tools if tool not in TOOLS]
+        if unknown:
+            raise ValueError(f"unknown tools {unknown}; choose from {', '.join(TOOLS)}")
+        self.width = width
+        self.height = height
+        self.tools = tuple(tools)
+        self.palette = tuple(tuple(int(c) for c in color) for color in palette)
+        self.sx, self.sy = width / BASE_SIZE[0], height / BASE_SIZE[1]
+        self.text_scale = min(self.sx, self.sy)
+        self.toolbar = self.scale(TOOLBAR_RECT)
+        self.palette_image = self.scale(PALETTE_IMAGE_RECT)
+        self.swatch = self.scale(SWATCH_RECT)
+        self.tool_text = self.scale_point(TOOL_TEXT_ORG)
+
+        self.elements = [Element(CANVAS, None, self.scale(DRAW_RECT))]
+        self.elements += [Element(TOOL, tool, rect)
+                          for tool, rect in zip(self.tools, self._split(TOOLBAR_RECT, len(self.tools), 0))]
+        self.elements += [Element(COLOR, color, rect)
+                          for color, rect in zip(self.palette, self._split(PALETTE_RECT, len(self.palette), 1))]
+        self.elements += [Element(UNDO_BUTTON, "Undo", self.scale(UNDO_RECT)),
+                          Element(REDO_BUTTON, "Redo", self.scale(REDO_RECT))]
+        if len(self.elements) > 255:
+            raise ValueError("too many tools and colours for the label map")
+        self.labels = np.zeros((height, width), np.uint8)
+        for label, element in enumerate(self.elements, 1):
+            x0, y0, x1, y1 = element.rect
+            self.labels[y0:y1, x0:x1] = label  # later elements on top
+        self._lookup = [None] + self.elements
+
+    def scale_point(self, point):
+        return int(point[0] * self.sx + 0.5), int(point[1] * self.sy + 0.5)
+
+    def scale(self, rect):
+        """A BASE_SIZE rectangle in screen pixels"""
+        return self.scale_point(rect[:2]) + self.scale_point(rect[2:])
+
+    def _split(self, rect, count, axis):
+        """rect cut into count equal parts along x (axis 0) or y (axis 1); neighbours share their edges"""
+        lo, hi = rect[axis], rect[axis + 2]
+        edges = [lo + (hi - lo) * i / count for i in range(count + 1)]
+        parts = []
+        for a, b in zip(edges, edges[1:]):
+            part = list(rect)
+            part[axis], part[axis + 2] = a, b
+            parts.append(self.scale(part))
+        return parts
+
+    def hit(self, point):
+        """The Element under a screen point (clamped to the screen), or None"""
+        x = min(max(point[0], 0), self.width - 1)
+        y = min(max(point[1], 0), self.height - 1)
+        return self._lookup[self.labels[y, x]]
+
+
+def parse_tools(text):
+    """Toolbar tools from a comma-separated list such as draw,line,erase"""
+    names = {tool.lower(): tool for tool in TOOLS}
+    tools = tuple(names.get(name.strip().lower(), name.strip()) for name in text.split(","))
+    unknown = [tool for tool in tools if tool not in TOOLS]
+    if unknown:
+        raise ValueError(f"unknown tools {unknown}")
+    return tools
+
+
+def parse_palette(text):
+    """BGR palette colours from comma-separated RGB hex codes such as ffde59,ff1616"""
+    palette = []
+    for code in text.split(","):
+        code = code.strip().lstrip("#")
+        if len(code) != 6:
+            raise ValueError(f"not an RRGGBB colour: {code}")
+        r, g, b = (int(code[i:i + 2], 16) for i in (0, 2, 4))
+        palette.append((b, g, r))
+    return tuple(palette)
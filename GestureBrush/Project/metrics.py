@@ -0,0 +1,183 @@
+import json
+import os
+import time
+
+import cv2
+
+PROMETHEUS_PREFIX = "gesturebrush"
+HUD_WIDTH = 190  # the HUD is right-aligned, under the Undo/Redo zones
+HUD_TOP = 125
+HUD_LINE = 18
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.registry.add(self.name, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """Stage timers, counters and gauges, reported once per interval
+
+    Stage times and counters accumulate for the whole run (what Prometheus
+    scrapes) and per interval (what the JSON-lines log and HUD show). A
+    disabled registry records nothing: timer() hands back one shared no-op
+    context manager, and every other call returns immediately.
+    """
+
+    def __init__(self, enabled=True, jsonl=None, prometheus=None, hud=False, interval=1.0):
+        self.enabled = enabled
+        self.hud = hud and enabled
+        self.interval = interval
+        self._jsonl = open(jsonl, "a") if jsonl and enabled else None
+        self._prometheus = prometheus if enabled else None
+        self._stages = {}  # name -> [calls, seconds] over the whole run
+        self._window = {}  # name -> [calls, seconds, max seconds] this interval
+        self.counters = {}
+        self.gauges = {}
+        self.frames = 0
+        self._window_frames = 0
+        self._window_start = time.perf_counter()
+        self._hud_lines = []
+
+    def timer(self, name):
+        """Context manager that adds the time spent inside it to stage `name`"""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def add(self, name, seconds):
+        if not self.enabled:
+            return
+        total = self._stages.get(name)
+        if total is None:
+            total = self._stages[name] = [0, 0.0]
+            self._window[name] = [0, 0.0, 0.0]
+        total[0] += 1
+        total[1] += seconds
+        window = self._window[name]
+        window[0] += 1
+        window[1] += seconds
+        if seconds > window[2]:
+            window[2] = seconds
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        if self.enabled:
+            self.gauges[name] = value
+
+    def end_frame(self):
+        """Count a displayed frame and publish once the interval has elapsed"""
+        if not self.enabled:
+            return
+        self.frames += 1
+        self._window_frames += 1
+        now = time.perf_counter()
+        if now - self._window_start >= self.interval:
+            self._publish(now)
+
+    def _publish(self, now):
+        elapsed = now - self._window_start
+        frames = self._window_frames
+        stages = {name: {"mean_ms": round(1e3 * w[1] / w[0], 3), "max_ms": round(1e3 * w[2], 3),
+                         "per_frame_ms": round(1e3 * w[1] / max(frames, 1), 3)}
+                  for name, w in self._window.items() if w[0]}
+        record = {
+            "time": time.time(),
+            "frames": frames,
+            "fps": round(frames / elapsed, 2),
+            "stages": stages,
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+        }
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(record) + "\n")
+            self._jsonl.flush()
+        if self._prometheus is not None:
+            self._write_prometheus(record["fps"])
+        if self.hud:
+            self._hud_lines = ([f"fps {record['fps']:.1f}"]
+                               + [f"{name} {s['per_frame_ms']:.2f} ms" for name, s in stages.items()]
+                               + [f"{name} {value}" for name, value in {**self.counters, **self.gauges}.items()])
+        for window in self._window.values():
+            window[:] = [0, 0.0, 0.0]
+        self._window_frames = 0
+        self._window_start = now
+
+    def _write_prometheus(self, fps):
+        p = PROMETHEUS_PREFIX
+        lines = [f"# TYPE {p}_stage_seconds summary"]
+        for name, (calls, seconds) in self._stages.items():
+            lines.append(f'{p}_stage_seconds_sum{{stage="{name}"}} {seconds:.6f}')
+            lines.append(f'{p}_stage_seconds_count{{stage="{name}"}} {calls}')
+        lines += [f"# TYPE {p}_frames_total counter", f"{p}_frames_total {self.frames}"]
+        for name, value in self.counters.items():
+            lines += [f"# TYPE {p}_{name}_total counter", f"{p}_{name}_total {value}"]
+        lines += [f"# TYPE {p}_fps gauge", f"{p}_fps {fps}"]
+        for name, value in self.gauges.items():
+            lines += [f"# TYPE {p}_{name} gauge", f"{p}_{name} {value}"]
+        # The textfile collector may read at any moment: write aside, then rename over
+        tmp = self._prometheus + ".tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self._prometheus)
+
+    def draw_hud(self, frm):
+        """Draw the latest interval's figures onto frm"""
+        if not self.hud:
+            return
+        x = frm.shape[1] - HUD_WIDTH
+        for i, line in enumerate(self._hud_lines):
+            cv2.putText(frm, line, (x, HUD_TOP + i * HUD_LINE), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+
+    def close(self):
+        """Publish the last partial interval and close the log"""
+        if self._window_frames:
+            self._publish(time.perf_counter())
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+
+# Registry the detection functions report to; disabled unless a painter configures one
+_active = Metrics(enabled=False)
+
+
+def configure(**options):
+    """Replace the process-wide registry (see Metrics for the options) and return it"""
+    global _active
+    _active.close()
+    _active = Metrics(**options)
+    return _active
+
+
+def timer(name):
+    """Time a stage in the process-wide registry"""
+    return _active.timer(name)
+
+
+def count(name, n=1):
+    """Add to a counter in the process-wide registry"""
+    _active.count(name, n)
@@ -0,0 +1,66 @@
+import cv2
+
+GATE_WIDTH = 80  # width of the thumbnails compared
+MOTION_THRESHOLD = 12  # grey-level change of a thumbnail pixel that counts as motion
+MOTION_PIXELS = 2  # changed thumbnail pixels it takes to run detection
+MOTION_PAD = 0.15  # padding around what moved, as a fraction of the frame's larger side
+MAX_STILL_FRAMES = 30  # detection still runs this often when nothing moves
+SMOOTHING = 0.05  # EWMA weight of the newest frame in skip_rate
+
+
+class MotionGate:
+    """Decides from a tiny greyscale thumbnail whether a frame needs hand detection
+
+    Each frame's thumbnail is compared with the one detection last ran on.
+    When too few of its pixels changed, moved() returns False and the
+    caller reuses the last detection; otherwise `region` is set to the
+    part of the frame around the changes, where new hands can be looked
+    for. Comparing with the last detected frame rather than the previous
+    one means slow drift still adds up to a detection. Every
+    max_still frames detection runs anyway (region None), so the skin
+    model and lighting are never stale for long.
+    """
+
+    def __init__(self, width=GATE_WIDTH, threshold=MOTION_THRESHOLD, min_pixels=MOTION_PIXELS,
+                 max_still=MAX_STILL_FRAMES):
+        self.width = width
+        self.threshold = threshold
+        self.min_pixels = min_pixels
+        self.max_still = max_still
+        self.region = None  # (x0, y0, x1, y1) in frame pixels around what moved; None: the whole frame
+        self.checked = 0
+        self.skipped = 0
+        self.skip_rate = 0.0  # smoothed fraction of frames whose detection was skipped
+        self._reference = None  # thumbnail of the last frame detection ran on
+        self._still = 0  # frames skipped since then
+
+    def moved(self, image):
+        """Whether detection should run on image (a BGR frame)"""
+        height, width = image.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        # Average a 2x2 sample per thumbnail pixel: enough to quiet sensor noise, a fraction of a full average's cost
+        sampled = cv2.resize(image, (2 * size[0], 2 * size[1]), interpolation=cv2.INTER_NEAREST)
+        thumb = cv2.cvtColor(cv2.resize(sampled, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        self.checked += 1
+        self.region = None
+        reference, self._reference = self._reference, thumb
+        if reference is not None and reference.shape == thumb.shape and self._still < self.max_still:
+            _, changed = cv2.threshold(cv2.absdiff(thumb, reference), self.threshold, 255, cv2.THRESH_BINARY)
+            if cv2.countNonZero(changed) < self.min_pixels:
+                self._reference = reference  # keep comparing with the frame detection ran on
+                self._still += 1
+                self.skipped += 1
+                self.skip_rate += SMOOTHING * (1.0 - self.skip_rate)
+                return False
+            x, y, w, h = cv2.boundingRect(changed)
+            fx, fy = width / thumb.shape[1], height / thumb.shape[0]
+            pad = MOTION_PAD * max(width, height)
+            self.region = (max(0, int(x * fx - pad)), max(0, int(y * fy - pad)),
+                           min(width, int((x + w) * fx + pad) + 1), min(height, int((y + h) * fy + pad) + 1))
+        self._still = 0
+        self.skip_rate -= SMOOTHING * self.skip_rate
+        return True
+
+    def reset(self):
+        """Run detection on the whole of the next frame, e.g. to recalibrate"""
+        self._reference = None
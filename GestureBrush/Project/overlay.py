@@ -0,0 +1,197 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from layout import COLOR, PALETTE, REDO_RECT, TOOL, TOOLS, UNDO_RECT
+
+# A UI element in frame coordinates: premultiplied colour (h, w, 3) and the
+# fraction of the underlying frame that survives, keep = 1 - alpha (h, w, 1)
+Layer = namedtuple("Layer", ["x", "y", "premul", "keep"])
+
+UI_ALPHA = 0.7  # opacity of the toolbar and palette images
+
+
+def image_layer(image, origin, alpha=UI_ALPHA):
+    """Semi-transparent image placed with its top-left corner at origin"""
+    premul = image.astype(np.float32) * alpha
+    keep = np.full(image.shape[:2] + (1,), 1.0 - alpha, np.float32)
+    return Layer(origin[0], origin[1], premul, keep)
+
+
+def fill_layer(rect, color):
+    """Opaque solid rectangle (x0, y0, x1, y1)"""
+    x0, y0, x1, y1 = rect
+    premul = np.empty((y1 - y0, x1 - x0, 3), np.float32)
+    premul[:] = color
+    return Layer(x0, y0, premul, np.zeros((y1 - y0, x1 - x0, 1), np.float32))
+
+
+def text_layer(text, org, color, font=cv2.FONT_HERSHEY_TRIPLEX, scale=1, thickness=2):
+    """Opaque text sprite rendered once, matching cv2.putText at org"""
+    (w, h), baseline = cv2.getTextSize(text, font, scale, thickness)
+    pad = thickness + 1
+    x0, y0 = org[0] - pad, org[1] - h - pad
+    sprite = np.zeros((h + baseline + 2 * pad, w + 2 * pad), np.uint8)
+    cv2.putText(sprite, text, (org[0] - x0, org[1] - y0), font, scale, 255, thickness)
+    alpha = (sprite.astype(np.float32) / 255.0)[..., None]  # coverage, in case putText anti-aliases
+    premul = alpha * np.asarray(color, np.float32)
+    return Layer(x0, y0, premul, 1.0 - alpha)
+
+
+class OverlayStack:
+    """Named overlay layers flattened into a few premultiplied blend regions
+
+    Layers are flattened (in insertion order, later on top) only when one of
+    them changes. apply() then blends each region into the frame with a
+    single integer multiply-add: frame * keep + premul.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._layers = {}
+        self._regions = None  # [(x0, y0, x1, y1, premul u8, keep u8)] once flattened
+
+    def set(self, name, layer):
+        """Add, replace or (with None) remove a layer"""
+        if layer is None:
+            if self._layers.pop(name, None) is not None:
+                self._regions = None
+        else:
+            self._layers[name] = layer
+            self._regions = None
+
+    def _clip(self, layer):
+        h, w = layer.premul.shape[:2]
+        x0, y0 = max(0, layer.x), max(0, layer.y)
+        x1, y1 = min(self.width, layer.x + w), min(self.height, layer.y + h)
+        return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+    def _flatten(self):
+        rects = [r for r in (self._clip(layer) for layer in self._layers.values()) if r]
+        regions = []
+        for x0, y0, x1, y1 in _merge_rects(rects):
+            premul = np.zeros((y1 - y0, x1 - x0, 3), np.float32)
+            keep = np.ones((y1 - y0, x1 - x0, 1), np.float32)
+            for layer in self._layers.values():
+                clip = self._clip(layer)
+                if clip is None:
+                    continue
+                ix0, iy0 = max(x0, clip[0]), max(y0, clip[1])
+                ix1, iy1 = min(x1, clip[2]), min(y1, clip[3])
+                if ix0 >= ix1 or iy0 >= iy1:
+                    continue
+                src = (slice(iy0 - layer.y, iy1 - layer.y), slice(ix0 - layer.x, ix1 - layer.x))
+                dst = (slice(iy0 - y0, iy1 - y0), slice(ix0 - x0, ix1 - x0))
+                # "over" compositing of premultiplied colour
+                premul[dst] = layer.premul[src] + premul[dst] * layer.keep[src]
+                keep[dst] *= layer.keep[src]
+            regions.append((x0, y0, x1, y1,
+                            np.clip(np.rint(premul), 0, 255).astype(np.uint8),
+                            np.repeat(np.rint(keep * 255).astype(np.uint8), 3, axis=2)))
+        self._regions = regions
+
+    def apply(self, frm):
+        """Blend all overlays onto frm in place"""
+        if self._regions is None:
+            self._flatten()
+        for x0, y0, x1, y1, premul, keep in self._regions:
+            roi = frm[y0:y1, x0:x1]
+            cv2.multiply(roi, keep, dst=roi, scale=1 / 255.0)
+            cv2.add(roi, premul, dst=roi)
+        return frm
+
+
+class UiOverlay(OverlayStack):
+    """Toolbar, palette and tool/colour HUD placed by a Layout; sprites are rebuilt only on change
+
+    The toolbar and palette images are stretched over their places in the
+    layout. A toolbar or palette configured differently from what the
+    images show is drawn from the layout instead.
+    """
+
+    def __init__(self, tools, colors, layout):
+        super().__init__(layout.width, layout.height)
+        self.layout = layout
+        tools = _fit(tools, layout.toolbar) if layout.tools == TOOLS else _toolbar_image(layout)
+        colors = _fit(colors, layout.palette_image) if layout.palette == PALETTE else _palette_image(layout)
+        self.set("tools", image_layer(tools, layout.toolbar[:2]))
+        self.set("colors", image_layer(colors, layout.palette_image[:2]))
+        for name, rect in (("Undo", UNDO_RECT), ("Redo", REDO_RECT)):
+            self.set(name.lower(), text_layer(name, layout.scale_point((rect[0] + 4, rect[3] - 17)), (255, 255, 255),
+                                              cv2.FONT_HERSHEY_SIMPLEX, 0.5 * layout.text_scale,
+                                              max(1, round(layout.text_scale))))
+        self._hud = None
+
+    def update(self, tool, color, swatch=False):
+        """Show the current tool name in its colour, plus the swatch when selecting"""
+        hud = (tool, tuple(color), swatch)
+        if hud == self._hud:
+            return
+        self._hud = hud
+        layout = self.layout
+        self.set("swatch", fill_layer(layout.swatch, color) if swatch else None)
+        self.set("tool", text_layer(tool, layout.tool_text, color, scale=layout.text_scale,
+                                    thickness=max(1, round(2 * layout.text_scale))))
+
+
+def _fit(image, rect):
+    """image resized to the rectangle (x0, y0, x1, y1)"""
+    size = (rect[2] - rect[0], rect[3] - rect[1])
+    if image.shape[1::-1] == size:
+        return image
+    shrink = size[0] < image.shape[1]
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LINEAR)
+
+
+def _toolbar_image(layout):
+    """A toolbar with a labelled button per tool of the layout"""
+    x0, y0, x1, y1 = layout.toolbar
+    image = np.zeros((y1 - y0, x1 - x0, 3), np.uint8)
+    for element in layout.elements:
+        if element.kind != TOOL:
+            continue
+        bx0, by0, bx1, by1 = element.rect[0] - x0, element.rect[1] - y0, element.rect[2] - x0, element.rect[3] - y0
+        cv2.rectangle(image, (bx0, by0), (bx1 - 1, by1 - 1), (255, 255, 255), 1)
+        (w, h), _ = cv2.getTextSize(element.value, cv2.FONT_HERSHEY_SIMPLEX, 1, 1)
+        scale = min(0.5 * layout.text_scale, 0.9 * (bx1 - bx0) / w)
+        w, h = int(w * scale), int(h * scale)
+        cv2.putText(image, element.value, ((bx0 + bx1 - w) // 2, (by0 + by1 + h) // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                    scale, (255, 255, 255), 1, cv2.LINE_AA)
+    return image
+
+
+def _palette_image(layout):
+    """A palette with a swatch per colour of the layout"""
+    x0, y0, x1, y1 = layout.palette_image
+    image = np.zeros((y1 - y0, x1 - x0, 3), np.uint8)
+    for element in layout.elements:
+        if element.kind == COLOR:
+            image[element.rect[1] - y0:element.rect[3] - y0, element.rect[0] - x0:element.rect[2] - x0] = element.value
+    return image
+
+
+def _merge_rects(rects, slack=1.5):
+    """Merge overlapping rectangles, and ones whose union is not much larger than both"""
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                a, b = rects[i], rects[j]
+                u = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                overlap = a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+                if overlap or _area(u) <= slack * (_area(a) + _area(b)):
+                    rects[i] = u
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+
+def _area(r):
+    return (r[2] - r[0]) * (r[3] - r[1])
@@ -0,0 +1,561 @@
+import argparse
+import math
+import sys
+import time
+
+import cv2
+import numpy as np
+
+import metrics
+import trackers
+from autosave import AUTOSAVE_INTERVAL, CanvasSaver
+from compositor import CanvasCompositor
+from display import DEBUG_FPS, DISPLAY_FPS, Display
+from filters import FILTERS, HandFilters
+from frame_source import FrameSource, open_source, parse_size
+from gesture_brush import scale_contour, scale_landmarks
+from governor import FrameGovernor, LandmarkExtrapolator
+from hand_tracks import HandTracks
+from history import DWELL_FRAMES, DwellButton, TileHistory
+from layout import CANVAS, COLOR, PALETTE, REDO_BUTTON, TOOL, TOOLS, UNDO_BUTTON, Layout, parse_palette, parse_tools
+from motion_gate import MotionGate
+from overlay import UiOverlay
+from session import REDO, RESET_VIEW, UNDO, ZOOM_IN, ZOOM_OUT, SessionRecorder
+from strokes import StrokeStore
+from tiled_canvas import TiledCanvas, Viewport
+from trackers import INDEX_TIP, MISSING, Hand
+
+WINDOW = "Gesture Brush"
+DEFAULT_TOOL = "Select Tool"
+DEFAULT_COLOR = (22, 22, 255)  # bright red
+BRUSH_THICKNESS = 4
+ERASE_RADIUS = 30
+ZOOM_STEP = 1.25  # per +/- key press
+SELECT_RADIUS = 15  # ring drawn around the cursor while it picks a tool or colour
+CURSOR_RADIUS = 8
+SHAPE_TOOLS = ("Line", "Rectangle", "Circle")
+HAND_COLORS = (DEFAULT_COLOR, (230, 108, 203), (87, 217, 126), (89, 222, 255))  # starting colour by hand ID
+
+
+def load_ui_images():
+    """Load the toolbar and palette images, falling back to blank ones"""
+    try:
+        tools = cv2.imread("tools.png")
+        colors = cv2.imread("colors.png")
+        if tools is None or colors is None:
+            print("Warning: tools.png or colors.png not found. Creating blank images.")
+            tools = np.zeros((50, 250, 3), dtype=np.uint8)
+            colors = np.zeros((260, 50, 3), dtype=np.uint8)
+    except:
+        print("Warning: Could not load tool/color images. Creating blank images.")
+        tools = np.zeros((50, 250, 3), dtype=np.uint8)
+        colors = np.zeros((260, 50, 3), dtype=np.uint8)
+    return tools, colors
+
+
+def _draw_shape(img, tool, p1, p2, color, thickness):
+    if tool == "Line":
+        cv2.line(img, p1, p2, color, thickness)
+    elif tool == "Rectangle":
+        cv2.rectangle(img, p1, p2, color, thickness)
+    elif tool == "Circle":
+        cv2.circle(img, p1, _radius(p1, p2), color, thickness)
+
+
+def _radius(p1, p2):
+    return int(((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) ** 0.5)
+
+
+class Brush:
+    """One hand's tool, colour and pen state"""
+
+    def __init__(self, color=DEFAULT_COLOR, dwell_frames=DWELL_FRAMES):
+        self.tool = DEFAULT_TOOL
+        self.color = color
+        self.undo_button = DwellButton(dwell_frames)
+        self.redo_button = DwellButton(dwell_frames)
+        self.last = None  # world point under the cursor on the previous pen-down frame
+        self.anchor = None  # world point where the pending shape started
+
+
+class Painter:
+    """Tools, colours, strokes and canvas, driven by one cursor per hand each frame
+
+    update() takes each hand's cursor and whether its pen is down: hovering
+    (or, with hover_selects off, pressing) over the toolbar or palette picks
+    a tool or colour, and resting on Undo/Redo steps through the history.
+    With the pen down inside the drawing area Draw and Erase paint
+    continuously, while Line, Rectangle and Circle preview from where the
+    pen went down and are committed when it lifts. Every hand has its own
+    Brush; the toolbar shows the one that last picked something.
+
+    Freehand strokes are smoothed into curves (thinning with speed when
+    speed_width is set); the newest piece of each is previewed on the frame
+    until the next sample lets it be drawn on the canvas.
+
+    Strokes are recorded in world coordinates on an unbounded TiledCanvas,
+    and the screen shows it through a Viewport. A hand in the grab pose
+    lifts its pen and drags the canvas; two grabbing hands also zoom it by
+    how far apart they move.
+
+    Where the UI is comes from a Layout (default: every tool and the
+    standard palette, scaled to width x height); tools and colors are the
+    toolbar and palette images.
+    """
+
+    def __init__(self, width, height, tools, colors, hover_selects=True, dwell_frames=DWELL_FRAMES, speed_width=False,
+                 layout=None):
+        self.width = width
+        self.height = height
+        self.hover_selects = hover_selects
+        self.dwell_frames = dwell_frames
+        self.layout = layout or Layout(width, height)
+        self.overlay = UiOverlay(tools, colors, self.layout)
+        self.world = TiledCanvas()
+        self.view = Viewport()
+        self.canvas = CanvasCompositor(width, height)  # the part of the world on screen
+        self.speed_width = speed_width
+        self.strokes = StrokeStore(width, height, TileHistory(self.world), speed_width)  # vector record; the world caches it
+        self.brushes = {}  # hand ID -> Brush
+        self._shown = 0  # hand whose tool and colour the toolbar shows
+        self._swatch = False
+        self._grip = None  # (grabbing hand IDs, world point under them, their spread, zoom) when the grab began
+
+    def brush(self, hand=0):
+        """The hand's Brush, created with its starting colour on first use"""
+        if hand not in self.brushes:
+            self.brushes[hand] = Brush(HAND_COLORS[hand % len(HAND_COLORS)], self.dwell_frames)
+        return self.brushes[hand]
+
+    @property
+    def tool(self):
+        return self.brush(self._shown).tool
+
+    @property
+    def color(self):
+        return self.brush(self._shown).color
+
+    def update(self, frm, pointers):
+        """Apply one frame of input; selection rings and shape previews are drawn on frm
+
+        pointers maps hand ID -> (cursor, pen_down, grab); hands missing from
+        it lift their pens.
+        """
+        self._swatch = False
+        self._navigate([(hand, cursor) for hand, (cursor, _, grab) in pointers.items() if grab])
+        for hand in self.brushes.keys() - pointers.keys():
+            self._update(frm, hand, None, False)
+        for hand, (cursor, pen_down, grab) in pointers.items():
+            if grab:
+                self._update(frm, hand, None, False)
+            else:
+                self._update(frm, hand, cursor, pen_down)
+
+    def _navigate(self, grabbing):
+        """Keep the world point first grabbed under the grabbing hands, zooming with the spread of two"""
+        grabbing = grabbing[:2]
+        if not grabbing:
+            self._grip = None
+            return
+        hands = tuple(hand for hand, _ in grabbing)
+        center = (sum(c[0] for _, c in grabbing) / len(grabbing), sum(c[1] for _, c in grabbing) / len(grabbing))
+        spread = math.dist(grabbing[0][1], grabbing[1][1]) if len(grabbing) == 2 else 0.0
+        if self._grip is None or self._grip[0] != hands:  # a new grab, or a hand joined or left it
+            self._grip = (hands, self.view.world_at(center), spread, self.view.zoom)
+            return
+        _, world, start_spread, start_zoom = self._grip
+        # Relative to the grab's start rather than the last frame, so the view does not drift
+        self.view.hold(world, center, start_zoom * spread / start_spread if start_spread > 0 else None)
+
+    def zoom(self, factor):
+        """Zoom the view about the centre of the screen"""
+        self.view.zoom_at((self.width / 2, self.height / 2), factor)
+        self._grip = None
+
+    def reset_view(self):
+        self.view.reset()
+        self._grip = None
+
+    def release(self, hand):
+        """Finish the hand's pending stroke and forget its brush (its ID may be given to a new hand)"""
+        if hand in self.brushes:
+            self._pen_up(hand, self.brushes.pop(hand))
+        if hand == self._shown and self.brushes:
+            self._shown = min(self.brushes)
+
+    def _update(self, frm, hand, cursor, pen_down):
+        brush = self.brush(hand)
+        over = self.layout.hit(cursor) if cursor is not None else None
+        kind = over.kind if over is not None and (self.hover_selects or pen_down) else None
+        if kind in (TOOL, COLOR):
+            cv2.circle(frm, cursor, SELECT_RADIUS, (0, 0, 0), 3)
+            if kind == COLOR:
+                brush.color = over.value
+                self._swatch = True
+            else:
+                brush.tool = over.value
+            self._shown = hand
+        if brush.undo_button.update(kind == UNDO_BUTTON):
+            self.undo()
+        if brush.redo_button.update(kind == REDO_BUTTON):
+            self.redo()
+
+        if pen_down and over is not None and over.kind == CANVAS:
+            self._pen_move(frm, hand, brush, cursor)
+        else:
+            self._pen_up(hand, brush)
+
+    def _pen_move(self, frm, hand, brush, point):
+        world = self.view.to_world(point)
+        thickness = self.view.world_size(BRUSH_THICKNESS)  # strokes keep their on-screen width at any zoom
+        if brush.tool == "Draw":
+            if brush.last is not None:
+                self.strokes.line(brush.last, world, brush.color, thickness, pen=hand)
+                # The canvas gets this piece of the curve with the next sample
+                cv2.line(frm, self.view.to_screen(brush.last), point, brush.color, BRUSH_THICKNESS, cv2.LINE_AA)
+        elif brush.tool == "Erase":
+            self.strokes.erase(world, self.view.world_size(ERASE_RADIUS), pen=hand)
+        elif brush.tool in SHAPE_TOOLS:
+            if brush.anchor is None:
+                brush.anchor = world
+            _draw_shape(frm, brush.tool, self.view.to_screen(brush.anchor), point, brush.color, BRUSH_THICKNESS)
+        brush.last = world
+
+    def _pen_up(self, hand, brush):
+        if brush.anchor is not None and brush.tool in SHAPE_TOOLS:
+            p1, p2 = brush.anchor, brush.last
+            thickness = self.view.world_size(BRUSH_THICKNESS)
+            if brush.tool == "Line":
+                self.strokes.line(p1, p2, brush.color, thickness, tool="line", pen=hand)
+            elif brush.tool == "Rectangle":
+                self.strokes.rectangle(p1, p2, brush.color, thickness)
+            else:
+                self.strokes.circle(p1, _radius(p1, p2), brush.color, thickness)
+        brush.anchor = brush.last = None
+        self.strokes.end(hand)
+
+    def undo(self):
+        self.strokes.undo(self.world)
+
+    def redo(self):
+        self.strokes.redo(self.world)
+
+    def render(self, frm):
+        """Rasterize new strokes and composite the visible canvas and UI onto frm"""
+        with metrics.timer("drawing"):
+            self.strokes.rasterize(self.world)
+            self.canvas.show(self.world, self.view)
+        with metrics.timer("compositing"):
+            self.canvas.composite(frm)
+            self.overlay.update(self.tool, self.color, self._swatch)
+            self.overlay.apply(frm)
+        if self.view.zoom != 1.0:
+            cv2.putText(frm, f"Zoom: {self.view.zoom:.0%}", (self.width - 150, self.height - 35),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+
+def run(tracker, source=0, *, headless=False, cursor_filter=None, capture=(640, 480), canvas_size=None,
+        detect_scale=1.0, budget_ms=33.0, metrics_hud=False, metrics_log=None, metrics_prom=None,
+        debug_views=False, record=None, record_frames=False, autosave=None, autosave_interval=AUTOSAVE_INTERVAL,
+        export_dir=".", display_fps=DISPLAY_FPS, debug_fps=DEBUG_FPS, speed_width=False, tools=TOOLS, palette=PALETTE,
+        motion_gate=True):
+    """Paint with a tracker on frames from source until the source ends or Esc is pressed
+
+    source is an open_source() spec or a FrameSource. The options are
+    main()'s command line flags of the same names; canvas_size defaults to
+    the capture resolution.
+    """
+    width, height = canvas_size or capture
+    layout = Layout(width, height, tools, palette)
+    painter = Painter(width, height, *load_ui_images(), tracker.hover_selects, tracker.dwell_frames, speed_width,
+                      layout)
+    frames = (source if isinstance(source, FrameSource) else open_source(source, width=capture[0], height=capture[1]))
+    frames.start()
+    # Smooth every landmark; the cursor may also be predicted ahead by the measured latency
+    landmark_filter = HandFilters({INDEX_TIP: cursor_filter or tracker.default_filter}, default="oneeuro",
+                                  hands=tracker.max_hands)
+    latency = 0.0  # running estimate of capture-to-display time (s)
+    governor = FrameGovernor(budget_ms)
+    tracks = HandTracks()
+    extrapolators = {}  # hand ID -> landmarks on frames the governor skips
+    gate = MotionGate() if motion_gate and tracker.motion_gated else None
+    detected = []  # the tracker's last hands, reused while nothing moves
+    stats = metrics.configure(enabled=bool(metrics_hud or metrics_log or metrics_prom),
+                              jsonl=metrics_log, prometheus=metrics_prom, hud=metrics_hud)
+    captured_dropped = 0
+    display_skipped = 0
+    saver = CanvasSaver(painter.world, autosave, autosave_interval, export_dir)
+    restored = saver.restore()
+    if restored:
+        print(f"Restored the canvas from {saver.directory}")
+    recorder = None
+    if record:
+        recorder = SessionRecorder(record, width, height, tracker.hover_selects, tracker.dwell_frames,
+                                   type(tracker).__name__, images=record_frames, speed_width=speed_width,
+                                   background=painter.world.to_image() if restored else None, layout=layout)
+    display = None
+    if not headless:
+        display = Display(WINDOW, display_fps, debug_fps, on_open=lambda: tracker.attach(WINDOW, width, height)).start()
+
+    running = True
+    while running:
+        with stats.timer("capture"):
+            frame = frames.read()
+        if frame is None:  # Camera closed or recording finished
+            break
+        governor.start_frame()
+
+        # Find hands (in captured frame coordinates); the governor may lower
+        # the detection scale, skip mask clean-up or skip frames
+        quality = governor.level
+        released = []
+        with governor.stage("detect"):
+            if governor.detect_due():
+                moved = True
+                if gate is not None:
+                    with stats.timer("motion"):
+                        moved = gate.moved(frame.image)
+                if moved:
+                    detected = tracker.detect(frame, detect_scale * quality.scale, quality.morphology,
+                                              gate.region if gate is not None else None)
+                else:  # nothing in view moved: the last detection still holds
+                    stats.count("motion_skipped")
+                hands = tracks.update(detected, frame.image.shape)
+                released = tracks.ended
+                for hand_id in released:
+                    del extrapolators[hand_id]
+                    painter.release(hand_id)
+                    stats.count("hand_lost")
+                found = dict(hands)
+                for hand_id in tracks.ids:
+                    extrapolator = extrapolators.setdefault(hand_id, LandmarkExtrapolator())
+                    extrapolator.update(found[hand_id].landmarks if hand_id in found else None, frame.timestamp)
+            else:
+                hands = [(hand_id, Hand(predicted, None)) for hand_id, extrapolator in extrapolators.items()
+                         if (predicted := extrapolator.predict(frame.timestamp)) is not None]
+        if frames.dropped != captured_dropped:  # frames the capture thread overwrote before we read them
+            stats.count("dropped_frames", frames.dropped - captured_dropped)
+            captured_dropped = frames.dropped
+
+        # Map to the canvas resolution
+        frm = frame.image
+        if frm.shape[:2] != (height, width):
+            fx, fy = width / frm.shape[1], height / frm.shape[0]
+            with stats.timer("resize"):
+                frm = cv2.resize(frm, (width, height))
+            hands = [(hand_id, Hand(scale_landmarks(h.landmarks, fx, fy), scale_contour(h.contour, fx, fy)))
+                     for hand_id, h in hands]
+        elif record_frames and recorder is not None:
+            frm = frm.copy()  # annotations below must not land on the frame recorded raw
+        # Each hand steers its own cursor; all hands are filtered in one batch
+        filtered = landmark_filter({hand_id: hand.landmarks for hand_id, hand in hands}, frame.timestamp, latency)
+        found = {hand_id: hand._replace(landmarks=filtered[hand_id]) for hand_id, hand in hands}
+        # Debug views are only built on the frames they will be shown on, before annotations land on frm
+        views = {} if debug_views and display is not None and display.debug_due() else None
+        if views is not None:
+            views.update(tracker.debug_views(frm, list(found.values())))
+        tracker.annotate(frm, list(found.values()))
+
+        pointers = {}
+        steering = {}  # hand ID -> (landmarks, pen_down, grab), as recorded
+        for hand_id, hand in found.items():
+            if hand.landmarks[INDEX_TIP, 0] != MISSING:
+                cursor = tuple(int(v) for v in hand.landmarks[INDEX_TIP])
+                pen_down = tracker.pen_down(hand.landmarks)
+                grab = tracker.grab(hand.landmarks)
+                pointers[hand_id] = (cursor, pen_down, grab)
+                steering[hand_id] = (hand.landmarks, pen_down, grab)
+                if tracker.show_cursor:
+                    cv2.circle(frm, cursor, CURSOR_RADIUS, painter.brush(hand_id).color, -1)
+        painter.update(frm, pointers)
+        if recorder is not None:
+            recorder.record(frame.timestamp, released, steering, painter, frame.image)
+
+        # Frame and Mask Integration
+        with governor.stage("render"):
+            painter.render(frm)
+        cv2.putText(frm, f"Quality: {quality.name}", (width - 150, height - 15),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        stats.draw_hud(frm)
+        with stats.timer("autosave"):  # copies the changed tiles; the worker encodes and writes them
+            saver.tick(time.perf_counter())
+        latency += 0.1 * (time.perf_counter() - frame.timestamp - latency)
+        if governor.end_frame() and governor.level.scale != quality.scale:
+            tracker.reset()
+            if gate is not None:
+                gate.reset()
+        stats.gauge("quality_level", governor.index)
+        if gate is not None:
+            stats.gauge("motion_skip_rate", round(gate.skip_rate, 3))
+        stats.gauge("latency_ms", round(latency * 1e3, 1))
+        stats.end_frame()
+
+        if headless:
+            continue
+
+        with stats.timer("display"):  # a hand-over; the display thread blits it
+            if views is not None:
+                views.update(maskgray=painter.canvas.coverage.copy(), mask=painter.canvas.canvas.copy(),
+                             inv=painter.canvas.inverse_coverage())
+            display.show(frm, views)
+        if display.skipped != display_skipped:  # frames replaced before the display thread showed them
+            stats.count("display_skipped", display.skipped - display_skipped)
+            display_skipped = display.skipped
+        for key in display.keys():
+            if key == 27:  # Esc key
+                running = False
+            elif key == ord('z'):
+                painter.undo()
+                if recorder is not None:
+                    recorder.command(UNDO)
+            elif key == ord('y'):
+                painter.redo()
+                if recorder is not None:
+                    recorder.command(REDO)
+            elif key in (ord('+'), ord('=')):
+                painter.zoom(ZOOM_STEP)
+                if recorder is not None:
+                    recorder.command(ZOOM_IN)
+            elif key == ord('-'):
+                painter.zoom(1 / ZOOM_STEP)
+                if recorder is not None:
+                    recorder.command(ZOOM_OUT)
+            elif key == ord('0'):
+                painter.reset_view()
+                if recorder is not None:
+                    recorder.command(RESET_VIEW)
+            elif key == ord('c'):
+                tracker.calibrate()
+                if gate is not None:
+                    gate.reset()  # calibrate on the next frame even if the hand is still
+            elif key == ord('s'):
+                path = saver.export()
+                print(f"Saving {path}" if path else "Nothing painted to save yet")
+
+    frames.stop()
+    if recorder is not None:
+        recorder.close(painter)
+    saver.close()
+    stats.close()
+    tracker.close()
+    if display is not None:
+        display.close()
+
+
+def parse_scale(text):
+    """Detection scale: a fraction in (0, 1]"""
+    scale = float(text)
+    if not 0 < scale <= 1:
+        raise argparse.ArgumentTypeError(f"must be in (0, 1], got {text}")
+    return scale
+
+
+def parse_non_negative(text):
+    """Float that may be 0 (budgets and rate caps, where 0 switches them off)"""
+    value = float(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {text}")
+    return value
+
+
+def parse_positive(text):
+    """Float greater than 0 (intervals and rates)"""
+    value = float(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {text}")
+    return value
+
+
+def print_controls(tracker_name):
+    print(f"Gesture Brush ({tracker_name} tracker)")
+    print("Controls:")
+    if trackers.load(tracker_name).hover_selects:
+        print("- Show your hand to the camera and point with your index finger")
+        print("- Point to top area to select tools, left area to select colors")
+        print("- Rest on Undo/Redo (top right) or press Z/Y to undo/redo")
+        print("- Open your hand to drag the canvas; open both hands and move them apart or together to zoom")
+        print("- Press C with your hand in view to recalibrate")
+    else:
+        print("- Click and drag to draw; click tools, colors and Undo/Redo")
+        print("- Right-click and drag to move the canvas")
+        print("- Press Z/Y to undo/redo")
+    print("- Press +/- to zoom, 0 to reset the view")
+    print("- Press S to save the picture (plus a transparent layer)")
+    print("- Press ESC to exit")
+
+
+def main(argv=None, tracker=None):
+    """Command line entry point; `tracker` fixes the backend instead of offering --tracker"""
+    choosable = tracker is None
+    if choosable:
+        chooser = argparse.ArgumentParser(add_help=False)
+        chooser.add_argument("--tracker", default="contour", choices=list(trackers.BACKENDS))
+        tracker = chooser.parse_known_args(argv)[0].tracker
+    try:
+        backend = trackers.load(tracker)  # imports only the chosen backend
+    except ImportError as e:
+        sys.exit(f"Cannot use the {tracker} tracker: {e}")
+
+    parser = argparse.ArgumentParser(description=f"Gesture Brush - {trackers.BACKENDS[tracker].description}")
+    if choosable:
+        parser.add_argument("--tracker", default=tracker, choices=list(trackers.BACKENDS), help="hand tracker backend")
+    parser.add_argument("--source", default=None, help="camera index, video file, image directory or glob")
+    parser.add_argument("--headless", action="store_true", help="run without a window (for recorded footage)")
+    parser.add_argument("--filter", default=None, choices=list(FILTERS),
+                        help="cursor filter (kalman also predicts ahead to hide latency)")
+    parser.add_argument("--capture", type=parse_size, default=(640, 480), help="camera resolution, e.g. 1280x720")
+    parser.add_argument("--canvas", type=parse_size, default=None, help="drawing/display resolution (default: capture)")
+    parser.add_argument("--detect-scale", type=parse_scale, default=1.0,
+                        help="run detection on a frame downscaled by this factor")
+    parser.add_argument("--budget-ms", type=parse_non_negative, default=33.0,
+                        help="frame time budget; detection quality drops when it is exceeded (0 = never)")
+    parser.add_argument("--metrics-hud", action="store_true", help="show per-stage timings and counters on screen")
+    parser.add_argument("--metrics-log", help="append per-second metrics to this JSON-lines file")
+    parser.add_argument("--metrics-prom", help="keep this Prometheus text file (textfile collector format) up to date")
+    parser.add_argument("--tools", type=parse_tools, default=TOOLS,
+                        help=f"toolbar tools in order, comma-separated (default: {','.join(TOOLS).lower()})")
+    parser.add_argument("--palette", type=parse_palette, default=PALETTE,
+                        help="palette colours top to bottom as comma-separated RGB hex codes, e.g. ffde59,ff1616")
+    parser.add_argument("--speed-width", action="store_true", help="make strokes thinner the faster the hand moves")
+    parser.add_argument("--display-fps", type=parse_non_negative, default=DISPLAY_FPS,
+                        help="refresh cap of the window (0 = every frame)")
+    parser.add_argument("--debug-views", action="store_true",
+                        help="also show the tracker's masks and the canvas with its coverage masks")
+    parser.add_argument("--debug-fps", type=parse_non_negative, default=DEBUG_FPS,
+                        help="refresh cap of the debug views")
+    parser.add_argument("--autosave", metavar="DIR",
+                        help="save the canvas here periodically and restore it from here at startup")
+    parser.add_argument("--autosave-interval", type=parse_positive, default=AUTOSAVE_INTERVAL,
+                        help="seconds between autosaves")
+    parser.add_argument("--export-dir", default=".", help="where S saves pictures")
+    parser.add_argument("--no-motion-gate", dest="motion_gate", action="store_false",
+                        help="run detection on every frame, even when nothing in view moved")
+    parser.add_argument("--record", metavar="DIR", help="save the session to this directory for replay.py")
+    parser.add_argument("--record-frames", action="store_true", help="with --record, also save the captured frames")
+    backend.add_arguments(parser.add_argument_group(f"{tracker} tracker"))
+    args = parser.parse_args(argv)
+    if args.headless and backend.interactive:
+        parser.error(f"the {tracker} tracker needs a window")
+
+    source = args.source if args.source is not None else backend.default_source
+    print_controls(tracker)
+    try:
+        hand_tracker = backend.from_args(args)
+    except OSError as e:  # e.g. a model file that is not there
+        sys.exit(f"Cannot start the {tracker} tracker: {e}")
+    try:
+        frames = open_source(source, width=args.capture[0], height=args.capture[1]).start()
+    except OSError as e:  # e.g. a --source file that does not exist
+        hand_tracker.close()
+        parser.error(str(e))
+    run(hand_tracker, frames, headless=args.headless, cursor_filter=args.filter, capture=args.capture,
+        canvas_size=args.canvas, detect_scale=args.detect_scale, budget_ms=args.budget_ms,
+        metrics_hud=args.metrics_hud, metrics_log=args.metrics_log, metrics_prom=args.metrics_prom,
+        debug_views=args.debug_views, record=args.record, record_frames=args.record_frames,
+        autosave=args.autosave, autosave_interval=args.autosave_interval, export_dir=args.export_dir,
+        display_fps=args.display_fps, debug_fps=args.debug_fps, speed_width=args.speed_width,
+        tools=args.tools, palette=args.palette, motion_gate=args.motion_gate)
+
+
+if __name__ == "__main__":
+    main()
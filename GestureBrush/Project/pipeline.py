@@ -0,0 +1,196 @@
+import multiprocessing as mp
+import queue
+import time
+from collections import deque, namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Latest detection delivered to the render loop: frame sequence number,
+# capture timestamp, landmarks (list of (21, 2) arrays, one per hand) and
+# hand contours (contour backend only, else None)
+Detection = namedtuple("Detection", ["seq", "timestamp", "landmarks", "contours"])
+
+
+class SharedFrameRing:
+    """Fixed number of frame-sized slots in one shared memory block"""
+
+    def __init__(self, slots, shape, name=None):
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.slot_bytes = int(np.prod(self.shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_bytes)
+            self.owner = True
+        else:
+            self.shm = _attach(name)
+            self.owner = False
+        self.frames = np.ndarray((slots,) + self.shape, np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        del self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _attach(name):
+    """Attach to an existing block; workers share the parent's resource tracker"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def mediapipe_to_pixels(hand_landmarks, width, height):
+    """(21, 2) int32 pixel coordinates from MediaPipe normalized hand landmarks"""
+    coords = np.array([(p.x, p.y) for p in hand_landmarks.landmark], np.float32)
+    return (coords * (width, height)).astype(np.int32)
+
+
+def _contour_detector(method="defects", max_hands=1):
+    import gesture_brush
+    from roi_tracker import RoiTracker
+    from skin_model import SkinModel
+
+    tracker = RoiTracker()
+    skin = SkinModel()
+
+    def detect(frame, morphology=2, region=None, calibrate=False):
+        hands = gesture_brush.detect_hands(frame, tracker, method, skin, morphology=morphology, max_hands=max_hands,
+                                           region=region)
+        if calibrate and hands:
+            skin.calibrate(frame, hands[0][1])
+        return [landmarks for landmarks, _ in hands], [contour for _, contour in hands]
+    return detect
+
+
+def _mediapipe_detector(max_num_hands=1):
+    import cv2
+    import mediapipe
+
+    hands = mediapipe.solutions.hands.Hands(min_detection_confidence=0.6, min_tracking_confidence=0.6,
+                                            max_num_hands=max_num_hands)
+
+    def detect(frame):
+        op = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        height, width = frame.shape[:2]
+        found = op.multi_hand_landmarks or []
+        return [mediapipe_to_pixels(hand, width, height) for hand in found], None
+    return detect
+
+
+# Detector factories, called once inside each worker process
+DETECTORS = {
+    "contour": _contour_detector,
+    "mediapipe": _mediapipe_detector,
+}
+
+
+def _worker(ring_name, slots, shape, detector, options, jobs, results, calibration):
+    ring = SharedFrameRing(slots, shape, name=ring_name)
+    detect = DETECTORS[detector](**options)
+    calibrated = 0  # the last calibration request this worker carried out
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            seq, slot, timestamp, params = job
+            requested = calibration.value
+            if requested != calibrated:
+                params = dict(params, calibrate=True)
+            # Detect straight from shared memory; the slot is not reused until we report back
+            landmarks, contours = detect(ring.frames[slot], **params)
+            if landmarks:
+                calibrated = requested  # the detector calibrated on the first of these hands
+            results.put((seq, slot, timestamp, landmarks, contours))
+    finally:
+        ring.close()
+
+
+class DetectionPipeline:
+    """Runs hand detection in worker processes over a shared-memory frame ring
+
+    submit() copies a frame into a free slot and queues it; when every slot
+    is still being processed the frame is dropped instead, which bounds
+    queueing latency. poll() returns the newest finished detection, skipping
+    results older than one already delivered or older than max_age seconds.
+    Keyword arguments of submit() go to the detector with that frame;
+    calibrate() asks every worker to recalibrate on the next hand it finds.
+    """
+
+    def __init__(self, shape, workers=1, detector="contour", max_age=0.25, **options):
+        self.workers = max(1, workers)
+        self.slots = self.workers + 1  # one frame in flight per worker, plus one being filled
+        self.max_age = max_age
+        self.ring = SharedFrameRing(self.slots, shape)
+        self._free = deque(range(self.slots))
+        self._jobs = mp.Queue()
+        self._results = mp.Queue()
+        self._calibration = mp.Value("i", 0, lock=False)  # bumped per calibrate(); workers catch up on their own
+        self._seq = 0
+        self._latest = None
+        self.dropped = 0  # frames not submitted because all slots were busy
+        self.stale = 0  # results discarded as out of order or too old
+        self._procs = [
+            mp.Process(target=_worker, daemon=True,
+                       args=(self.ring.name, self.slots, self.ring.shape, detector, options, self._jobs, self._results,
+                             self._calibration))
+            for _ in range(self.workers)
+        ]
+        for proc in self._procs:
+            proc.start()
+
+    def submit(self, frame, timestamp, **params):
+        """Queue a frame for detection with the detector's per-frame params; False if it was dropped"""
+        self._collect()
+        if not self._free or frame.shape != self.ring.shape:
+            self.dropped += 1
+            return False
+        slot = self._free.popleft()
+        np.copyto(self.ring.frames[slot], frame)
+        self._seq += 1
+        self._jobs.put((self._seq, slot, timestamp, params))
+        return True
+
+    def calibrate(self):
+        self._calibration.value += 1
+
+    def poll(self):
+        """Newest detection that is still fresh, or None"""
+        self._collect()
+        if self._latest is not None and time.perf_counter() - self._latest.timestamp > self.max_age:
+            self._latest = None
+        return self._latest
+
+    def _collect(self):
+        while True:
+            try:
+                seq, slot, timestamp, landmarks, contours = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self._free.append(slot)
+            if (self._latest is not None and seq <= self._latest.seq) or time.perf_counter() - timestamp > self.max_age:
+                self.stale += 1
+                continue
+            self._latest = Detection(seq, timestamp, landmarks, contours)
+
+    def close(self):
+        for _ in self._procs:
+            self._jobs.put(None)
+        for proc in self._procs:
+            proc.join(timeout=2.0)
+            if proc.is_alive():
+                proc.terminate()
+        self.ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Gesture Brush - Session Replay
+Drives the painter from a session recorded with `painter.py --record`, with
+no camera and no window and as fast as the painter logic runs. The painted
+world comes out byte-identical to the recording run's, which makes
+sessions usable as regression tests; they can also be rendered offline at
+another resolution or to a video.
+"""
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from frame_source import parse_size
+from layout import Layout
+from painter import CURSOR_RADIUS, ZOOM_STEP, Painter, load_ui_images
+from session import REDO, RESET_VIEW, TOOLS, UNDO, ZOOM_IN, ZOOM_OUT, Session, released_hands
+from trackers import INDEX_TIP
+
+
+def replay(session, on_frame=None):
+    """Run a Session through a new Painter; returns it and the first frame where a brush disagreed, or None
+
+    Without on_frame only the world is drawn. With it, each frame is also
+    composited like the live view (over the recorded camera frame, if the
+    session has them) and passed to on_frame.
+    """
+    width, height = session.width, session.height
+    layout = Layout(width, height, session.info["tools"], session.info["palette"])
+    painter = Painter(width, height, *load_ui_images(), session.info["hover_selects"], session.info["dwell_frames"],
+                      session.info["speed_width"], layout)
+    scratch = np.zeros((height, width, 3), np.uint8)  # selection rings and shape previews land here
+    blank = np.full((height, width, 3), 255, np.uint8)
+    background = session.background()
+    if background is not None:
+        image, (x, y) = background
+        painter.world.write(x, y, x + image.shape[1], y + image.shape[0], image)
+    diverged = None
+    for index, record in enumerate(session.frames):
+        for hand in released_hands(record["released"]):
+            painter.release(hand)
+        rows = session.hands_at(index)
+        pointers = {int(row["hand"]): (tuple(int(v) for v in row["landmarks"][INDEX_TIP]), bool(row["pen_down"]),
+                                       bool(row["grab"]))
+                    for row in rows}
+
+        if on_frame is None:
+            painter.update(scratch, pointers)
+            painter.strokes.rasterize(painter.world)
+        else:
+            frm = _background(session, index, blank)
+            for hand, (cursor, _, _) in pointers.items():
+                cv2.circle(frm, cursor, CURSOR_RADIUS, painter.brush(hand).color, -1)
+            painter.update(frm, pointers)
+            painter.render(frm)
+
+        if diverged is None:
+            for row in rows:
+                brush = painter.brushes[int(row["hand"])]
+                if TOOLS[row["tool"]] != brush.tool or tuple(int(c) for c in row["color"]) != brush.color:
+                    diverged = index
+        if record["command"] == UNDO:
+            painter.undo()
+        elif record["command"] == REDO:
+            painter.redo()
+        elif record["command"] == ZOOM_IN:
+            painter.zoom(ZOOM_STEP)
+        elif record["command"] == ZOOM_OUT:
+            painter.zoom(1 / ZOOM_STEP)
+        elif record["command"] == RESET_VIEW:
+            painter.reset_view()
+        if on_frame is not None:
+            on_frame(frm)
+    return painter, diverged
+
+
+def _background(session, index, blank):
+    """The recorded camera frame at canvas size, or a blank one"""
+    if session.images is None or index >= len(session.images):
+        return blank.copy()
+    image = np.asarray(session.images[index])
+    if image.shape[:2] != blank.shape[:2]:
+        return cv2.resize(image, blank.shape[1::-1])
+    return image.copy()
+
+
+def compare_canvas(world, reference):
+    """Pixels of a TiledCanvas that differ from the recording run's (image, origin), None meaning blank
+
+    When only one of the two is blank, every pixel of the other counts as different.
+    """
+    painted = [entry for entry in (world.to_image(), reference) if entry is not None and entry[0] is not None]
+    if len(painted) < 2:
+        return sum(image.shape[0] * image.shape[1] for image, _ in painted)
+    boxes = [(x, y, x + image.shape[1], y + image.shape[0]) for image, (x, y) in painted]
+    x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+    x1, y1 = max(b[2] for b in boxes), max(b[3] for b in boxes)
+    expected = np.zeros((y1 - y0, x1 - x0, 3), np.uint8)
+    image, (x, y) = reference
+    expected[y - y0:y - y0 + image.shape[0], x - x0:x - x0 + image.shape[1]] = image
+    return int(np.count_nonzero((world.read(x0, y0, x1, y1) != expected).any(axis=2)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded Gesture Brush session headless")
+    parser.add_argument("session", help="directory written by painter.py --record")
+    parser.add_argument("--output", help="write the painted part of the final canvas to this image file")
+    parser.add_argument("--size", type=parse_size, default=None,
+                        help="re-render the strokes at this resolution for --output, e.g. 3840x2160")
+    parser.add_argument("--video", help="write every frame as the live view showed it to this video file")
+    args = parser.parse_args(argv)
+
+    session = Session(args.session)
+    writer = None
+    on_frame = None
+    if args.video:
+        fps = round((len(session) - 1) / session.duration) if session.duration > 0 else 30  # mp4 wants whole rates
+        writer = cv2.VideoWriter(args.video, cv2.VideoWriter_fourcc(*"mp4v"), fps, (session.width, session.height))
+        on_frame = writer.write
+    start = time.perf_counter()
+    painter, diverged = replay(session, on_frame)
+    elapsed = time.perf_counter() - start
+    if writer is not None:
+        writer.release()
+
+    speed = f" ({session.duration / elapsed:.0f}x real time)" if elapsed > 0 and session.duration > 0 else ""
+    print(f"Replayed {len(session)} frames ({session.duration:.1f} s recorded, "
+          f"{len(session.hands)} hand records) in {elapsed:.3f} s{speed}")
+    if args.output:
+        image, _ = painter.world.to_image()
+        if image is None:
+            print("Nothing was painted; no canvas written")
+        else:
+            if args.size:
+                image = painter.strokes.render(*args.size, region=painter.strokes.extent())
+            cv2.imwrite(args.output, image)
+            print(f"Canvas written to {args.output}")
+
+    status = 0
+    if diverged is not None:
+        print(f"Brush state differs from the recording from frame {diverged} on")
+        status = 1
+    if not session.closed:
+        print("No saved canvas to check against (the recording was not closed)")
+    elif differing := compare_canvas(painter.world, session.canvas()):
+        print(f"Canvas differs from the recording in {differing} pixels")
+        status = 1
+    else:
+        print("Canvas is identical to the recording")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
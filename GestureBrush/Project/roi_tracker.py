@@ -0,0 +1,166 @@
+from collections import deque
+
+RESCAN_INTERVAL = 10  # frames between full-frame searches for hands that are not yet tracked
+
+
+class RoiTracker:
+    """Predicts a search window around the hand from its recent bounding boxes
+
+    search_windows() yields the predicted window first, then a grown window,
+    then the full frame. update() accepts a contour found in one of those
+    windows, or rejects it when it touches a window edge that is not also a
+    frame edge (the hand may be cut off), so the caller moves on to the next
+    window. Several hands are tracked as the box around all of them, and
+    searched in a window each while they are apart; while fewer than the
+    wanted number are in view, the full frame is searched every
+    rescan_interval frames so newcomers are picked up.
+
+    Given the region where the frame changed (MotionGate), that region
+    takes the full frame's place: hands that did not move are in their
+    tracked windows, and a new hand has to move to appear. Only when a
+    hand found there may be clipped by the region is the full frame
+    searched as well.
+    """
+
+    def __init__(self, pad=0.2, min_pad=16, edge_margin=3, history=3, rescan_interval=RESCAN_INTERVAL):
+        self.pad = pad  # padding as a fraction of the hand's larger side
+        self.min_pad = min_pad  # minimum padding in pixels
+        self.edge_margin = edge_margin  # px from a window edge that counts as touching it
+        self.boxes = deque(maxlen=history)  # recent (x, y, w, h) in frame coordinates
+        self.expand = 1.0  # grows after edge hits, decays back to 1
+        self.rescan_interval = rescan_interval
+        self.parts = []  # each hand's (x, y, w, h) at the last update
+        self.hands = 0  # hands inside the tracked box
+        self._since_full = 0  # searches since the last full-frame one
+        self._rejected = False  # the last update() found a hand clipped by its window
+        self.roi_hits = 0
+        self.full_searches = 0
+
+    @property
+    def tracking(self):
+        return bool(self.boxes)
+
+    def predict(self):
+        """Bounding box expected in the next frame (constant velocity)"""
+        x, y, w, h = self.boxes[-1]
+        if len(self.boxes) >= 2:
+            px, py, pw, ph = self.boxes[-2]
+            vx = (x + w / 2) - (px + pw / 2)
+            vy = (y + h / 2) - (py + ph / 2)
+        else:
+            vx = vy = 0.0
+        return x + vx, y + vy, w, h, abs(vx), abs(vy)
+
+    def _window(self, frame_shape, scale, part=None):
+        """Padded window around the predicted box, or around one hand's box moved with it"""
+        height, width = frame_shape[:2]
+        x, y, w, h, vx, vy = self.predict()
+        if part is not None:
+            lx, ly = self.boxes[-1][:2]
+            x, y, w, h = part[0] + x - lx, part[1] + y - ly, part[2], part[3]
+        pad = max(self.min_pad, self.pad * max(w, h)) * self.expand * scale
+        x0 = max(0, int(x - pad - vx))
+        y0 = max(0, int(y - pad - vy))
+        x1 = min(width, int(x + w + pad + vx) + 1)
+        y1 = min(height, int(y + h + pad + vy) + 1)
+        return x0, y0, x1, y1
+
+    def _part_windows(self, frame_shape, union):
+        """One window per hand when together they cover less than the union window, else None
+
+        Windows that overlap are cut halfway between their hands, so no hand
+        is found twice; hands whose boxes overlap are searched together.
+        """
+        windows = [list(self._window(frame_shape, 1.0, part)) for part in self.parts]
+        for i, (ax, ay, aw, ah) in enumerate(self.parts):
+            for j in range(i + 1, len(self.parts)):
+                a, b = windows[i], windows[j]
+                if not (a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]):
+                    continue
+                bx, by, bw, bh = self.parts[j]
+                if ax + aw <= bx or bx + bw <= ax:  # side by side: cut vertically
+                    left, right = (a, b) if ax < bx else (b, a)
+                    mid = (min(ax + aw, bx + bw) + max(ax, bx)) // 2
+                    left[2], right[0] = min(left[2], mid), max(right[0], mid)
+                elif ay + ah <= by or by + bh <= ay:  # one above the other: cut horizontally
+                    top, bottom = (a, b) if ay < by else (b, a)
+                    mid = (min(ay + ah, by + bh) + max(ay, by)) // 2
+                    top[3], bottom[1] = min(top[3], mid), max(bottom[1], mid)
+                else:
+                    return None
+        windows = [tuple(w) for w in windows]
+        if sum(_area(w) for w in windows) >= _area(union):
+            return None
+        return windows
+
+    def search_windows(self, frame_shape, max_hands=1, region=None):
+        """Yield lists of (x0, y0, x1, y1) windows to search together, ending with the full frame (or region)
+
+        Hands tracked apart get a window each; otherwise a list holds one
+        window that contains every hand.
+        """
+        height, width = frame_shape[:2]
+        full = (0, 0, width, height)
+        self._since_full += 1
+        rescan = self.hands < max_hands and self._since_full >= self.rescan_interval
+        if self.tracking and not rescan:
+            union = self._window(frame_shape, 1.0)
+            apart = self._part_windows(frame_shape, union) if len(self.parts) > 1 else None
+            if apart:
+                yield apart
+            seen = set()
+            for scale in (1.0, 2.0):
+                window = self._window(frame_shape, scale)
+                if window == full:
+                    break
+                if window not in seen:
+                    seen.add(window)
+                    yield [window]
+        if region is not None and tuple(region) != full:
+            self._since_full = 0
+            self._rejected = False
+            yield [tuple(region)]
+            if not self._rejected:  # nothing hand-like where the frame changed
+                return
+        self.full_searches += 1
+        self._since_full = 0
+        yield [full]
+
+    def _clipped(self, bbox, window, frame_shape):
+        height, width = frame_shape[:2]
+        x, y, w, h = bbox
+        x0, y0, x1, y1 = window
+        m = self.edge_margin
+        return ((x0 > 0 and x - x0 < m) or (y0 > 0 and y - y0 < m) or
+                (x1 < width and x1 - (x + w) < m) or (y1 < height and y1 - (y + h) < m))
+
+    def update(self, found, frame_shape):
+        """Record hands found as (bbox, window searched) pairs; False if any may be clipped"""
+        if any(self._clipped(bbox, window, frame_shape) for bbox, window in found):
+            self.expand = min(self.expand * 1.5, 4.0)
+            self._rejected = True
+            return False
+        height, width = frame_shape[:2]
+        if any(window != (0, 0, width, height) for _, window in found):
+            self.roi_hits += 1
+        self.expand = max(1.0, self.expand * 0.9)
+        self.parts = [bbox for bbox, _ in found]
+        x0 = min(x for x, _, _, _ in self.parts)
+        y0 = min(y for _, y, _, _ in self.parts)
+        x1 = max(x + w for x, _, w, _ in self.parts)
+        y1 = max(y + h for _, y, _, h in self.parts)
+        self.boxes.append((x0, y0, x1 - x0, y1 - y0))
+        self.hands = len(self.parts)
+        return True
+
+    def lost(self):
+        """The hand was not found anywhere; search the full frame next time"""
+        self.boxes.clear()
+        self.parts = []
+        self.expand = 1.0
+        self.hands = 0
+
+
+def _area(window):
+    x0, y0, x1, y1 = window
+    return (x1 - x0) * (y1 - y0)
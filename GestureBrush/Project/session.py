@@ -0,0 +1,265 @@
+"""Compact recordings of painting sessions, for deterministic replay
+
+A session is a directory of flat binary tables that NumPy maps straight
+from disk:
+
+- frames.bin: one FRAME_DTYPE record per frame (time, hands released
+  before it, keyboard command after it)
+- hands.bin: one HAND_DTYPE record per hand per frame (filtered landmarks,
+  pen and grab state, and the tool and colour its brush had afterwards)
+- images.bin: optionally the captured frames themselves, raw BGR
+- session.json: screen size, painter settings (including the toolbar's
+  tools and the palette), the tables' layout and where in the world the
+  images below start
+- background.png: the painted part of the world the session started from,
+  when it was not blank
+- canvas.png: the painted part of the world at the end, written when the
+  recording is closed
+
+Records are appended as they happen, so a session cut short by a crash
+stays readable up to its last whole record. replay.py drives the painter
+from the tables; the image track can also be fed back to a tracker as a
+frame source (`--source` with the session directory).
+"""
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from frame_source import FrameSource, _pace
+from history import DWELL_FRAMES
+from layout import TOOLS as TOOLBAR_TOOLS, Layout
+from trackers import NUM_LANDMARKS
+
+FORMAT_VERSION = 4
+SESSION_FILE = "session.json"
+FRAMES_FILE = "frames.bin"
+HANDS_FILE = "hands.bin"
+IMAGES_FILE = "images.bin"
+CANVAS_FILE = "canvas.png"
+BACKGROUND_FILE = "background.png"
+
+# Keyboard commands applied after a frame is rendered
+NO_COMMAND, UNDO, REDO, ZOOM_IN, ZOOM_OUT, RESET_VIEW = 0, 1, 2, 3, 4, 5
+TOOLS = ("Select Tool",) + TOOLBAR_TOOLS  # stored by index: the painter's starting tool, then every toolbar tool
+
+FRAME_DTYPE = np.dtype([
+    ("time", "<f8"),  # seconds since the recording started
+    ("released", "<u8"),  # bit k set: hand ID k was released before this frame
+    ("command", "u1"),
+])
+HAND_DTYPE = np.dtype([
+    ("frame", "<u4"),
+    ("hand", "u1"),
+    ("landmarks", "<i4", (NUM_LANDMARKS, 2)),  # screen coordinates, after filtering; MISSING = -1
+    ("pen_down", "?"),
+    ("grab", "?"),
+    ("tool", "u1"),  # index into TOOLS
+    ("color", "u1", (3,)),  # BGR
+])
+
+
+class SessionRecorder:
+    """Appends a running painter's input to a session directory, frame by frame
+
+    Call record() after Painter.update() with the hands it was given,
+    command() for a keyboard undo/redo or view change, and close() at the
+    end. Images of the world are given as (image, world origin) pairs, as
+    TiledCanvas.to_image() returns them. Hands are
+    stored in the order they were passed to the painter, since that is the
+    order their strokes were painted in.
+    """
+
+    def __init__(self, path, width, height, hover_selects=True, dwell_frames=DWELL_FRAMES, tracker="",
+                 images=False, background=None, speed_width=False, layout=None):
+        os.makedirs(path, exist_ok=True)
+        layout = layout or Layout(width, height)  # the painter's default
+        self.path = path
+        self.info = {
+            "version": FORMAT_VERSION,
+            "width": width,
+            "height": height,
+            "hover_selects": hover_selects,
+            "dwell_frames": dwell_frames,
+            "speed_width": speed_width,
+            "tools": list(layout.tools),
+            "palette": [list(color) for color in layout.palette],
+            "tracker": tracker,
+            "started": time.time(),
+            "frame_dtype": FRAME_DTYPE.descr,
+            "hand_dtype": HAND_DTYPE.descr,
+            "image_shape": None,
+            "background_origin": None,
+            "canvas_origin": None,
+            "closed": False,
+        }
+        self._frames = open(os.path.join(path, FRAMES_FILE), "wb")
+        self._hands = open(os.path.join(path, HANDS_FILE), "wb")
+        self._images = open(os.path.join(path, IMAGES_FILE), "wb") if images else None
+        if not images and os.path.exists(os.path.join(path, IMAGES_FILE)):
+            os.remove(os.path.join(path, IMAGES_FILE))  # left over from an earlier recording
+        if os.path.exists(os.path.join(path, CANVAS_FILE)):
+            os.remove(os.path.join(path, CANVAS_FILE))
+        self._write_image(BACKGROUND_FILE, "background_origin", background)
+        self._pending = None  # this frame's record; written once its command is known
+        self._start = None
+        self.count = 0
+
+    def _write_info(self):
+        with open(os.path.join(self.path, SESSION_FILE), "w") as f:
+            json.dump(self.info, f, indent=2)
+
+    def _write_image(self, name, key, world_image):
+        """Save an (image, origin) pair, or remove a stale file when the image is None"""
+        image, origin = world_image or (None, None)
+        path = os.path.join(self.path, name)
+        if image is not None:
+            cv2.imwrite(path, image)
+        elif os.path.exists(path):
+            os.remove(path)
+        self.info[key] = None if origin is None else list(origin)
+        self._write_info()
+
+    def record(self, timestamp, released, hands, painter, image=None):
+        """Log a frame: hand IDs released before it, then {hand ID: (landmarks, pen_down, grab)} of the painter's cursors"""
+        self._flush()
+        if self._start is None:
+            self._start = timestamp
+        mask = 0
+        for hand in released:
+            mask |= 1 << hand
+        self._pending = np.array([(timestamp - self._start, mask, NO_COMMAND)], FRAME_DTYPE)
+        if hands:
+            rows = np.zeros(len(hands), HAND_DTYPE)
+            for row, (hand, (landmarks, pen_down, grab)) in zip(rows, hands.items()):
+                brush = painter.brush(hand)
+                row["frame"] = self.count
+                row["hand"] = hand
+                row["landmarks"] = landmarks
+                row["pen_down"] = pen_down
+                row["grab"] = grab
+                row["tool"] = TOOLS.index(brush.tool)
+                row["color"] = brush.color
+            self._hands.write(rows.tobytes())
+        if self._images is not None and image is not None:
+            if self.info["image_shape"] is None:
+                self.info["image_shape"] = list(image.shape)
+                self._write_info()
+            self._images.write(np.ascontiguousarray(image).tobytes())
+        self.count += 1
+
+    def command(self, command):
+        """Log a keyboard command (UNDO, ZOOM_IN, ...) applied after the last recorded frame"""
+        if self._pending is not None:
+            self._pending["command"] = command
+
+    def _flush(self):
+        if self._pending is not None:
+            self._frames.write(self._pending.tobytes())
+            self._pending = None
+
+    def close(self, painter=None):
+        """Finish the files; with the painter, also save its world for replays to be checked against"""
+        self._flush()
+        for f in (self._frames, self._hands, self._images):
+            if f is not None:
+                f.close()
+        if painter is not None:
+            self.info["closed"] = True
+            self._write_image(CANVAS_FILE, "canvas_origin", painter.world.to_image())
+
+
+class Session:
+    """A recorded session, memory-mapped read-only"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, SESSION_FILE)) as f:
+            self.info = json.load(f)
+        if self.info["version"] != FORMAT_VERSION:
+            raise ValueError(f"unsupported session format {self.info['version']} in {path}")
+        self.path = path
+        self.width = self.info["width"]
+        self.height = self.info["height"]
+        self.frames = _table(os.path.join(path, FRAMES_FILE), FRAME_DTYPE)
+        self.hands = _table(os.path.join(path, HANDS_FILE), HAND_DTYPE)
+        self.images = None
+        shape = self.info["image_shape"]
+        if shape is not None and os.path.exists(os.path.join(path, IMAGES_FILE)):
+            self.images = _table(os.path.join(path, IMAGES_FILE), np.dtype((np.uint8, tuple(shape))))
+        # Rows of a frame whose own record was cut off by a crash are dropped with it
+        self.hands = self.hands[:np.searchsorted(self.hands["frame"], len(self.frames))]
+        self._bounds = np.searchsorted(self.hands["frame"], np.arange(len(self.frames) + 1))
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def closed(self):
+        """Whether the recording run saved its final world"""
+        return self.info["closed"]
+
+    @property
+    def duration(self):
+        return float(self.frames["time"][-1]) if len(self.frames) else 0.0
+
+    def hands_at(self, index):
+        """HAND_DTYPE rows of a frame, in the order they were given to the painter"""
+        return self.hands[self._bounds[index]:self._bounds[index + 1]]
+
+    def canvas(self):
+        """(image, world origin) of the recording run's final world, or None if it was blank or not saved"""
+        return self._image(CANVAS_FILE, "canvas_origin")
+
+    def background(self):
+        """(image, world origin) of the world the recording started from (e.g. a restored autosave), or None"""
+        return self._image(BACKGROUND_FILE, "background_origin")
+
+    def _image(self, name, key):
+        path = os.path.join(self.path, name)
+        if self.info.get(key) is None or not os.path.exists(path):
+            return None
+        return cv2.imread(path), tuple(self.info[key])
+
+
+def _table(path, dtype):
+    """Whole records of a binary file, memory-mapped (a partial record at the end is ignored)"""
+    count = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+    if count == 0:
+        return np.zeros(0, dtype)
+    return np.memmap(path, dtype, "r", shape=(count,))
+
+
+def released_hands(mask):
+    """Hand IDs set in a `released` bit mask"""
+    mask = int(mask)
+    return [hand for hand in range(mask.bit_length()) if mask >> hand & 1]
+
+
+class SessionSource(FrameSource):
+    """Replay a session's recorded camera frames, e.g. to re-run a tracker on them"""
+
+    def __init__(self, path, realtime=False, loop=False, buffer_size=4):
+        super().__init__(buffer_size=buffer_size, drop_oldest=realtime)
+        self.session = Session(path)
+        if self.session.images is None:
+            raise IOError(f"Session has no recorded frames: {path}")
+        self.loop = loop
+        self._interval = 1.0 / 30.0 if realtime else 0.0
+        self._next_time = 0.0
+        self._pos = 0
+
+    def _open(self):
+        self._pos = 0
+        self._next_time = time.perf_counter()
+
+    def _grab(self):
+        if self._pos >= len(self.session.images):
+            if not self.loop:
+                return None
+            self._pos = 0
+        frm = np.array(self.session.images[self._pos])  # a copy: painted on downstream
+        self._pos += 1
+        _pace(self)
+        return frm
@@ -0,0 +1,161 @@
+import threading
+
+import cv2
+import numpy as np
+
+LUT_BINS = 64  # per BGR channel; the lookup table has LUT_BINS ** 3 cells
+CHROMA_BINS = 32  # per Cr/Cb channel of the learned histograms
+MIN_LUMA = 40  # darker pixels are never skin (chroma is meaningless near black)
+
+# Fixed HSV window used until the hand has been seen often enough to learn from
+PRIOR_HSV_LOWER = (0, 30, 60)
+PRIOR_HSV_UPPER = (20, 255, 255)
+
+LEARN_EVERY = 5  # frames between histogram updates from the tracked hand
+SAMPLE_STRIDE = 2  # learn from every n-th pixel in each direction; plenty for a histogram
+REFRESH_EVERY = 6  # histogram updates between lookup table rebuilds
+MIN_UPDATES = 3  # updates before the learned table replaces the prior
+DECAY = 0.9  # weight kept by older samples at each update, so the model follows lighting drift
+CALIBRATION_WEIGHT = 10.0  # weight of an explicit calibration against one tracking update
+SKIN_RATIO = 0.6  # share of a colour's probability mass that must come from skin
+
+
+def _bin_centres():
+    """BGR colour at the centre of every lookup table cell, shape (LUT_BINS ** 3, 3)"""
+    step = 256 // LUT_BINS
+    levels = np.arange(LUT_BINS, dtype=np.uint8) * step + step // 2
+    b, g, r = np.meshgrid(levels, levels, levels, indexing="ij")
+    return np.stack([b.ravel(), g.ravel(), r.ravel()], axis=1)
+
+
+def _prior_lut(centres):
+    hsv = cv2.cvtColor(centres[None], cv2.COLOR_BGR2HSV)
+    inside = cv2.inRange(hsv, PRIOR_HSV_LOWER, PRIOR_HSV_UPPER)[0]
+    return _as_table(inside)
+
+
+def _as_table(cells):
+    """(LUT_BINS ** 3,) 0/255 values as a 3D histogram that calcBackProject accepts"""
+    # Wrapped as a plain 3D Mat: a bare (n, n, n) array would be read as an n x n image with n channels
+    return cv2.Mat(cells.astype(np.float32).reshape((LUT_BINS,) * 3), wrap_channels=False)
+
+
+class SkinModel:
+    """Skin classifier baked into a 3D lookup table over quantized BGR
+
+    mask() segments a frame with a single back-projection through the
+    table, so the colour-space conversion and the decision rule cost
+    nothing per pixel. The table starts as the fixed HSV window; learn()
+    then accumulates Cr/Cb histograms of the tracked hand and of the pixels
+    around it, and the table is periodically re-baked from their ratio on
+    a background thread as the lighting drifts.
+    """
+
+    def __init__(self, background=True):
+        centres = _bin_centres()
+        ycrcb = cv2.cvtColor(centres[None], cv2.COLOR_BGR2YCrCb)[0].astype(np.int32)
+        shift = 8 - int(np.log2(CHROMA_BINS))
+        # Chroma histogram cell and luma of every lookup table cell, for re-baking
+        self._chroma_index = ((ycrcb[:, 1] >> shift) * CHROMA_BINS + (ycrcb[:, 2] >> shift))
+        self._bright = ycrcb[:, 0] >= MIN_LUMA
+        self.prior = _prior_lut(centres)
+        self.lut = self.prior
+        self.skin_hist = np.zeros((CHROMA_BINS, CHROMA_BINS), np.float32)
+        self.background_hist = np.zeros((CHROMA_BINS, CHROMA_BINS), np.float32)
+        self.updates = 0
+        self.rebuilds = 0
+        self._frames = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    @property
+    def learned(self):
+        return self.lut is not self.prior
+
+    def mask(self, frame):
+        """Binary (0/255) skin mask of a BGR frame"""
+        return cv2.calcBackProject([frame], [0, 1, 2], self.lut, [0, 256] * 3, 1)
+
+    def learn(self, frame, contour):
+        """Fold the hand under contour (and its surroundings) into the model, every LEARN_EVERY frames"""
+        self._frames += 1
+        if contour is None or self._frames % LEARN_EVERY:
+            return
+        if self._add(frame, contour, 1.0) and self.updates >= MIN_UPDATES and self.updates % REFRESH_EVERY == 0:
+            if self._thread is not None:
+                self._wake.set()
+            else:
+                self.rebuild()
+
+    def calibrate(self, frame, contour):
+        """Restart the model from one trusted view of the hand"""
+        with self._lock:
+            self.skin_hist[:] = 0
+            self.background_hist[:] = 0
+            self.updates = MIN_UPDATES - 1
+        if self._add(frame, contour, CALIBRATION_WEIGHT):
+            self.rebuild()
+
+    def _add(self, frame, contour, weight):
+        skin, background = self._sample(frame, contour)
+        if skin is None:
+            return False
+        with self._lock:
+            self.skin_hist *= DECAY
+            self.background_hist *= DECAY
+            self.skin_hist += weight * skin
+            self.background_hist += weight * background
+            self.updates += 1
+        return True
+
+    def _sample(self, frame, contour):
+        """Normalized chroma histograms of the hand and of a margin around it"""
+        x, y, w, h = cv2.boundingRect(contour)
+        height, width = frame.shape[:2]
+        x0, y0 = max(0, x - w // 2), max(0, y - h // 2)
+        x1, y1 = min(width, x + w + w // 2), min(height, y + h + h // 2)
+        n = SAMPLE_STRIDE
+        # Nearest-neighbour resize subsamples far faster than converting a strided view
+        window = cv2.resize(frame[y0:y1, x0:x1], None, fx=1 / n, fy=1 / n, interpolation=cv2.INTER_NEAREST)
+        window = cv2.cvtColor(window, cv2.COLOR_BGR2YCrCb)
+        hand = np.zeros(window.shape[:2], np.uint8)
+        cv2.drawContours(hand, [(contour - np.array([x0, y0], contour.dtype)) // n], -1, 255, -1)
+        # Stay clear of the silhouette edge on both sides, where colours mix
+        kernel = np.ones((5, 5), np.uint8)
+        inside = cv2.erode(hand, kernel)
+        outside = cv2.bitwise_not(cv2.dilate(hand, kernel))
+        ranges = [0, 256, 0, 256]
+        skin = cv2.calcHist([window], [1, 2], inside, [CHROMA_BINS] * 2, ranges)
+        background = cv2.calcHist([window], [1, 2], outside, [CHROMA_BINS] * 2, ranges)
+        if skin.sum() == 0:
+            return None, None
+        return skin / skin.sum(), background / max(background.sum(), 1.0)
+
+    def rebuild(self):
+        """Re-bake the lookup table from the current histograms"""
+        with self._lock:
+            skin = self.skin_hist.ravel().copy()
+            background = self.background_hist.ravel().copy()
+            if self.updates < MIN_UPDATES:
+                return
+        is_skin = skin > SKIN_RATIO * (skin + background) + 1e-6
+        # Single reference swap, so mask() never sees a partially built table
+        self.lut = _as_table(np.where(is_skin[self._chroma_index] & self._bright, 255, 0))
+        self.rebuilds += 1
+
+    def reset(self):
+        with self._lock:
+            self.skin_hist[:] = 0
+            self.background_hist[:] = 0
+            self.updates = 0
+        self.lut = self.prior
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self.rebuild()
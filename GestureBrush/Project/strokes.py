@@ -0,0 +1,326 @@
+import cv2
+import numpy as np
+
+# Tools whose strokes grow point by point; the rest are closed two-point shapes
+FREEHAND_TOOLS = ("draw", "erase")
+
+SPLINE_STEP = 3.0  # px between interpolated points of a freehand curve
+MAX_SPLINE_STEPS = 32  # interpolated points per pair of samples at most
+SHIFT = 4  # fractional bits of curve coordinates handed to OpenCV (1/16 px)
+CLIP_MARGIN = 4  # px of border a curve is drawn with, so clipping at a tile edge leaves no seam
+SPEED_HALF_WIDTH = 30.0  # px moved between samples at which a speed-width stroke is half as thick
+MIN_WIDTH = 0.3  # thinnest speed-width stroke, as a fraction of its thickness
+
+
+class Stroke:
+    """One stroke: its tool, colour and size plus a growable (n, 2) int32 point array
+
+    Freehand "draw" strokes are smooth curves through their samples (thinner
+    where the samples are far apart when speed_width is set), "erase" ones
+    chains of eraser dabs; "line" and "rectangle" hold their two corners
+    and "circle" its centre with the radius in `radius`.
+    """
+
+    __slots__ = ("tool", "color", "thickness", "radius", "speed_width", "_points", "count")
+
+    def __init__(self, tool, color, thickness, radius=0, points=(), speed_width=False):
+        self.tool = tool
+        self.color = tuple(int(c) for c in color)
+        self.thickness = int(thickness)
+        self.radius = int(radius)
+        self.speed_width = speed_width
+        self._points = np.empty((max(16, len(points)), 2), np.int32)
+        self.count = 0
+        for p in points:
+            self.append(p)
+
+    @property
+    def points(self):
+        return self._points[:self.count]
+
+    def append(self, point):
+        if self.count == len(self._points):
+            grown = np.empty((2 * self.count, 2), np.int32)
+            grown[:self.count] = self._points
+            self._points = grown
+        self._points[self.count] = point
+        self.count += 1
+
+    def bounds(self, start=0, stop=None):
+        """(x0, y0, x1, y1) containing everything painted from point `start` up to `stop`"""
+        if self.tool == "draw":
+            return _extent(_polylines(self, start, stop))
+        pts = self.points[start:stop]
+        pad = (self.radius if self.tool in ("erase", "circle") else 0) + max(self.thickness, 0) // 2 + 1
+        x0, y0 = pts.min(axis=0) - pad
+        x1, y1 = pts.max(axis=0) + pad + 1
+        return int(x0), int(y0), int(x1), int(y1)
+
+
+class StrokeStore:
+    """Vector record of everything painted, with the canvas as a cache over it
+
+    The painter's tools call line(), rectangle(), circle() and erase(),
+    which only record points, in world coordinates. rasterize() draws the
+    segments added since its last call into the tiles of a TiledCanvas,
+    and render() re-rasterizes every stroke in a region (by default the
+    width x height screen at the world origin) at any resolution. With a
+    TileHistory attached, each stroke is one undoable action. Several pens
+    (one per hand) can each have a freehand stroke open at once.
+
+    A curve between two samples depends on the sample after them, so the
+    newest piece of an open "draw" stroke is rasterized once the next
+    sample arrives or the stroke ends; callers preview it meanwhile.
+    """
+
+    def __init__(self, width=640, height=480, history=None, speed_width=False):
+        self.width = width
+        self.height = height
+        self.history = history
+        self.speed_width = speed_width  # new "draw" strokes thin out with speed
+        self.strokes = []
+        self._open = {}  # pen -> freehand stroke that its next matching call extends
+        self._next = 0  # strokes before this index have been rasterized
+        self._drawn = {}  # open stroke -> points of it already rasterized (up to, not including)
+        self._actions = {}  # open stroke -> its history action
+
+    # Recording
+    def line(self, p1, p2, color, thickness, tool="draw", pen=0):
+        """Record a segment; "draw" segments that continue the pen's open stroke extend it"""
+        stroke = self._open.get(pen)
+        if (tool == "draw" and stroke is not None and stroke.tool == "draw"
+                and stroke.color == tuple(color) and stroke.thickness == thickness
+                and tuple(stroke.points[-1]) == tuple(p1)):
+            stroke.append(p2)
+            return
+        self._add(Stroke(tool, color, thickness, points=(p1, p2), speed_width=self.speed_width and tool == "draw"), pen)
+
+    def rectangle(self, p1, p2, color, thickness):
+        self._add(Stroke("rectangle", color, thickness, points=(p1, p2)))
+
+    def circle(self, center, radius, color, thickness):
+        self._add(Stroke("circle", color, thickness, radius, points=(center,)))
+
+    def erase(self, center, radius, pen=0):
+        stroke = self._open.get(pen)
+        if stroke is not None and stroke.tool == "erase" and stroke.radius == radius:
+            stroke.append(center)
+            return
+        self._add(Stroke("erase", (0, 0, 0), -1, radius, points=(center,)), pen)
+
+    def end(self, pen=0):
+        """Close the pen's open freehand stroke so its next call starts a new one"""
+        self._open.pop(pen, None)
+
+    def _add(self, stroke, pen=0):
+        self.strokes.append(stroke)
+        if stroke.tool in FREEHAND_TOOLS:
+            self._open[pen] = stroke
+        else:
+            self._open.pop(pen, None)
+
+    # Rasterizing
+    def rasterize(self, canvas):
+        """Draw what was recorded since the last call into a TiledCanvas"""
+        # Open strokes that grew, then strokes added since the last call
+        pending = list(self._drawn.items()) + [(stroke, 0) for stroke in self.strokes[self._next:]]
+        open_strokes = set(self._open.values())
+        for stroke, start in pending:
+            stop = _ready(stroke, stroke in open_strokes)
+            if start < stop:
+                bounds, draw = _painter(stroke, start, stop)
+                if self.history is not None:
+                    action = self._actions.get(stroke)
+                    if action is None:
+                        action = self._actions[stroke] = self.history.begin(stroke)
+                    self.history.snapshot(*bounds, action=action)
+                canvas.paint(*bounds, draw)
+        self._sync()
+
+    def _sync(self):
+        self._next = len(self.strokes)
+        self._drawn = {stroke: _ready(stroke, True) for stroke in self._open.values()}
+        self._actions = {stroke: action for stroke, action in self._actions.items() if stroke in self._drawn}
+
+    def undo(self, canvas):
+        """Take back the last stroke, on the canvas and in the record; False if there is none"""
+        self.rasterize(canvas)
+        stroke = self.history.undo() if self.history is not None else None
+        if stroke is None:
+            return False
+        self.strokes.remove(stroke)
+        self._open.clear()
+        self._sync()
+        return True
+
+    def redo(self, canvas):
+        """Bring back the last undone stroke; False if there is none"""
+        self.rasterize(canvas)
+        stroke = self.history.redo() if self.history is not None else None
+        if stroke is None:
+            return False
+        self.strokes.append(stroke)
+        self._open.clear()
+        self._sync()
+        return True
+
+    def extent(self):
+        """(x0, y0, x1, y1) around every stroke, or None when there are none"""
+        if not self.strokes:
+            return None
+        boxes = np.array([stroke.bounds() for stroke in self.strokes])
+        return (*boxes[:, :2].min(axis=0).tolist(), *boxes[:, 2:].max(axis=0).tolist())
+
+    def render(self, width=None, height=None, region=None):
+        """All strokes in a world region (x0, y0, x1, y1) rasterized onto a black image of the given size"""
+        x0, y0, x1, y1 = region or (0, 0, self.width, self.height)
+        width, height = width or x1 - x0, height or y1 - y0
+        img = np.zeros((height, width, 3), np.uint8)
+        scale = (width / (x1 - x0), height / (y1 - y0))
+        for stroke in self.strokes:
+            if stroke.tool == "draw":
+                _draw_lines(img, _polylines(stroke, 0, None, scale, (x0, y0)), stroke.color)
+            else:
+                _draw(img, stroke, 0, scale, (x0, y0))
+        return img
+
+
+def _ready(stroke, is_open):
+    """Points of a stroke that can be rasterized: all but the newest of an open curve"""
+    return stroke.count - 1 if stroke.tool == "draw" and is_open else stroke.count
+
+
+def _painter(stroke, start, stop):
+    """Bounds and a draw(image, origin) function for a stroke's points from `start` up to `stop`
+
+    A curve is computed once, however many canvas tiles it is drawn into.
+    """
+    if stroke.tool == "draw":
+        lines = _polylines(stroke, start, stop)
+        return _extent(lines), lambda image, origin: _draw_lines(image, lines, stroke.color, origin)
+    return stroke.bounds(start, stop), lambda image, origin: _draw(image, stroke, start, origin=origin)
+
+
+def _spline(points, start, stop):
+    """Centripetal Catmull-Rom curve through points, for the pieces ending at points[start:stop]
+
+    Returns the curve from points[start - 1] on as an (m, 2) float array,
+    and for each point after the first the piece it belongs to and how far
+    along it (0..1] it is. The first and last piece are extrapolated by
+    mirroring their neighbour. Centripetal knots keep the curve from
+    looping or overshooting where samples are unevenly spaced, as they are
+    when the hand speeds up between frames.
+    """
+    n = len(points)
+    idx = np.arange(max(start, 1), stop)
+    lo = max(idx[0] - 2, 0)  # only the samples these pieces depend on
+    pts = points[lo:stop + 1].astype(np.float64)
+    j = idx - lo
+    p1, p2 = pts[j - 1], pts[j]
+    p0 = np.where((idx >= 2)[:, None], pts[np.maximum(j - 2, 0)], 2 * p1 - p2)
+    p3 = np.where((idx + 1 < n)[:, None], pts[np.minimum(j + 1, len(pts) - 1)], 2 * p2 - p1)
+    # Knots spaced by the square root of the chord lengths; repeated samples get a tiny spacing
+    chord = np.hypot(*(p2 - p1).T)
+    d0 = np.maximum(np.hypot(*(p1 - p0).T) ** 0.5, 1e-3)[:, None]
+    d1 = np.maximum(chord ** 0.5, 1e-3)[:, None]
+    d2 = np.maximum(np.hypot(*(p3 - p2).T) ** 0.5, 1e-3)[:, None]
+    # The same curve in Hermite form: end tangents per piece, then one cubic per point
+    m1 = d1 * ((p1 - p0) / d0 - (p2 - p0) / (d0 + d1) + (p2 - p1) / d1)
+    m2 = d1 * ((p2 - p1) / d1 - (p3 - p1) / (d1 + d2) + (p3 - p2) / d2)
+    steps = np.clip(np.ceil(chord / SPLINE_STEP), 1, MAX_SPLINE_STEPS).astype(int)
+    piece = np.repeat(np.arange(len(idx)), steps)
+    u = (np.arange(len(piece)) - np.repeat(np.cumsum(steps) - steps, steps) + 1) / steps[piece]
+    v = u[:, None]
+    h10, h11 = v * (1 - v) ** 2, v * v * (v - 1)
+    h01 = v * v * (3 - 2 * v)
+    curve = p1[piece] + h01 * (p2 - p1)[piece] + h10 * m1[piece] + h11 * m2[piece]
+    return np.vstack([pts[j[0] - 1:j[0]], curve]), idx[piece], u
+
+
+def _polylines(stroke, start=0, stop=None, scale=(1.0, 1.0), origin=(0, 0)):
+    """A "draw" stroke's curve from point `start` up to `stop` as [(thickness, [fixed-point polylines])]
+
+    Thickness is constant, or with speed_width follows the distance between
+    samples, blended across each piece so it changes gradually. Each piece
+    between two samples is a polyline of its own (split again where its
+    thickness changes), so whether a stroke is drawn a frame at a time or
+    all at once, the same polylines with the same anti-aliased caps are
+    drawn in the same order. Consecutive polylines of one thickness are
+    batched, so a frame's new curve usually takes one polylines call.
+    """
+    stop = stroke.count if stop is None else stop
+    if max(start, 1) >= stop:
+        return []
+    points = stroke.points
+    curve, piece, u = _spline(points, start, stop)
+    sx, sy = scale
+    curve = (curve - origin) * (sx, sy)
+    width = np.full(len(piece), stroke.thickness * min(sx, sy))
+    if stroke.speed_width:
+        lo = max(start - 2, 0)
+        speed = np.hypot(*np.diff(points[lo:stop], axis=0).T.astype(np.float64))  # speed[i - 1 - lo]: samples i - 1 to i
+        factor = np.maximum(MIN_WIDTH, 1.0 / (1.0 + speed / SPEED_HALF_WIDTH))
+        before = factor[np.maximum(piece - 2, lo) - lo]  # the piece before, blended into this one
+        width *= before + u * (factor[piece - 1 - lo] - before)
+    width = np.maximum(1, np.rint(width)).astype(int)
+    fixed = np.rint(curve * (1 << SHIFT)).astype(np.int32)
+    lines = []
+    cuts = np.flatnonzero((np.diff(width) != 0) | (np.diff(piece) != 0)) + 1
+    for a, b in zip([0, *cuts], [*cuts, len(width)]):
+        if not lines or lines[-1][0] != width[a]:
+            lines.append((int(width[a]), []))
+        lines[-1][1].append(fixed[a:b + 1])
+    return lines
+
+
+def _extent(lines):
+    """(x0, y0, x1, y1) containing fixed-point polylines drawn anti-aliased at their thickness"""
+    if not lines:
+        return 0, 0, 0, 0
+    x0 = y0 = np.inf
+    x1 = y1 = -np.inf
+    for thickness, group in lines:
+        pts = np.concatenate(group)
+        pad = (thickness // 2 + 2) << SHIFT  # round caps plus the anti-aliased edge
+        (ax, ay), (bx, by) = pts.min(axis=0) - pad, pts.max(axis=0) + pad
+        x0, y0, x1, y1 = min(x0, ax), min(y0, ay), max(x1, bx), max(y1, by)
+    return int(x0) >> SHIFT, int(y0) >> SHIFT, (int(x1) >> SHIFT) + 1, (int(y1) >> SHIFT) + 1
+
+
+def _draw_lines(img, lines, color, origin=(0, 0)):
+    """Draw _polylines() output anti-aliased, with origin at img's corner
+
+    Anti-aliased edges come out differently where OpenCV clips them at the
+    image border, so the curve is drawn on a copy with a margin: a tile then
+    gets the same pixels as one large image would.
+    """
+    m = CLIP_MARGIN
+    framed = cv2.copyMakeBorder(img, m, m, m, m, cv2.BORDER_CONSTANT)
+    offset = (np.array(origin, np.int32) - m) << SHIFT
+    for thickness, group in lines:
+        cv2.polylines(framed, [line - offset for line in group], False, color, thickness, cv2.LINE_AA, SHIFT)
+    img[:] = framed[m:-m, m:-m]
+
+
+def _draw(img, stroke, start, scale=(1.0, 1.0), origin=(0, 0)):
+    """Rasterize an erase or shape stroke from point `start` on, with origin at img's corner"""
+    sx, sy = scale
+    size = min(sx, sy)
+    pts = stroke.points
+    if origin != (0, 0):
+        pts = pts - np.array(origin, np.int32)
+    if scale != (1.0, 1.0):
+        pts = np.rint(pts * (sx, sy)).astype(np.int32)
+    thickness = max(1, int(round(stroke.thickness * size))) if stroke.thickness > 0 else stroke.thickness
+    radius = int(round(stroke.radius * size))
+    if stroke.tool == "erase":
+        for p in pts[start:]:
+            cv2.circle(img, tuple(p), radius, stroke.color, -1)
+    elif start == 0:
+        if stroke.tool == "line":
+            cv2.line(img, tuple(pts[0]), tuple(pts[1]), stroke.color, thickness)
+        elif stroke.tool == "rectangle":
+            cv2.rectangle(img, tuple(pts[0]), tuple(pts[1]), stroke.color, thickness)
+        elif stroke.tool == "circle":
+            cv2.circle(img, tuple(pts[0]), radius, stroke.color, thickness)
+
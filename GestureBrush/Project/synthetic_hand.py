@@ -0,0 +1,155 @@
+import math
+
+import cv2
+import numpy as np
+
+# Standard benchmark resolutions (width, height)
+RESOLUTIONS = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+
+BACKGROUNDS = ("solid", "gradient", "noise", "stripes")
+HAND_WIDTH = 124  # px across the "point" pose at scale 1, thumb included
+LANE_MARGIN = 8  # px kept between neighbouring hands at their closest
+
+# Finger layout at scale 1 (a 480p frame): angle from vertical in degrees,
+# base offset along the top of the palm, extended length
+FINGERS = {
+    "thumb": (-70, -40, 55),
+    "index": (-12, -24, 85),
+    "middle": (0, -4, 95),
+    "ring": (10, 16, 85),
+    "pinky": (22, 34, 65),
+}
+
+POSES = {
+    "point": ("index",),
+    "two": ("index", "middle"),
+    "open": ("thumb", "index", "middle", "ring", "pinky"),
+}
+
+
+def skin_color(rng):
+    """Random BGR skin tone inside the detector's HSV window"""
+    hsv = np.uint8([[[rng.integers(6, 16), rng.integers(90, 170), rng.integers(150, 235)]]])
+    return tuple(int(c) for c in cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)[0, 0])
+
+
+def make_background(width, height, kind, rng):
+    """Non-skin background of the given kind"""
+    # Hues 40..170 (green through violet) keep clear of the 0..20 skin band
+    hue = int(rng.integers(40, 170))
+    hsv = np.empty((height, width, 3), np.uint8)
+    hsv[..., 0] = hue
+    if kind == "solid":
+        hsv[..., 1] = rng.integers(60, 200)
+        hsv[..., 2] = rng.integers(60, 200)
+    elif kind == "gradient":
+        hsv[..., 1] = 120
+        hsv[..., 2] = np.linspace(40, 220, width, dtype=np.uint8)[None, :]
+    elif kind == "noise":
+        hsv[..., 1] = rng.integers(0, 25, (height, width), dtype=np.uint8)  # grey noise, below skin saturation
+        hsv[..., 2] = rng.integers(30, 230, (height, width), dtype=np.uint8)
+    elif kind == "stripes":
+        hsv[..., 1] = 150
+        hsv[..., 2] = np.where((np.arange(width) // 40) % 2 == 0, 80, 200).astype(np.uint8)[None, :]
+    else:
+        raise ValueError(f"Unknown background: {kind}")
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+def _hand_geometry(center, scale, pose, angle):
+    """Placement function and per-finger (name, base, tip, tip_edge, extended) in frame pixels"""
+    cx, cy = center
+    rot = math.radians(angle)
+    cos_r, sin_r = math.cos(rot), math.sin(rot)
+
+    def place(dx, dy):
+        return (int(round(cx + (dx * cos_r - dy * sin_r) * scale)),
+                int(round(cy + (dx * sin_r + dy * cos_r) * scale)))
+
+    width = max(2, int(20 * scale))
+    fingers = []
+    for name, (finger_angle, base_dx, length) in FINGERS.items():
+        extended = name in POSES[pose]
+        if not extended:
+            length = 22  # curled: a short knuckle stub
+        a = math.radians(finger_angle)
+        base = (base_dx, -30 if name != "thumb" else 5)
+        tip = (base[0] + math.sin(a) * length, base[1] - math.cos(a) * length)
+        # Thick lines have round caps of radius width/2; the extreme point lies beyond the tip
+        reach = width / 2 / scale
+        tip_edge = (tip[0] + math.sin(a) * reach, tip[1] - math.cos(a) * reach)
+        fingers.append((name, place(*base), place(*tip), place(*tip_edge), extended))
+    return place, width, fingers
+
+
+def hand_tips(center, scale, pose="point", angle=0.0):
+    """Fingertip positions by finger name, without drawing"""
+    _, _, fingers = _hand_geometry(center, scale, pose, angle)
+    return {name: edge for name, _, _, edge, extended in fingers if extended}
+
+
+def draw_hand(img, center, scale, color, pose="point", angle=0.0):
+    """Draw a hand silhouette and return its fingertip positions by finger name"""
+    place, width, fingers = _hand_geometry(center, scale, pose, angle)
+
+    # Palm and wrist
+    cv2.ellipse(img, place(0, 0), (int(42 * scale), int(52 * scale)), angle, 0, 360, color, -1)
+    cv2.line(img, place(0, 40), place(0, 95), color, int(50 * scale))
+
+    for name, base, tip, edge, extended in fingers:
+        cv2.line(img, base, tip, color, width)
+    return {name: edge for name, _, _, edge, extended in fingers if extended}
+
+
+class HandSequence:
+    """Deterministic stream of synthetic frames with a hand moving along a smooth path"""
+
+    def __init__(self, width, height, background="solid", pose="point", hands=1, seed=0, speed=1.0):
+        self.width = width
+        self.height = height
+        self.pose = pose
+        self.hands = hands
+        self.speed = speed
+        self.rng = np.random.default_rng(seed)
+        self.background = make_background(width, height, background, self.rng)
+        # Shrink the hands and their sway when lanes get narrow, so silhouettes never merge
+        lane_w = width / hands
+        self.scale = min(height / 480.0, lane_w / 200.0)
+        self.sway = min(0.25 * lane_w, (lane_w - HAND_WIDTH * self.scale - LANE_MARGIN) / 2)
+        self.colors = [skin_color(self.rng) for _ in range(hands)]
+        self.phases = self.rng.uniform(0, 2 * math.pi, size=(hands, 2))
+        self.index = 0
+
+    def position(self, t, hand=0):
+        """Hand centre at time t (frames) along a Lissajous path"""
+        # Each hand gets its own horizontal lane
+        lane_w = self.width / self.hands
+        px, py = self.phases[hand]
+        x = lane_w * (hand + 0.5) + self.sway * math.sin(0.031 * self.speed * t + px)
+        y = self.height * 0.62 + 0.12 * self.height * math.sin(0.047 * self.speed * t + py)
+        return x, y
+
+    def tips_at(self, t, hand=0):
+        """True fingertips at (possibly fractional) time t, without rendering"""
+        return hand_tips(self.position(t, hand), self.scale, self.pose)
+
+    def frame_at(self, t):
+        """Return (frame, truth) where truth lists the fingertips of every hand"""
+        frame = self.background.copy()
+        truth = []
+        for hand in range(self.hands):
+            tips = draw_hand(frame, self.position(t, hand), self.scale, self.colors[hand], self.pose)
+            truth.append(tips)
+        return frame, truth
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        frame, truth = self.frame_at(self.index)
+        self.index += 1
+        return frame, truth
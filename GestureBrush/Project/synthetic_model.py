@@ -0,0 +1,128 @@
+"""Writes the small ONNX hand landmark model bundled for CPU tests
+
+The model is hand-built rather than trained, so it needs no ML tooling:
+it scores skin-coloured pixels (red above green above blue), pools the
+score to a quarter-resolution map and weights it by position, giving 21
+landmark heatmaps in which the index fingertip peaks at the topmost skin
+and the wrist at the bottommost; the other landmarks stay empty. That is
+enough to exercise the DNN tracker end to end on synthetic_hand frames.
+
+The file is serialized with a minimal protobuf encoder, so the onnx
+package is not needed either.
+"""
+import argparse
+
+import numpy as np
+
+INPUT_SIZE = (128, 96)  # width, height of the network input
+STRIDE = 4  # input pixels per heatmap cell
+NUM_LANDMARKS = 21
+WRIST, INDEX_TIP = 0, 8
+SKIN_MARGIN = 0.04  # normalized channel difference below which a pixel does not count as skin
+POSITION_FALLOFF = 3.0  # per heatmap row; steep, so the extreme skin cell wins over better-covered ones
+OPSET = 11
+DEFAULT_PATH = "models/hand_landmarks_test.onnx"
+
+# ONNX enums
+FLOAT = 1  # TensorProto.DataType
+ATTR_INT, ATTR_INTS = 2, 7  # AttributeProto.AttributeType
+
+
+# Protobuf wire format
+def _varint(n):
+    out = bytearray()
+    n &= (1 << 64) - 1
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field, wire):
+    return _varint(field << 3 | wire)
+
+
+def _int(field, n):
+    return _key(field, 0) + _varint(n)
+
+
+def _bytes(field, data):
+    if isinstance(data, str):
+        data = data.encode()
+    return _key(field, 2) + _varint(len(data)) + data
+
+
+def _attribute(name, value):
+    if isinstance(value, int):
+        return _bytes(1, name) + _int(3, value) + _int(20, ATTR_INT)
+    return _bytes(1, name) + b"".join(_int(8, v) for v in value) + _int(20, ATTR_INTS)
+
+
+def _node(op, inputs, outputs, **attributes):
+    return (b"".join(_bytes(1, i) for i in inputs) + b"".join(_bytes(2, o) for o in outputs)
+            + _bytes(3, outputs[0]) + _bytes(4, op)
+            + b"".join(_bytes(5, _attribute(k, v)) for k, v in attributes.items()))
+
+
+def _tensor(name, array):
+    array = np.ascontiguousarray(array, np.float32)
+    return (b"".join(_int(1, d) for d in array.shape) + _int(2, FLOAT)
+            + _bytes(8, name) + _bytes(9, array.tobytes()))
+
+
+def _value_info(name, shape):
+    dims = b"".join(_bytes(1, _int(1, d)) for d in shape)
+    tensor_type = _int(1, FLOAT) + _bytes(2, dims)
+    return _bytes(1, name) + _bytes(2, _bytes(1, tensor_type))
+
+
+def position_weights():
+    """(1, NUM_LANDMARKS, h, w) weights that turn the skin map into landmark heatmaps"""
+    w, h = INPUT_SIZE[0] // STRIDE, INPUT_SIZE[1] // STRIDE
+    rows = np.arange(h, dtype=np.float32)[:, None].repeat(w, axis=1)
+    weights = np.zeros((1, NUM_LANDMARKS, h, w), np.float32)
+    weights[0, INDEX_TIP] = np.exp(-POSITION_FALLOFF * rows)
+    weights[0, WRIST] = np.exp(-POSITION_FALLOFF * (h - 1 - rows))
+    return weights
+
+
+def build_model():
+    """Serialized ONNX model: input "image" (1, 3, H, W) RGB in [0, 1], output "heatmaps" (1, 21, H/4, W/4)"""
+    # R - G and G - B, each less the margin; both positive only for skin-like hues
+    red_green = np.array([1, -1, 0], np.float32).reshape(1, 3, 1, 1)
+    green_blue = np.array([0, 1, -1], np.float32).reshape(1, 3, 1, 1)
+    bias = np.array([-SKIN_MARGIN], np.float32)
+    nodes = [
+        _node("Conv", ["image", "red_green", "bias"], ["rg"], kernel_shape=[1, 1]),
+        _node("Conv", ["image", "green_blue", "bias"], ["gb"], kernel_shape=[1, 1]),
+        _node("Relu", ["rg"], ["rg_pos"]),
+        _node("Relu", ["gb"], ["gb_pos"]),
+        _node("Mul", ["rg_pos", "gb_pos"], ["skin"]),
+        _node("AveragePool", ["skin"], ["skin_map"], kernel_shape=[STRIDE, STRIDE], strides=[STRIDE, STRIDE]),
+        _node("Mul", ["skin_map", "weights"], ["heatmaps"]),
+    ]
+    width, height = INPUT_SIZE
+    graph = (b"".join(_bytes(1, n) for n in nodes) + _bytes(2, "synthetic_hand_landmarks")
+             + _bytes(5, _tensor("red_green", red_green)) + _bytes(5, _tensor("green_blue", green_blue))
+             + _bytes(5, _tensor("bias", bias)) + _bytes(5, _tensor("weights", position_weights()))
+             + _bytes(11, _value_info("image", (1, 3, height, width)))
+             + _bytes(12, _value_info("heatmaps", (1, NUM_LANDMARKS, height // STRIDE, width // STRIDE))))
+    opset = _bytes(1, "") + _int(2, OPSET)
+    return _int(1, 7) + _bytes(2, "gesture-brush") + _bytes(7, graph) + _bytes(8, opset)
+
+
+def write_model(path=DEFAULT_PATH):
+    with open(path, "wb") as f:
+        f.write(build_model())
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the bundled synthetic ONNX hand landmark model")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="where to write the .onnx file")
+    args = parser.parse_args()
+    print(f"Wrote {write_model(args.output)}")
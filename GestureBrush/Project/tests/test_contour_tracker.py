@@ -0,0 +1,13 @@
+from frame_source import Frame
+from synthetic_hand import HandSequence
+from trackers.contour import ContourTracker
+
+
+def test_calibrate_then_detect_relearns_skin():
+    image, _ = HandSequence(640, 480, "solid", "point", seed=3).frame_at(0)
+    tracker = ContourTracker()
+    tracker.calibrate()
+    hands = tracker.detect(Frame(image, 0.0, 0))
+    assert len(hands) == 1
+    assert tracker.skin.learned
+    assert not tracker._calibrate  # only the next hand is calibrated on
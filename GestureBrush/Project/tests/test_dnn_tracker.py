@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from frame_source import Frame
+from synthetic_hand import HandSequence
+from trackers import INDEX_TIP, MISSING, NUM_LANDMARKS
+from trackers.dnn import DnnTracker, decode_heatmaps, decode_output
+
+CELL = 640 / 32  # frame pixels per heatmap cell of the bundled model (128 px input, stride 4)
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_bundled_model_finds_the_index_fingertip(asynchronous):
+    image, truth = HandSequence(640, 480, "solid", "point", seed=3).frame_at(0)
+    tracker = DnnTracker(threads=1, asynchronous=asynchronous)
+    try:
+        hands = [tracker.detect(Frame(image, 0.0, index)) for index in range(2)]
+    finally:
+        tracker.close()
+    if asynchronous:
+        assert hands[0] == []  # results lag one frame behind
+    (hand,) = hands[1]
+    assert hand.landmarks.shape == (NUM_LANDMARKS, 2)
+    assert np.hypot(*(hand.landmarks[INDEX_TIP] - truth[0]["index"])) < CELL
+    assert (hand.landmarks[:, 0] == MISSING).sum() == NUM_LANDMARKS - 2  # the test model only places tip and wrist
+
+
+def test_decode_heatmaps_finds_peaks_between_cells():
+    heatmaps = np.zeros((2, 4, 8), np.float32)
+    heatmaps[0, 1, 2] = 0.9
+    heatmaps[0, 1, 3] = 0.5  # stronger right neighbour: a quarter cell towards it
+    heatmaps[1, 2, 5] = 0.4  # no neighbour response: the cell centre
+    points, score = decode_heatmaps(heatmaps)
+    np.testing.assert_allclose(points, [[2.75 / 8, 1.5 / 4], [5.5 / 8, 2.5 / 4]])
+    np.testing.assert_allclose(score, [0.9, 0.4])
+
+
+def test_decode_output_takes_heatmaps_or_coordinates():
+    heatmaps = np.zeros((1, NUM_LANDMARKS, 4, 4), np.float32)
+    heatmaps[0, :, 2, 2] = 1.0
+    points, score = decode_output(heatmaps, (128, 96))
+    np.testing.assert_allclose(points, np.full((NUM_LANDMARKS, 2), 2.5 / 4))
+    assert (score == 1.0).all()
+
+    coords = np.arange(NUM_LANDMARKS * 3, dtype=np.float32).reshape(1, -1)  # x, y, z per landmark, input pixels
+    points, score = decode_output(coords, (128, 96))
+    np.testing.assert_allclose(points, coords.reshape(NUM_LANDMARKS, 3)[:, :2] / (128, 96))
+    assert (score == 1.0).all()
@@ -0,0 +1,40 @@
+import cv2
+import numpy as np
+import pytest
+
+from frame_source import FrameSource, ImageSequenceSource
+
+
+class FailingSource(FrameSource):
+    """Two frames, then a decoder error"""
+
+    def __init__(self):
+        super().__init__(buffer_size=4, drop_oldest=False)
+        self.grabbed = 0
+
+    def _grab(self):
+        self.grabbed += 1
+        if self.grabbed > 2:
+            raise ValueError("corrupt frame")
+        return np.zeros((4, 4, 3), np.uint8)
+
+
+def test_capture_error_reaches_the_reader_after_buffered_frames():
+    source = FailingSource().start()
+    assert source.read(timeout=2.0).index == 0
+    assert source.read(timeout=2.0).index == 1
+    with pytest.raises(ValueError, match="corrupt frame"):
+        source.read()  # no timeout: must not block once the thread has died
+    assert source.read() is None
+    source.stop()
+
+
+def test_image_sequence_skips_unreadable_files(tmp_path):
+    for index in range(3):
+        cv2.imwrite(str(tmp_path / f"{index}.png"), np.full((4, 4, 3), index, np.uint8))
+    (tmp_path / "1.png").write_bytes(b"not an image")
+    source = ImageSequenceSource(str(tmp_path)).start()
+    values = [int(frame.image[0, 0, 0]) for frame in source]
+    source.stop()
+    assert values == [0, 2]
+    assert source.unreadable == {str(tmp_path / "1.png")}
@@ -0,0 +1,53 @@
+import argparse
+import math
+
+import cv2
+import numpy as np
+import pytest
+
+from gesture_brush import contour_stats, downscale, find_hand_contours
+from painter import parse_scale
+from synthetic_hand import draw_hand
+
+
+def hand_with_forearm(scale, angle, center):
+    """Mask of a pointing hand whose forearm runs off the edge of a 640x480 frame"""
+    mask = np.zeros((480, 640), np.uint8)
+    draw_hand(mask, center, scale, 255, "point", angle)
+    a = math.radians(angle)
+    wrist = (center[0] - 95 * scale * math.sin(a), center[1] + 95 * scale * math.cos(a))
+    elbow = (wrist[0] - 800 * math.sin(a), wrist[1] + 800 * math.cos(a))
+    cv2.line(mask, tuple(int(v) for v in wrist), tuple(int(v) for v in elbow), 255, int(60 * scale))
+    return mask
+
+
+@pytest.mark.parametrize("speckled", [False, True])
+@pytest.mark.parametrize("scale, angle, center", [
+    (1.0, 0, (320, 200)),
+    (0.5, 0, (320, 100)),  # a small hand high in the frame: the longest, narrowest blob
+    (0.5, -45, (320, 200)),  # diagonal: the forearm leaves most of the box empty
+    (1.0, 30, (320, 200)),
+])
+def test_hand_with_forearm_is_found(scale, angle, center, speckled):
+    mask = hand_with_forearm(scale, angle, center)
+    contours = find_hand_contours(mask, speckled=speckled)
+    assert len(contours) == 1
+    assert cv2.pointPolygonTest(contours[0], center, False) > 0
+
+
+def test_contour_stats_match_opencv():
+    rng = np.random.default_rng(0)
+    mask = (rng.random((120, 160)) < 0.05).astype(np.uint8) * 255
+    cv2.circle(mask, (80, 60), 30, 255, -1)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    area, w, h = contour_stats(contours)
+    assert np.array_equal(area, [cv2.contourArea(c) for c in contours])
+    assert np.array_equal(np.stack([w, h], axis=1), [cv2.boundingRect(c)[2:] for c in contours])
+
+
+@pytest.mark.parametrize("text", ["0", "-0.5", "1.5"])
+def test_detect_scale_outside_unit_interval_is_rejected(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_scale(text)
+    with pytest.raises(ValueError):
+        downscale(np.zeros((48, 64, 3), np.uint8), float(text))
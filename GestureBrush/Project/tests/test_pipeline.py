@@ -0,0 +1,51 @@
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pytest
+
+import pipeline
+from pipeline import DetectionPipeline
+
+
+# Workers find this detector only when they are forked from the test process
+def _echo_detector():
+    def detect(frame, **params):
+        return [params], None
+    return detect
+
+
+@pytest.fixture(autouse=True)
+def echo_detector(monkeypatch):
+    monkeypatch.setitem(pipeline.DETECTORS, "echo", _echo_detector)
+
+
+def wait_for(pool, seq, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        detection = pool.poll()
+        if detection is not None and detection.seq >= seq:
+            return detection
+        time.sleep(0.005)
+    raise TimeoutError
+
+
+@pytest.mark.skipif(mp.get_start_method() != "fork", reason="needs forked workers")
+def test_frames_carry_their_params():
+    frame = np.zeros((48, 64, 3), np.uint8)
+    with DetectionPipeline(frame.shape, workers=1, detector="echo", max_age=5.0) as pool:
+        assert pool.submit(frame, time.perf_counter(), morphology=0, region=(1, 2, 30, 40))
+        assert wait_for(pool, 1).landmarks == [{"morphology": 0, "region": (1, 2, 30, 40)}]
+
+
+@pytest.mark.skipif(mp.get_start_method() != "fork", reason="needs forked workers")
+def test_calibration_applies_to_the_next_frame_only():
+    frame = np.zeros((48, 64, 3), np.uint8)
+    with DetectionPipeline(frame.shape, workers=1, detector="echo", max_age=5.0) as pool:
+        calibrated = []
+        for seq in range(1, 5):
+            if seq == 2:
+                pool.calibrate()
+            assert pool.submit(frame, time.perf_counter())
+            calibrated.append(wait_for(pool, seq).landmarks[0].get("calibrate", False))
+        assert calibrated == [False, True, False, False]
@@ -0,0 +1,28 @@
+import numpy as np
+
+from replay import compare_canvas
+from tiled_canvas import TiledCanvas
+
+
+def painted_world():
+    world = TiledCanvas()
+    world.write(10, 20, 14, 23, np.full((3, 4, 3), 255, np.uint8))
+    return world
+
+
+def test_blank_canvases_match():
+    assert compare_canvas(TiledCanvas(), None) == 0
+
+
+def test_one_blank_canvas_differs_everywhere():
+    world = painted_world()
+    image, origin = world.to_image()
+    assert compare_canvas(world, None) == image.shape[0] * image.shape[1]
+    assert compare_canvas(TiledCanvas(), (image, origin)) == image.shape[0] * image.shape[1]
+
+
+def test_same_canvas_matches():
+    world = painted_world()
+    assert compare_canvas(world, world.to_image()) == 0
+    image, (x, y) = world.to_image()
+    assert compare_canvas(world, (image, (x + 1, y))) == 6  # the columns each side that only one has painted
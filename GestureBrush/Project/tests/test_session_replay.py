@@ -0,0 +1,100 @@
+import cv2
+import numpy as np
+
+import painter
+from replay import compare_canvas, replay
+from session import Session, SessionSource
+from synthetic_hand import HandSequence
+from trackers import MISSING, Hand, Tracker
+from trackers.contour import ContourTracker
+
+
+def glide(*stops):
+    """Cursor positions through (x, y, frames held) stops, moving about 12 px a frame between them"""
+    points = []
+    for (x0, y0, hold), (x1, y1, _) in zip(stops, stops[1:]):
+        points += [(x0, y0)] * hold
+        steps = max(1, int(np.hypot(x1 - x0, y1 - y0) / 12))
+        points += [(x0 + (x1 - x0) * k // steps, y0 + (y1 - y0) * k // steps) for k in range(steps)]
+    return points + [stops[-1][:2]] * stops[-1][2]
+
+
+class ScriptedTracker(Tracker):
+    """Hands that follow fixed scripts: (first frame, index fingertip path, grabbing) each"""
+
+    default_filter = "none"
+    multi_hand = True
+    motion_gated = False
+
+    def __init__(self, scripts):
+        self.scripts = scripts
+        self.max_hands = 2
+        self._frame = 0
+
+    def detect(self, frame, scale=1.0, morphology=2, region=None):
+        hands = []
+        for start, path, grab in self.scripts:
+            if 0 <= self._frame - start < len(path):
+                landmarks = np.full((21, 2), MISSING, np.int32)
+                landmarks[8] = path[self._frame - start]
+                landmarks[0] = landmarks[8] + (0, 100)
+                if grab:
+                    landmarks[12] = landmarks[8]
+                hands.append(Hand(landmarks, None))
+        self._frame += 1
+        return hands
+
+    def pen_down(self, landmarks):
+        return landmarks[8, 1] >= 100 and landmarks[8, 0] >= 60  # up over the toolbar and palette
+
+    def grab(self, landmarks):
+        return landmarks[12, 0] != MISSING
+
+
+def write_frames(directory, count, hands=1):
+    frames = []
+    sequence = HandSequence(640, 480, "solid", "point", hands, seed=3)
+    for index in range(count):
+        image, _ = sequence.frame_at(index)
+        cv2.imwrite(str(directory / f"{index:04d}.png"), image)
+        frames.append(image)
+    return frames
+
+
+def test_recorded_frames_are_the_captured_ones(tmp_path):
+    (tmp_path / "frames").mkdir()
+    frames = write_frames(tmp_path / "frames", 12)
+    painter.run(ContourTracker(), str(tmp_path / "frames"), headless=True, budget_ms=0,
+                record=str(tmp_path / "session"), record_frames=True)
+    source = SessionSource(str(tmp_path / "session")).start()
+    replayed = []
+    while (frame := source.read()) is not None:
+        replayed.append(frame.image)
+    source.stop()
+    assert len(replayed) == len(frames)
+    for expected, image in zip(frames, replayed):
+        assert np.array_equal(image, expected)  # no contours, landmarks or UI drawn in
+
+
+def test_replay_reproduces_the_recorded_canvas(tmp_path):
+    scripts = [
+        (0, glide((170, 20, 6), (200, 200, 0), (500, 260, 0), (610, 20, 20)), False),  # draw, then dwell on Undo
+        (10, glide((20, 150, 6), (170, 20, 6), (380, 200, 0), (300, 380, 0), (300, 380, 1)), False),  # colour, draw
+        (110, glide((300, 300, 2), (200, 250, 2)), True),  # pan
+        (150, glide((300, 250, 2), (200, 250, 2)), True),  # two hands spreading apart: zoom in
+        (150, glide((340, 250, 2), (450, 250, 2)), True),
+    ]
+    (tmp_path / "frames").mkdir()
+    for index in range(180):
+        cv2.imwrite(str(tmp_path / "frames" / f"{index:04d}.png"), np.zeros((480, 640, 3), np.uint8))
+    painter.run(ScriptedTracker(scripts), str(tmp_path / "frames"), headless=True, budget_ms=0,
+                record=str(tmp_path / "session"))
+
+    session = Session(str(tmp_path / "session"))
+    replayed, diverged = replay(session)
+    assert diverged is None
+    assert session.canvas() is not None
+    assert compare_canvas(replayed.world, session.canvas()) == 0
+    assert replayed.strokes.history.can_redo  # the dwell on Undo took a stroke back
+    assert session.hands["grab"].any()
+    assert replayed.view.zoom > 1.0
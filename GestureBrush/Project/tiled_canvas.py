@@ -0,0 +1,174 @@
+import math
+
+import numpy as np
+
+TILE_SIZE = 128  # side of a canvas tile in world pixels
+MIN_ZOOM = 0.25
+MAX_ZOOM = 4.0
+
+
+class TiledCanvas:
+    """Unbounded drawing surface stored as square tiles, allocated when first painted
+
+    Coordinates are world pixels and may be negative. paint() hands each
+    tile under a rectangle to a drawing function together with the tile's
+    world origin, so strokes are rasterized straight into the tiles; tiles
+    that stay blank are dropped again, and memory grows with the painted
+    area rather than with how far apart the strokes are. Touched
+    rectangles are queued for the view (take_dirty()) and touched tiles
+    for autosave (take_changed()).
+    """
+
+    def __init__(self, tile=TILE_SIZE):
+        self.tile = tile
+        self.tiles = {}  # (tile row, tile col) -> (tile, tile, 3) uint8
+        self.changed = set()  # tiles touched since take_changed()
+        self._dirty = []  # (x0, y0, x1, y1) touched since take_dirty()
+
+    def _keys(self, x0, y0, x1, y1):
+        t = self.tile
+        return [(ty, tx) for ty in range(y0 // t, (y1 - 1) // t + 1) for tx in range(x0 // t, (x1 - 1) // t + 1)]
+
+    def paint(self, x0, y0, x1, y1, draw):
+        """Call draw(tile image, (world x, world y) of its corner) for every tile under a rectangle"""
+        if x0 >= x1 or y0 >= y1:
+            return
+        t = self.tile
+        for key in self._keys(x0, y0, x1, y1):
+            image = self.tiles.get(key)
+            new = image is None
+            if new:
+                image = np.zeros((t, t, 3), np.uint8)
+            draw(image, (key[1] * t, key[0] * t))
+            if not image.any():  # nothing drawn here, or erased back to black
+                if not new:
+                    del self.tiles[key]
+                    self.changed.add(key)
+                continue
+            if new:
+                self.tiles[key] = image
+            self.changed.add(key)
+        self._dirty.append((x0, y0, x1, y1))
+
+    def read(self, x0, y0, x1, y1):
+        """Copy of a rectangle, black where nothing is painted"""
+        out = np.zeros((y1 - y0, x1 - x0, 3), np.uint8)
+        t = self.tile
+        for ty, tx in self._keys(x0, y0, x1, y1):
+            image = self.tiles.get((ty, tx))
+            if image is None:
+                continue
+            ox, oy = tx * t, ty * t
+            ax, ay = max(x0, ox), max(y0, oy)
+            bx, by = min(x1, ox + t), min(y1, oy + t)
+            out[ay - y0:by - y0, ax - x0:bx - x0] = image[ay - oy:by - oy, ax - ox:bx - ox]
+        return out
+
+    def write(self, x0, y0, x1, y1, image=None):
+        """Overwrite a rectangle with image, or with black when image is None"""
+        if x0 >= x1 or y0 >= y1:
+            return
+        t = self.tile
+        for key in self._keys(x0, y0, x1, y1):
+            ox, oy = key[1] * t, key[0] * t
+            ax, ay = max(x0, ox), max(y0, oy)
+            bx, by = min(x1, ox + t), min(y1, oy + t)
+            part = None if image is None else image[ay - y0:by - y0, ax - x0:bx - x0]
+            tile = self.tiles.get(key)
+            if tile is None:
+                if part is None or not part.any():
+                    continue
+                tile = self.tiles[key] = np.zeros((t, t, 3), np.uint8)
+            tile[ay - oy:by - oy, ax - ox:bx - ox] = 0 if part is None else part
+            if not tile.any():
+                del self.tiles[key]
+            self.changed.add(key)
+        self._dirty.append((x0, y0, x1, y1))
+
+    def clear(self):
+        bounds = self.bounds()
+        self.changed.update(self.tiles)
+        self.tiles.clear()
+        if bounds is not None:
+            self._dirty.append(bounds)
+
+    def bounds(self):
+        """(x0, y0, x1, y1) around every allocated tile, or None when nothing is painted"""
+        if not self.tiles:
+            return None
+        t = self.tile
+        rows = [ty for ty, _ in self.tiles]
+        cols = [tx for _, tx in self.tiles]
+        return min(cols) * t, min(rows) * t, (max(cols) + 1) * t, (max(rows) + 1) * t
+
+    def to_image(self):
+        """The painted area as one image and the world position of its corner; (None, None) if blank"""
+        bounds = self.bounds()
+        if bounds is None:
+            return None, None
+        return self.read(*bounds), bounds[:2]
+
+    def take_dirty(self):
+        dirty, self._dirty = self._dirty, []
+        return dirty
+
+    def take_changed(self):
+        changed, self.changed = self.changed, set()
+        return changed
+
+    @property
+    def nbytes(self):
+        return len(self.tiles) * self.tile * self.tile * 3
+
+
+class Viewport:
+    """Which part of the world the screen shows: world = (x, y) + screen / zoom
+
+    Points map to the nearest world pixel, the same rounding the view
+    uses to sample the canvas, so a stroke lands under the cursor at any
+    zoom.
+    """
+
+    __slots__ = ("x", "y", "zoom")
+
+    def __init__(self, x=0.0, y=0.0, zoom=1.0):
+        self.x = x
+        self.y = y
+        self.zoom = zoom
+
+    @property
+    def state(self):
+        return self.x, self.y, self.zoom
+
+    def world_at(self, point):
+        """Exact world position of a screen point"""
+        return self.x + point[0] / self.zoom, self.y + point[1] / self.zoom
+
+    def to_world(self, point):
+        x, y = self.world_at(point)
+        return math.floor(x + 0.5), math.floor(y + 0.5)
+
+    def to_screen(self, point):
+        return (math.floor((point[0] - self.x) * self.zoom + 0.5), math.floor((point[1] - self.y) * self.zoom + 0.5))
+
+    def world_size(self, size):
+        """A screen length in world pixels, at least 1"""
+        return max(1, int(round(size / self.zoom)))
+
+    def hold(self, world, point, zoom=None):
+        """Show the world position under a screen point, at a new zoom if given (limited, and snapped to 100%)"""
+        if zoom is not None:
+            zoom = min(MAX_ZOOM, max(MIN_ZOOM, zoom))
+            self.zoom = 1.0 if abs(zoom - 1.0) < 0.05 else zoom
+        self.x = world[0] - point[0] / self.zoom
+        self.y = world[1] - point[1] / self.zoom
+        if self.zoom == 1.0:
+            self.x, self.y = float(round(self.x)), float(round(self.y))  # pixel-aligned: the view is a plain copy
+
+    def zoom_at(self, point, factor):
+        """Scale the view by factor around a screen point"""
+        self.hold(self.world_at(point), point, self.zoom * factor)
+
+    def reset(self):
+        self.x = self.y = 0.0
+        self.zoom = 1.0
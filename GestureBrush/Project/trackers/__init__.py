@@ -0,0 +1,158 @@
+"""Hand tracker backends for the painter, registered by name
+
+A backend module is imported only when its tracker is loaded, so the
+painter pays the start-up cost (MediaPipe, a DNN model, ...) of the
+chosen backend alone.
+"""
+import importlib
+from collections import namedtuple
+
+import metrics
+from gesture_brush import downscale, scale_contour, scale_landmarks, scale_region
+from history import DWELL_FRAMES
+from pipeline import DetectionPipeline
+
+MISSING = -1  # same sentinel as gesture_brush.MISSING
+NUM_LANDMARKS = 21
+INDEX_TIP = 8  # landmark that steers the cursor (MediaPipe numbering, shared by all backends)
+
+# One tracked hand in the coordinates of the frame it was found in:
+# (NUM_LANDMARKS, 2) int32 landmarks and the outline, when the backend has one
+Hand = namedtuple("Hand", ["landmarks", "contour"])
+
+# Where a backend lives: module, class name and a one-line description for menus
+Backend = namedtuple("Backend", ["module", "cls", "description"])
+
+BACKENDS = {
+    "contour": Backend("trackers.contour", "ContourTracker", "skin-colour contours (no extra dependencies)"),
+    "mediapipe": Backend("trackers.mediapipe_hands", "MediaPipeTracker", "MediaPipe Hands (needs mediapipe)"),
+    "dnn": Backend("trackers.dnn", "DnnTracker", "OpenCV DNN hand model (needs a model file)"),
+    "mouse": Backend("trackers.mouse", "MouseTracker", "mouse pointer, to paint without a camera"),
+}
+
+
+def register(name, module, cls, description=""):
+    """Make a tracker class available under `name` without importing it yet"""
+    BACKENDS[name] = Backend(module, cls, description)
+
+
+def load(name):
+    """Import and return the tracker class registered as `name`"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown tracker {name!r}; choose from {', '.join(BACKENDS)}")
+    backend = BACKENDS[name]
+    return getattr(importlib.import_module(backend.module), backend.cls)
+
+
+def create(name, **options):
+    return load(name)(**options)
+
+
+class Tracker:
+    """Finds hands in frames for the painter
+
+    Subclasses implement detect() and pen_down(); the other hooks are
+    optional. The class attributes tell the painter how the backend is
+    driven: hand trackers select by hovering and confirm by dwelling,
+    while a pointer that can click does both only while pressed.
+    """
+
+    default_source = 0  # frame source when none is given (None: blank frames)
+    default_filter = "kalman"  # cursor filter when none is given
+    hover_selects = True  # hovering picks tools and colours, not only while the pen is down
+    dwell_frames = DWELL_FRAMES  # frames the cursor rests on Undo/Redo before it fires
+    show_cursor = True
+    interactive = False  # needs the display window, so cannot run headless
+    pool_detector = None  # pipeline.DETECTORS entry that runs this backend in worker processes
+    multi_hand = False  # can find several hands per frame (takes max_hands)
+    motion_gated = True  # frames where nothing moved may skip detect() and reuse its last hands
+
+    workers = 0
+    max_hands = 1
+    pipeline = None
+
+    @classmethod
+    def add_arguments(cls, parser):
+        """Add the backend's command line options"""
+        if cls.pool_detector is not None:
+            parser.add_argument("--workers", type=int, default=0, help="run detection in this many worker processes")
+        if cls.multi_hand:
+            parser.add_argument("--hands", type=int, default=1,
+                                help="hands to track at once; each paints with its own tool and colour")
+
+    @classmethod
+    def from_args(cls, args):
+        """Create the tracker from parsed command line options"""
+        options = {}
+        if cls.pool_detector is not None:
+            options["workers"] = args.workers
+        if cls.multi_hand:
+            options["max_hands"] = args.hands
+        return cls(**options)
+
+    def attach(self, window, width, height):
+        """Called once the display window (width x height) exists"""
+
+    def detect(self, frame, scale=1.0, morphology=2, region=None):
+        """Up to max_hands hands in a Frame, searched at `scale` of its resolution; coordinates are the frame's own
+
+        morphology is the governor's mask clean-up budget, for backends that
+        segment (2 = open and close, 1 = open, 0 = none). region is the
+        (x0, y0, x1, y1) part of the frame that changed since the last
+        detection, for backends that can narrow their search to it; None
+        means the whole frame.
+        """
+        raise NotImplementedError
+
+    def pen_down(self, landmarks):
+        """Whether the hand's pose means paint"""
+        raise NotImplementedError
+
+    def grab(self, landmarks):
+        """Whether the hand's pose means move (and, with two hands, zoom) the canvas instead of painting"""
+        return False
+
+    def annotate(self, frm, hands):
+        """Draw backend-specific feedback; hands are in frm's coordinates"""
+
+    def debug_views(self, frm, hands):
+        """{window name: image} of backend internals for --debug-views; built only when they will be shown"""
+        return {}
+
+    def calibrate(self):
+        """Re-learn appearance from the next detected hand"""
+
+    def reset(self):
+        """Forget tracking state, e.g. after the detection scale changed"""
+
+    def close(self):
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.pipeline = None
+
+    def _detect_pooled(self, frame, scale, params=None, region=None, **options):
+        """Hands from worker processes that only ever see the downscaled frame
+
+        options configure the workers' detector when they start; params go
+        to it with this frame, and so does region (x0, y0, x1, y1 of frame),
+        mapped onto the downscaled copy.
+        """
+        frm = frame.image
+        with metrics.timer("resize"):
+            small = downscale(frm, scale)
+        if self.pipeline is None or self.pipeline.ring.shape != small.shape:
+            if self.pipeline is not None:
+                self.pipeline.close()
+            self.pipeline = DetectionPipeline(small.shape, self.workers, self.pool_detector, **options)
+        params = dict(params or {})
+        if region is not None:
+            params["region"] = scale_region(region, frm.shape, small.shape)
+        if not self.pipeline.submit(small, frame.timestamp, **params):
+            metrics.count("dropped_frames")
+        detection = self.pipeline.poll()
+        if detection is None:
+            return []
+        fx, fy = frm.shape[1] / small.shape[1], frm.shape[0] / small.shape[0]
+        contours = detection.contours or [None] * len(detection.landmarks)
+        return [Hand(scale_landmarks(lm, fx, fy), scale_contour(c, fx, fy))
+                for lm, c in zip(detection.landmarks, contours)]
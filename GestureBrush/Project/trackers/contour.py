@@ -0,0 +1,82 @@
+import cv2
+import numpy as np
+
+from gesture_brush import MISSING, detect_hands, fingers_up, open_hand, refine_fingertips, segment_skin
+from roi_tracker import RoiTracker
+from skin_model import SkinModel
+from trackers import Hand, Tracker
+
+
+class ContourTracker(Tracker):
+    """Skin segmentation and contour fingertips (gesture_brush.py); paints while the index finger is up"""
+
+    pool_detector = "contour"
+    multi_hand = True
+
+    def __init__(self, method="defects", workers=0, refine=False, max_hands=1):
+        self.method = method
+        self.workers = workers
+        self.refine = refine
+        self.max_hands = max_hands
+        self.roi = RoiTracker()  # segment only around the last known hand
+        self.skin = SkinModel()  # adapts to the user's skin and lighting as the hand is tracked
+        self._calibrate = False
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--landmarks", default="defects", choices=["defects", "kcurvature"], help="fingertip detector")
+        parser.add_argument("--refine", action="store_true", help="refine downscaled fingertips at full resolution")
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(args.landmarks, args.workers, args.refine, args.hands)
+
+    def detect(self, frame, scale=1.0, morphology=2, region=None):
+        frm = frame.image
+        if self.workers > 0:
+            hands = self._detect_pooled(frame, scale, {"morphology": morphology}, region, method=self.method,
+                                        max_hands=self.max_hands)
+            if self._calibrate:
+                self.pipeline.calibrate()  # each worker relearns skin colour from the next hand it finds
+                self._calibrate = False
+        else:
+            found = detect_hands(frm, self.roi, self.method, self.skin, scale, morphology, self.max_hands, region)
+            hands = [Hand(landmarks, contour) for landmarks, contour in found]
+            if self._calibrate and hands:
+                self.skin.calibrate(frm, hands[0].contour)
+                self._calibrate = False
+        if self.refine and scale < 1.0:
+            hands = [Hand(refine_fingertips(frm, h.landmarks, scale, self.skin), h.contour) for h in hands]
+        return hands
+
+    def pen_down(self, landmarks):
+        return fingers_up(landmarks)
+
+    def grab(self, landmarks):
+        return open_hand(landmarks)
+
+    def debug_views(self, frm, hands):
+        """The skin mask of the whole frame, with the hand contours drawn over it"""
+        skin = cv2.cvtColor(segment_skin(frm, self.skin), cv2.COLOR_GRAY2BGR)
+        cv2.drawContours(skin, [hand.contour for hand in hands if hand.contour is not None], -1, (0, 255, 0), 2)
+        return {"skin": skin}
+
+    def annotate(self, frm, hands):
+        for hand in hands:
+            if hand.contour is not None:  # not known on frames without detection
+                cv2.drawContours(frm, [hand.contour], -1, (0, 255, 0), 2)
+            for landmark_id in np.flatnonzero(hand.landmarks[:, 0] != MISSING):
+                x, y = (int(v) for v in hand.landmarks[landmark_id])
+                cv2.circle(frm, (x, y), 5, (255, 0, 0), -1)
+                cv2.putText(frm, str(landmark_id), (x + 10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        if hands:
+            status = "Fingers: UP" if fingers_up(hands[0].landmarks) else "Fingers: DOWN"
+            cv2.putText(frm, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        cv2.putText(frm, "Show hand to camera", (10, frm.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+    def calibrate(self):
+        self._calibrate = True  # relearn skin colour from the next detected hand
+
+    def reset(self):
+        self.roi.lost()  # the tracked window is in the old detection scale's coordinates
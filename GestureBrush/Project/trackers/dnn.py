@@ -0,0 +1,165 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import metrics
+from frame_source import parse_size
+from gesture_brush import fingers_up, open_hand
+from trackers import MISSING, NUM_LANDMARKS, Hand, Tracker
+
+# Bundled hand-built test model (see synthetic_model.py)
+DEFAULT_MODEL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "models", "hand_landmarks_test.onnx")
+DEFAULT_INPUT_SIZE = (128, 96)  # width, height the model expects
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+CONFIDENCE_THRESHOLD = 0.0  # heatmap peaks must exceed this; 0 keeps any response (right for the test model)
+
+BACKENDS = {
+    "opencv": (cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU),
+    "openvino": (cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE, cv2.dnn.DNN_TARGET_CPU),
+}
+
+
+def decode_heatmaps(heatmaps):
+    """Peak of each of (K, h, w) heatmaps: (K, 2) normalized (x, y) and (K,) peak values"""
+    k, h, w = heatmaps.shape
+    flat = heatmaps.reshape(k, -1)
+    peak = flat.argmax(axis=1)
+    rows = np.arange(k)
+    score = flat[rows, peak]
+    ys, xs = np.divmod(peak, w)
+    # Quarter-cell shift towards the stronger neighbour recovers some of the heatmap stride
+    dx = heatmaps[rows, ys, np.minimum(xs + 1, w - 1)] - heatmaps[rows, ys, np.maximum(xs - 1, 0)]
+    dy = heatmaps[rows, np.minimum(ys + 1, h - 1), xs] - heatmaps[rows, np.maximum(ys - 1, 0), xs]
+    points = np.stack([xs + 0.5 + 0.25 * np.sign(dx), ys + 0.5 + 0.25 * np.sign(dy)], axis=1)
+    return points / (w, h), score
+
+
+def decode_output(output, input_size):
+    """Normalized (K, 2) landmarks and (K,) scores from heatmaps (1, K, h, w) or coordinates (1, K * 2|3)"""
+    if output.ndim == 4:
+        return decode_heatmaps(output[0])
+    # Regressed coordinates in input pixels (MediaPipe-style landmark models); no per-point score
+    coords = output.reshape(NUM_LANDMARKS, -1)[:, :2]
+    return coords / input_size, np.ones(NUM_LANDMARKS, np.float32)
+
+
+class DnnTracker(Tracker):
+    """Hand landmarks from an ONNX or TensorFlow model through OpenCV's DNN module
+
+    The network is loaded once and fed from preallocated buffers: each
+    frame is resized into a fixed uint8 image and converted straight into
+    a reused float blob. With asynchronous inference the network runs on
+    frame N while frame N - 1 is decoded and rendered, so detections lag
+    by one frame but inference no longer adds to the frame time; the
+    OpenVINO backend uses forwardAsync(), the OpenCV CPU backend a single
+    inference thread (OpenCV releases the GIL inside forward()).
+    """
+
+    def __init__(self, model=DEFAULT_MODEL, input_size=DEFAULT_INPUT_SIZE, confidence_threshold=CONFIDENCE_THRESHOLD,
+                 threads=DEFAULT_THREADS, backend="opencv", asynchronous=False, scale=1 / 255.0, mean=0.0, swap_rb=True):
+        if not os.path.exists(model):
+            raise FileNotFoundError(f"hand model not found: {model}")
+        cv2.setNumThreads(threads)  # process-wide: also used by the rest of OpenCV
+        dnn_backend, target = BACKENDS[backend]
+        if backend == "openvino" and hasattr(cv2.dnn, "ENGINE_CLASSIC"):
+            self.net = cv2.dnn.readNet(model, "", "", cv2.dnn.ENGINE_CLASSIC)  # forwardAsync needs the classic engine
+        else:
+            self.net = cv2.dnn.readNet(model)
+        self.net.setPreferableBackend(dnn_backend)
+        self.net.setPreferableTarget(target)
+        self.input_size = tuple(input_size)
+        self.confidence_threshold = confidence_threshold
+        self.scale = scale
+        self.mean = mean
+        self.swap_rb = swap_rb
+        width, height = self.input_size
+        self._resized = np.empty((height, width, 3), np.uint8)
+        self._blobs = [np.empty((1, 3, height, width), np.float32) for _ in range(2 if asynchronous else 1)]
+        self._next_blob = 0
+        self.asynchronous = asynchronous
+        self._native_async = asynchronous and backend == "openvino"
+        self._executor = ThreadPoolExecutor(1) if asynchronous and not self._native_async else None
+        self._pending = None  # (inference in flight, shape of its frame)
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("--model", default=DEFAULT_MODEL, help="ONNX (.onnx) or TensorFlow (.pb) hand landmark model")
+        parser.add_argument("--input-size", type=parse_size, default=DEFAULT_INPUT_SIZE, help="model input, e.g. 128x96")
+        parser.add_argument("--confidence", type=float, default=CONFIDENCE_THRESHOLD, help="minimum heatmap peak")
+        parser.add_argument("--dnn-threads", type=int, default=DEFAULT_THREADS, help="OpenCV worker threads")
+        parser.add_argument("--dnn-backend", default="opencv", choices=list(BACKENDS), help="inference backend (CPU)")
+        parser.add_argument("--async-inference", action="store_true",
+                            help="overlap inference with rendering (landmarks lag one frame)")
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(args.model, args.input_size, args.confidence, args.dnn_threads, args.dnn_backend, args.async_inference)
+
+    def _fill(self, frm, blob):
+        """Resize and normalize frm into blob without allocating"""
+        cv2.resize(frm, self.input_size, dst=self._resized)  # bilinear, as blobFromImage
+        chw = self._resized.transpose(2, 0, 1)
+        if self.swap_rb:
+            chw = chw[::-1]
+        if self.mean:
+            np.subtract(chw, self.mean, out=blob[0], casting="unsafe")
+            blob[0] *= self.scale
+        else:
+            np.multiply(chw, self.scale, out=blob[0], casting="unsafe")
+
+    def _infer(self, blob):
+        self.net.setInput(blob)
+        return decode_output(self.net.forward(), self.input_size)
+
+    def detect(self, frame, scale=1.0, morphology=2, region=None):
+        """Landmarks at the model's fixed input size; the governor's scale and morphology and region do not apply"""
+        frm = frame.image
+        blob = self._blobs[self._next_blob]
+        self._next_blob = (self._next_blob + 1) % len(self._blobs)
+        with metrics.timer("color"):
+            self._fill(frm, blob)
+        if not self.asynchronous:
+            with metrics.timer("landmarks"):
+                return self._hands(*self._infer(blob), frm.shape)
+
+        previous = self._pending
+        if self._native_async:
+            self.net.setInput(blob)
+            self._pending = (self.net.forwardAsync(), frm.shape)
+        else:
+            self._pending = (self._executor.submit(self._infer, blob), frm.shape)
+        if previous is None:
+            return []
+        pending, shape = previous
+        with metrics.timer("landmarks"):  # mostly finished while the previous frame was rendered
+            if self._native_async:
+                return self._hands(*decode_output(pending.get(), self.input_size), shape)
+            return self._hands(*pending.result(), shape)
+
+    def _hands(self, points, score, shape):
+        present = score > self.confidence_threshold
+        if not present.any():
+            return []
+        height, width = shape[:2]
+        landmarks = np.rint(points * (width, height)).astype(np.int32)
+        landmarks[~present] = MISSING
+        return [Hand(landmarks, None)]
+
+    def pen_down(self, landmarks):
+        return fingers_up(landmarks)
+
+    def grab(self, landmarks):
+        return open_hand(landmarks)
+
+    def annotate(self, frm, hands):
+        for hand in hands:
+            for x, y in hand.landmarks[hand.landmarks[:, 0] != MISSING]:
+                cv2.circle(frm, (int(x), int(y)), 5, (255, 0, 0), -1)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,59 @@
+import cv2
+import mediapipe as mp
+
+import metrics
+from gesture_brush import downscale, open_hand
+from pipeline import mediapipe_to_pixels
+from trackers import Hand, Tracker
+
+CONNECTION_COLOR = (224, 224, 224)
+LANDMARK_COLOR = (0, 0, 255)
+
+
+class MediaPipeTracker(Tracker):
+    """MediaPipe Hands landmarks (main.py); paints while the middle finger is raised"""
+
+    pool_detector = "mediapipe"
+    multi_hand = True  # one process() call returns every hand
+
+    def __init__(self, workers=0, max_hands=1):
+        self.workers = workers
+        self.max_hands = max_hands
+        self.hands = None
+        if workers == 0:
+            self.hands = mp.solutions.hands.Hands(min_detection_confidence=0.6, min_tracking_confidence=0.6,
+                                                  max_num_hands=max_hands)
+
+    def detect(self, frame, scale=1.0, morphology=2, region=None):
+        if self.workers > 0:
+            return self._detect_pooled(frame, scale, max_num_hands=self.max_hands)
+        frm = frame.image
+        with metrics.timer("resize"):
+            small = downscale(frm, scale)
+        with metrics.timer("color"):
+            rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        with metrics.timer("landmarks"):  # MediaPipe segments the hand and places landmarks in one call
+            op = self.hands.process(rgb)
+        # Landmarks are normalized, so they map straight onto the full frame
+        height, width = frm.shape[:2]
+        return [Hand(mediapipe_to_pixels(hand, width, height), None) for hand in op.multi_hand_landmarks or []]
+
+    def pen_down(self, landmarks):
+        return landmarks[10, 1] > landmarks[12, 1]  # middle fingertip above its PIP joint
+
+    def grab(self, landmarks):
+        return open_hand(landmarks)  # all four fingertips above their PIP joints
+
+    def annotate(self, frm, hands):
+        for hand in hands:
+            points = [tuple(int(v) for v in p) for p in hand.landmarks]
+            for a, b in mp.solutions.hands.HAND_CONNECTIONS:
+                cv2.line(frm, points[a], points[b], CONNECTION_COLOR, 2)
+            for p in points:
+                cv2.circle(frm, p, 3, LANDMARK_COLOR, -1)
+
+    def close(self):
+        super().close()
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+from trackers import INDEX_TIP, MISSING, NUM_LANDMARKS, Hand, Tracker
+
+
+class MouseTracker(Tracker):
+    """The mouse pointer as a one-landmark hand (demo.py); paints while the left button is held, drags the canvas with the right"""
+
+    default_source = None  # blank page unless footage is given
+    default_filter = "none"
+    hover_selects = False  # tools, colours and Undo/Redo are clicked
+    dwell_frames = 1
+    show_cursor = False
+    interactive = True
+    motion_gated = False  # the pointer moves while the frame stays still
+
+    def __init__(self):
+        self._point = None  # pointer in display coordinates
+        self._pressed = False
+        self._grabbing = False
+        self._size = None  # display (width, height)
+
+    def attach(self, window, width, height):
+        self._size = (width, height)
+        cv2.setMouseCallback(window, self._on_mouse)
+
+    def _on_mouse(self, event, x, y, flags, param):
+        if event == cv2.EVENT_LBUTTONDOWN:
+            self._pressed = True
+        elif event == cv2.EVENT_LBUTTONUP:
+            self._pressed = False
+        elif event == cv2.EVENT_RBUTTONDOWN:
+            self._grabbing = True
+        elif event == cv2.EVENT_RBUTTONUP:
+            self._grabbing = False
+        self._point = (x, y)
+
+    def detect(self, frame, scale=1.0, morphology=2, region=None):
+        if self._point is None:
+            return []
+        height, width = frame.image.shape[:2]
+        landmarks = np.full((NUM_LANDMARKS, 2), MISSING, np.int32)
+        landmarks[INDEX_TIP] = (self._point[0] * width // self._size[0], self._point[1] * height // self._size[1])
+        return [Hand(landmarks, None)]
+
+    def pen_down(self, landmarks):
+        return self._pressed
+
+    def grab(self, landmarks):
+        return self._grabbing
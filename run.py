@@ -6,7 +6,6 @@ This script launches the main application from the project root.
 
 import os
 import sys
-import subprocess
 
 def main():
     """Main function to run the gesture brush application"""
@@ -23,33 +22,26 @@ def main():
     # Change to project directory
     os.chdir(project_dir)
     
-    # Check if gesture_brush.py exists
-    if not os.path.exists("gesture_brush.py"):
-        print("❌ Error: gesture_brush.py not found!")
+    # Check if painter.py exists
+    if not os.path.exists("painter.py"):
+        print("❌ Error: painter.py not found!")
         print("Please ensure all files are properly installed.")
         return 1
     
     print("🚀 Starting Gesture Brush...")
-    print("📋 Controls:")
-    print("   - Show your hand to the camera")
-    print("   - Point with index finger to draw")
-    print("   - Point to top area to select tools")
-    print("   - Point to left area to select colors")
-    print("   - Press ESC to exit")
     print("=" * 40)
     
+    # Run the painter in this process; options such as --tracker mouse are passed through
+    sys.path.insert(0, os.getcwd())
+    from painter import main as paint
     try:
-        # Run the main application
-        subprocess.run([sys.executable, "gesture_brush.py"], check=True)
+        paint(sys.argv[1:])
     except KeyboardInterrupt:
         print("\n👋 Application closed by user")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error running application: {e}")
-        return 1
-    except FileNotFoundError:
-        print("❌ Error: Python executable not found!")
-        print("Please ensure Python is properly installed and in your PATH.")
-        return 1
+    except SystemExit as e:
+        if e.code:
+            print(f"❌ Error running application: {e.code}")
+            return 1
     
     return 0
 